@@ -0,0 +1,80 @@
+"""
+The crew from main.py, run through the shared crew_runtime helpers.
+
+main.py teaches the crewai API: one crew.kickoff() per topic. This
+script runs the same crew for many topics at once:
+
+    python main_runtime.py "AI in Healthcare" "Blockchain" "Quantum Computing"
+    python main_runtime.py --distributed "AI in Healthcare" "Blockchain"
+"""
+
+import os
+import sys
+
+from main import crew
+
+# Shared runtime helpers live at the repository root (next to .env)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from crew_runtime import (
+    ConsoleSink, Coordinator, CrewDefinition, JSONLinesSink, Logger, OutputWriter, open_broker,
+    write_atomic,
+)
+
+# Immutable template of the crew in main.py. Its {topic} strings are
+# compiled once and kickoff inputs are checked before any LLM call.
+# Runs never mutate it, so many topics can be written at once.
+template = CrewDefinition.from_crew(crew)
+
+
+# How workers find the crew: a path from the repository root, so the
+# same spec works on every machine whatever folder the checkout is in.
+CREW_SPEC = f"{os.path.basename(os.path.dirname(os.path.abspath(__file__)))}/main.py:crew"
+
+
+def output_path(topic):
+    return f"output_{topic.replace(' ', '_').lower()}.md"
+
+
+def run_batch(topics, max_workers=8):
+    """Write one blog post per topic, running the crews concurrently.
+
+    Each post is handed to a background writer as soon as its crew
+    finishes, so disk I/O never holds up the next LLM call and a crash
+    never leaves a half-written output file. The verbose trace goes
+    through a queued logger: each run's lines are printed together
+    when it ends, and a full trace per run lands in logs/<run_id>.jsonl.
+    """
+    logger = Logger(sinks=[ConsoleSink(group_runs=True), JSONLinesSink("logs/{run_id}.jsonl")])
+    with OutputWriter(root=".", per_run_dirs=False) as writer, logger:
+        def save(ctx, event, data):
+            if event == "run_completed":
+                writer.submit(ctx.run_id, output_path(ctx.inputs["topic"]), data["result"].raw)
+
+        return template.kickoff_many([{"topic": t} for t in topics],
+                                     max_workers=max_workers, listeners=(save,), logger=logger)
+
+
+def run_distributed(topics, broker="sqlite:///.crew_broker/jobs.sqlite3"):
+    """Write one blog post per topic on worker processes, on any machine.
+
+    Start workers first, one per process / machine:
+        python -m crew_runtime.distributed worker sqlite:///.crew_broker/jobs.sqlite3
+    (use a redis://host:6379/0 broker url to spread them over machines)
+    """
+    coordinator = Coordinator(open_broker(broker))
+    results = coordinator.map(CREW_SPEC, [{"topic": t} for t in topics])
+    for topic, result in zip(topics, results):
+        write_atomic(output_path(topic), result.raw)
+    return results
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    distributed = "--distributed" in args
+    topics = [a for a in args if a != "--distributed"] or ["Artificial Intelligence in Healthcare"]
+    if distributed:
+        run_distributed(topics)
+    else:
+        run_batch(topics)
+    for topic in topics:
+        print(f"✅ {topic}: {output_path(topic)}")
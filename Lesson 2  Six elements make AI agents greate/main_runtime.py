@@ -0,0 +1,175 @@
+"""
+The pipeline from main.py, run through the shared crew_runtime helpers.
+
+main.py teaches the crewai API: one crew.kickoff(). This script runs
+the same crew as a CrewDefinition, with model tiering, local output
+checks, checkpoints and resume, incremental re-edits, pooled HTTP and
+optional metrics / recording:
+
+    python main_runtime.py [--resume <run_id>] [--since <run_id>] [--record]
+"""
+
+import os
+import sys
+
+from langchain_openai import ChatOpenAI
+
+from main import crew, edit_task, editor, openai_api_key, research_task, search_tool, write_task
+
+# Shared runtime helpers live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from crew_runtime import (
+    AgentPolicy, CheckpointStore, ConnectionPool, CrewDefinition, DedupPolicy, Headings, Language,
+    MetaDescription, ModelRouter, ModelTier, NoURLs, OpenAIEmbedder, OutputIndex, OutputWriter,
+    Recorder, Regex, SerperSearchTool, ToolPool, WordCount, metrics_from_env, new_run_id,
+)
+
+# One keep-alive connection pool for every HTTP call in this process
+# (chat, search). Concurrent runs reuse sockets instead of paying a
+# TLS handshake per client; http_pool.metrics reports the reuse ratio.
+http_pool = ConnectionPool(max_per_host=10)
+
+
+def pooled_llm(model):
+    return ChatOpenAI(model=model, temperature=0.7, openai_api_key=openai_api_key,
+                      http_client=http_pool.httpx_client())
+
+
+# Model tiering: every call starts on gpt-4o-mini and moves up to
+# gpt-4o only when the answer is empty or its Final Answer fails the
+# task's validators (router.apply() below hands each agent those of its
+# task). The editor just fixes grammar, so it is capped at the small
+# tier. Prices: USD / 1M tokens.
+router = ModelRouter(
+    [
+        ModelTier("gpt-4o-mini", pooled_llm("gpt-4o-mini"), quality=1, input_cost=0.15, output_cost=0.60),
+        ModelTier("gpt-4o", pooled_llm("gpt-4o"), quality=3, input_cost=2.50, output_cost=10.0),
+    ],
+    policies={editor.role: AgentPolicy(max_quality=1)},
+)
+
+# The format rules from the task descriptions, checked locally. A failed
+# check sends the agent a short repair prompt instead of a full rerun.
+blog_checks = [
+    Headings(level=1, count=1), Headings(level=2, count=5),
+    WordCount(800, 1000), Language("vi"), NoURLs(),
+]
+
+# Earlier research (research_output.md and the search results seen so
+# far) in a local BM25 + vector index, embedded with
+# text-embedding-3-small through the same pool. Searches the index
+# already answers with material from the last week skip Serper. Only
+# research goes in: blog posts are LLM prose, not sources. The folder
+# is scanned when the pipeline starts, and each new research output is
+# indexed as it completes (listener below).
+lesson_dir = os.path.dirname(os.path.abspath(__file__))
+research_index = OutputIndex(os.path.join(lesson_dir, "..", ".crew_index", "outputs-openai.sqlite3"),
+                             embedder=OpenAIEmbedder(http_pool, api_key=openai_api_key))
+
+# Reusable template of the crew for concurrent runs. On this path the
+# researcher searches through the pooled SerperSearchTool instead of
+# SerperDevTool, so search shares connections with the LLM calls.
+web_search = SerperSearchTool(http_pool, n_results=10, country="us", locale="en")
+template = router.apply(CrewDefinition.from_crew(
+    crew,
+    tools={search_tool.name: research_index.in_front_of(web_search, max_age=7 * 86400)},
+    validators=[
+        (research_task, [Language("en"), Regex(r"https?://", "Include a source URL for every trend.")]),
+        (write_task, blog_checks),
+        (edit_task, blog_checks + [MetaDescription(150)]),
+    ],
+    # With --since <run_id>, the editor only re-edits the paragraphs of
+    # the draft that changed since that run and patches its old post.
+    incremental=[edit_task],
+    # Search results already seen in this run (same article under another
+    # URL, syndicated copies) are dropped before they reach the prompt.
+    dedup=DedupPolicy(tools=(search_tool.name,)),
+))
+
+# Each finished task (output, scratchpad, memory) is checkpointed to
+# .crew_checkpoints/ so a failed run can pick up where it stopped.
+checkpoints = CheckpointStore()
+
+# output_file= results are written by a background thread, atomically
+# (temp file + rename), so a crash never leaves a truncated blog post.
+# For batch runs use OutputWriter("outputs") to get one folder per run.
+output_writer = OutputWriter(root=".", per_run_dirs=False)
+
+# Tool calls (Serper search) run on a small pool with a timeout, so
+# a hanging search returns a short note to the researcher instead of
+# stalling its ReAct loop.
+tool_pool = ToolPool(max_workers=8, timeout=20)
+
+# Live metrics (LLM latency, tokens, tasks in flight, cache hits) on
+# http://localhost:<port>/metrics when CREW_METRICS_PORT is set;
+# unset, nothing is attached and nothing runs.
+metrics = metrics_from_env()
+if metrics:
+    metrics.watch_writer(output_writer)
+
+# ==============================================================
+# KICKOFF
+# template.kickoff() starts the pipeline. The final result is the
+# output of the last task (edit_task = polished blog post).
+#
+# Resume an interrupted run from its last completed task with:
+#   python main_runtime.py --resume <run_id>
+# Re-run and only re-edit what changed in the draft since a run with:
+#   python main_runtime.py --since <run_id>
+# Record every LLM / tool call to traces/<run_id>.jsonl.gz with --record,
+# then replay it offline (no API calls) as a benchmark:
+#   python -m crew_runtime.replay "main_runtime.py:template" traces/<run_id>.jsonl.gz --repeat 20
+# ==============================================================
+def cli_option(name):
+    return sys.argv[sys.argv.index(name) + 1] if name in sys.argv[1:-1] else None
+
+
+if __name__ == "__main__":
+    resume = cli_option("--resume")
+    baseline = cli_option("--since")
+    run_id = resume or new_run_id()
+
+    print("\n" + "="*60)
+    print("  Starting CrewAI Research & Writing Pipeline")
+    print("  Agents: Researcher → Writer → Editor")
+    print(f"  Run id: {run_id}" + ("  (resuming)" if resume else ""))
+    if baseline:
+        print(f"  Editing incrementally against run {baseline}")
+    print("="*60 + "\n")
+
+    research_index.scan([os.path.join(lesson_dir, "research_output.md")])
+    listeners = ((research_index.listener_for([crew.tasks.index(research_task)]),)
+                 + ((metrics,) if metrics else ()))
+    if "--record" in sys.argv:
+        listeners += (Recorder(),)
+
+    try:
+        result = template.kickoff(run_id=run_id, checkpoint=checkpoints, resume=resume,
+                                  writer=output_writer, baseline=baseline,
+                                  listeners=listeners, tool_pool=tool_pool)
+    except KeyboardInterrupt:
+        print(f"\n⏸  Interrupted. Resume with: python main_runtime.py --resume {run_id}")
+        sys.exit(130)
+    finally:
+        # wait for the output files to reach disk, including those of the
+        # tasks that did finish before an interrupt or an error
+        output_writer.close()
+
+    print("\n" + "="*60)
+    print("  FINAL OUTPUT")
+    print("="*60)
+    print(result)
+
+    print("\n✅ Output files saved:")
+    print("   - research_output.md  (raw research)")
+    print("   - draft_blog.md       (first draft)")
+    print("   - final_blog.md       (polished final)")
+    print("   - crew_run.log        (execution log)")
+
+    for tier, tier_stats in router.stats().items():
+        print(f"🧠 {tier}: {tier_stats['calls']} calls, {tier_stats['escalated']} escalated, "
+              f"p95 {tier_stats['latency']['p95']}s")
+
+    stats = http_pool.metrics.snapshot()
+    print(f"\n🔌 HTTP: {stats['requests']} requests, "
+          f"{stats['connections_reused']} on reused connections ({stats['reuse_ratio']:.0%})")
@@ -38,6 +38,8 @@ INSTALL:
 
 # ── Imports ─────────────────────────────────────────────────────────
 import os
+import sys
+from dataclasses import replace
 from crewai import Crew, Agent, Task, Process
 from langchain_openai import ChatOpenAI
 
@@ -56,6 +58,75 @@ manager_llm = ChatOpenAI(
 )
 
 
+# ── Shared Runtime Helpers (optional) ────────────────────────────────
+# `python hierarchical.py` runs every example with crew.kickoff(), as the
+# lesson teaches. `python hierarchical.py --runtime` runs the same crews
+# through crew_runtime (at the repository root, next to the .env file):
+# checkpoints to .crew_checkpoints/, bounded manager history, a token
+# budget that makes the "higher token cost" of a manager measurable and
+# one keep-alive connection pool for the manager's many short calls.
+USE_RUNTIME = "--runtime" in sys.argv
+if USE_RUNTIME:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from crew_runtime import (
+        Budget, BudgetExceeded, CheckpointStore, ConnectionPool, CrewDefinition, ScratchpadPolicy,
+        TokenBudget, format_report, new_run_id,
+    )
+
+    # The manager calls the LLM after every delegation: reuse its
+    # connections instead of paying a TLS handshake per client
+    http_pool = ConnectionPool(max_per_host=10)
+    manager_llm = ChatOpenAI(model="gpt-4o", temperature=0.1,
+                             http_client=http_pool.httpx_client())
+
+    # Every call is counted locally. Past the soft budget the crew compacts
+    # its history, stops delegating and moves to gpt-4o-mini; the hard
+    # budget stops the run outright. The manager's own budget is keyed on
+    # its role in run_crew(): "Crew Manager", or a custom manager_agent's.
+    token_budget = TokenBudget(
+        run=Budget(soft=150_000, hard=250_000),
+        small_llm=ChatOpenAI(model="gpt-4o-mini", http_client=http_pool.httpx_client()),
+    )
+    manager_budget = Budget(soft=60_000)
+    checkpoints = CheckpointStore()
+
+
+def run_crew(crew, inputs, resume=None):
+    """crew.kickoff(inputs=inputs), or with --runtime a checkpointed run.
+
+    With the runtime, inputs are checked against every {placeholder}
+    before any LLM call and resume=<run id> continues a stopped run.
+    """
+    if not USE_RUNTIME:
+        return crew.kickoff(inputs=inputs)
+    # Managers and delegating agents loop for many steps: keep the last 4
+    # in full and fold older ones into short notes so prompts stay bounded
+    template = CrewDefinition.from_crew(crew, scratchpad=ScratchpadPolicy(keep_last=4))
+    budget = replace(token_budget, agents={template.manager.role: manager_budget})
+    run_id = resume or new_run_id()
+
+    # Repeated or circular delegations are short-circuited by the runtime;
+    # count them so the saving is visible after the run
+    def report(ctx, event, data):
+        if event == "run_completed":
+            stats = ctx.delegations.stats()
+            if stats["delegations"].get("repeat") or stats["delegations"].get("cycle"):
+                print(f"\n[DELEGATION] {stats['delegations']} — "
+                      f"~{stats['saved_calls']} LLM calls saved")
+
+    try:
+        result = template.kickoff(inputs, run_id=run_id, checkpoint=checkpoints, resume=resume,
+                                  listeners=(report,), budget=budget)
+    except KeyboardInterrupt:
+        print(f"\n⏸  Interrupted. Finished tasks are saved — resume with run id: {run_id}")
+        raise SystemExit(130)
+    except BudgetExceeded as exc:
+        print(f"\n⛔ {exc}. Finished tasks are saved — resume with run id: {run_id}")
+        raise SystemExit(1)
+    print("\n" + format_report(result.usage))
+    return result
+
+
 # ════════════════════════════════════════════════════════════════════
 # EXAMPLE 1 — Investment Research Platform
 # ════════════════════════════════════════════════════════════════════
@@ -63,7 +134,7 @@ manager_llm = ChatOpenAI(
 #  Manager dynamically coordinates:
 #    Financial Analyst, Risk Specialist, Market Researcher, Writer
 #
-def example_1_investment_research():
+def example_1_investment_research(resume=None):
     print("\n" + "=" * 60)
     print("EXAMPLE 1 — Investment Research Platform")
     print("=" * 60)
@@ -190,7 +261,7 @@ def example_1_investment_research():
         verbose=True,
     )
 
-    result = crew.kickoff(inputs={"company": "Tesla (TSLA)"})
+    result = run_crew(crew, {"company": "Tesla (TSLA)"}, resume=resume)
     print("\n[RESULT]\n", result)
     return result
 
@@ -202,7 +273,7 @@ def example_1_investment_research():
 #  Manager coordinates: Tech Lead, UX Designer, Backend Dev,
 #  Frontend Dev, QA Engineer → Project Plan
 #
-def example_2_software_project_planning():
+def example_2_software_project_planning(resume=None):
     print("\n" + "=" * 60)
     print("EXAMPLE 2 — Software Project Planning System")
     print("=" * 60)
@@ -353,12 +424,12 @@ def example_2_software_project_planning():
         verbose=True,
     )
 
-    result = crew.kickoff(inputs={
+    result = run_crew(crew, {
         "project_description": (
             "A SaaS platform for freelancers to manage invoices, "
             "clients, and payments with AI-powered financial insights"
         )
-    })
+    }, resume=resume)
     print("\n[RESULT]\n", result)
     return result
 
@@ -370,11 +441,8 @@ def example_2_software_project_planning():
 #  You can also provide a CUSTOM Manager Agent with specific
 #  role, goal, and backstory — for fine-grained control.
 #
-def example_3_custom_manager():
-    print("\n" + "=" * 60)
-    print("EXAMPLE 3 — Custom Manager Agent")
-    print("=" * 60)
-
+def build_market_research_crew():
+    """Custom-manager market research crew for '{market}' (also a workflow node)."""
     # ── Define a custom Manager Agent ─────────────────────────────
     custom_manager = Agent(
         role="Chief Research Coordinator",
@@ -452,7 +520,7 @@ def example_3_custom_manager():
     )
 
     # ── Crew with Custom Manager ───────────────────────────────────
-    crew = Crew(
+    return Crew(
         agents=[trend_analyst, consumer_researcher, competitive_analyst],
         tasks=[trend_task, consumer_task, competitive_task, synthesis_task],
         process=Process.hierarchical,
@@ -461,7 +529,14 @@ def example_3_custom_manager():
         verbose=True,
     )
 
-    result = crew.kickoff(inputs={"market": "AI-powered productivity tools"})
+
+def example_3_custom_manager(resume=None):
+    print("\n" + "=" * 60)
+    print("EXAMPLE 3 — Custom Manager Agent")
+    print("=" * 60)
+
+    crew = build_market_research_crew()
+    result = run_crew(crew, {"market": "AI-powered productivity tools"}, resume=resume)
     print("\n[RESULT]\n", result)
     return result
 
@@ -529,13 +604,16 @@ if __name__ == "__main__":
     """)
 
     choice = input("Enter example number (1/2/3): ").strip()
+    resume = None
+    if USE_RUNTIME:
+        resume = input("Resume run id (press Enter to start fresh): ").strip() or None
 
     if choice == "1":
-        example_1_investment_research()
+        example_1_investment_research(resume)
     elif choice == "2":
-        example_2_software_project_planning()
+        example_2_software_project_planning(resume)
     elif choice == "3":
-        example_3_custom_manager()
+        example_3_custom_manager(resume)
     else:
         print("Invalid choice. Running Example 1 by default...")
-        example_1_investment_research()
\ No newline at end of file
+        example_1_investment_research(resume)
\ No newline at end of file
@@ -24,6 +24,7 @@ INSTALL:
 
 # ── Imports ─────────────────────────────────────────────────────────
 import os
+import sys
 from crewai import Crew, Agent, Task, Process
 import dotenv
 dotenv.load_dotenv()  # Load .env file if it exists
@@ -36,6 +37,41 @@ dotenv.load_dotenv()  # Load .env file if it exists
 # os.environ["OPENAI_API_KEY"] = "sk-..."
 
 
+# ── Shared Runtime Helpers (optional) ────────────────────────────────
+# `python sequential.py` runs every example with crew.kickoff(), as the
+# lesson teaches. `python sequential.py --runtime` runs the same crews
+# through crew_runtime (at the repository root, next to the .env file):
+# every finished task is checkpointed to .crew_checkpoints/, so a crash
+# or Ctrl-C only loses the task that was running.
+USE_RUNTIME = "--runtime" in sys.argv
+if USE_RUNTIME:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from crew_runtime import CheckpointStore, CrewDefinition, Dataset, new_run_id
+
+    checkpoints = CheckpointStore()
+
+
+def run_crew(crew, inputs, resume=None, incremental=(), baseline=None, datasets=()):
+    """crew.kickoff(inputs=inputs), or with --runtime a checkpointed run.
+
+    With the runtime, inputs are checked against every {placeholder}
+    before any LLM call, resume=<run id> continues a stopped run, tasks
+    in `incremental` only re-edit what changed since run `baseline` and
+    `datasets` pairs tasks with local files they analyse (see example 3).
+    """
+    if not USE_RUNTIME:
+        return crew.kickoff(inputs=inputs)
+    template = CrewDefinition.from_crew(crew, incremental=incremental, datasets=datasets)
+    run_id = resume or new_run_id()
+    print(f"Run id: {run_id}")
+    try:
+        return template.kickoff(inputs, run_id=run_id, checkpoint=checkpoints, resume=resume,
+                                baseline=baseline)
+    except KeyboardInterrupt:
+        print(f"\n⏸  Interrupted. Finished tasks are saved — resume with run id: {run_id}")
+        raise SystemExit(130)
+
+
 # ════════════════════════════════════════════════════════════════════
 # EXAMPLE 1 — Basic Sequential: 3-Step Content Pipeline
 # ════════════════════════════════════════════════════════════════════
@@ -43,7 +79,7 @@ dotenv.load_dotenv()  # Load .env file if it exists
 #  Researcher  →  Writer  →  Editor
 #  (research)    (draft)    (polish)
 #
-def example_1_basic_content_pipeline():
+def example_1_basic_content_pipeline(resume=None, baseline=None):
     print("\n" + "=" * 60)
     print("EXAMPLE 1 — Basic 3-Step Content Pipeline")
     print("=" * 60)
@@ -138,10 +174,12 @@ def example_1_basic_content_pipeline():
     )
 
     # ── Step 4: Kick Off with Dynamic Inputs ─────────────────────
-    result = crew.kickoff(inputs={
+    # With a baseline run id, the editor only re-edits the paragraphs
+    # of the new draft that differ from that run's draft.
+    result = run_crew(crew, {
         "topic": "The Rise of AI Agents in 2025",
         "word_count": "800",
-    })
+    }, resume=resume, incremental=[edit_task], baseline=baseline)
 
     print("\n[RESULT]\n", result)
     return result
@@ -157,7 +195,7 @@ def example_1_basic_content_pipeline():
 #
 #  Two independent tasks feed INTO the Writer simultaneously.
 #
-def example_2_multi_context_seo_pipeline():
+def example_2_multi_context_seo_pipeline(resume=None):
     print("\n" + "=" * 60)
     print("EXAMPLE 2 — Multi-Context SEO Content Factory")
     print("=" * 60)
@@ -273,7 +311,7 @@ def example_2_multi_context_seo_pipeline():
         verbose=True,
     )
 
-    result = crew.kickoff(inputs={"topic": "Machine Learning for Beginners"})
+    result = run_crew(crew, {"topic": "Machine Learning for Beginners"}, resume=resume)
     print("\n[RESULT]\n", result)
     return result
 
@@ -284,11 +322,8 @@ def example_2_multi_context_seo_pipeline():
 #
 #  Data Collector → Analyst → Visualizer → Report Writer
 #
-def example_3_data_analysis_pipeline():
-    print("\n" + "=" * 60)
-    print("EXAMPLE 3 — Data Analysis Pipeline")
-    print("=" * 60)
-
+def build_data_analysis_crew():
+    """Collect → Analyze → Report crew for '{analysis_subject}' (also a workflow node)."""
     data_collector = Agent(
         role="Data Collection Specialist",
         goal="Gather and clean raw data about the specified topic",
@@ -364,14 +399,127 @@ def example_3_data_analysis_pipeline():
         context=[collect_task, analyze_task],
     )
 
-    crew = Crew(
+    return Crew(
         agents=[data_collector, analyst, report_writer],
         tasks=[collect_task, analyze_task, report_task],
         process=Process.sequential,
         verbose=True,
     )
 
-    result = crew.kickoff(inputs={"analysis_subject": "Global EV Adoption 2020-2024"})
+
+def example_3_data_analysis_pipeline(resume=None, dataset_path=None):
+    print("\n" + "=" * 60)
+    print("EXAMPLE 3 — Data Analysis Pipeline")
+    print("=" * 60)
+
+    crew = build_data_analysis_crew()
+    collect_task, analyze_task, _ = crew.tasks
+    datasets = ()
+    if dataset_path:
+        # A local CSV / Parquet file of any size: it is streamed in parallel
+        # shards and only its profile reaches the collector and the analyst,
+        # who can also call "Describe dataset" / "Aggregate dataset"
+        dataset = Dataset(dataset_path)
+        datasets = [(collect_task, dataset), (analyze_task, dataset)]
+    result = run_crew(crew, {"analysis_subject": "Global EV Adoption 2020-2024"}, resume=resume,
+                      datasets=datasets)
+    print("\n[RESULT]\n", result)
+    return result
+
+
+# ════════════════════════════════════════════════════════════════════
+# EXAMPLE 4 — Parallel Research with Shared Memory
+# ════════════════════════════════════════════════════════════════════
+#
+#  Market Analyst     ──┐
+#  Technology Analyst ──┼──→ Briefing Writer
+#  Policy Analyst     ──┘
+#  (async_execution=True: all three run AT THE SAME TIME)
+#
+#  With memory=True every finished task is also saved to the crew's
+#  memory, so the writer can draw on all three notes. Under --runtime
+#  the parallel analysts write to memory without waiting on each other.
+#
+def example_4_parallel_research_with_memory(resume=None):
+    print("\n" + "=" * 60)
+    print("EXAMPLE 4 — Parallel Research with Shared Memory")
+    print("=" * 60)
+
+    # ── Agents ───────────────────────────────────────────────────
+    market_analyst = Agent(
+        role="Market Analyst",
+        goal="Size the market for {topic} and name the leading companies",
+        backstory="You read industry reports and turn them into a few hard numbers.",
+        verbose=True,
+        allow_delegation=False,
+    )
+
+    technology_analyst = Agent(
+        role="Technology Analyst",
+        goal="Explain the state of the technology behind {topic}",
+        backstory="You follow research papers and product launches and separate hype from progress.",
+        verbose=True,
+        allow_delegation=False,
+    )
+
+    policy_analyst = Agent(
+        role="Policy Analyst",
+        goal="Summarize the regulation that shapes {topic}",
+        backstory="You track laws, standards and subsidies across the US, EU and Asia.",
+        verbose=True,
+        allow_delegation=False,
+    )
+
+    briefing_writer = Agent(
+        role="Briefing Writer",
+        goal="Combine specialist notes into one executive briefing",
+        backstory="You write one-page briefings that busy executives actually read.",
+        verbose=True,
+        allow_delegation=False,
+    )
+
+    # ── Tasks ─────────────────────────────────────────────────────
+    # async_execution=True: the crew starts the next task without waiting,
+    # so these three independent research tasks run in parallel
+    market_task = Task(
+        description="Research the market for '{topic}': size, growth rate and top 5 companies.",
+        expected_output="Market notes: size, growth, top 5 companies with one line each.",
+        agent=market_analyst,
+        async_execution=True,
+    )
+
+    technology_task = Task(
+        description="Research the technology behind '{topic}': what works today and what is coming.",
+        expected_output="Technology notes: 5 bullet points on current capabilities and limits.",
+        agent=technology_analyst,
+        async_execution=True,
+    )
+
+    policy_task = Task(
+        description="Research the regulation of '{topic}' in the US, the EU and China.",
+        expected_output="Policy notes: the main rule in each region and how it affects the market.",
+        agent=policy_analyst,
+        async_execution=True,
+    )
+
+    # The first task without async_execution waits for all three (join)
+    briefing_task = Task(
+        description="Write an executive briefing on '{topic}' from the market, technology and policy notes.",
+        expected_output="A one-page briefing: summary, 3 key findings, 3 risks, 1 recommendation.",
+        agent=briefing_writer,
+        context=[market_task, technology_task, policy_task],
+    )
+
+    # ── Crew ──────────────────────────────────────────────────────
+    crew = Crew(
+        agents=[market_analyst, technology_analyst, policy_analyst, briefing_writer],
+        tasks=[market_task, technology_task, policy_task, briefing_task],
+        process=Process.sequential,
+        memory=True,              # notes of every task are kept for the others
+        verbose=True,
+    )
+
+    result = run_crew(crew, {"topic": "Solid-State Batteries"}, resume=resume)
     print("\n[RESULT]\n", result)
     return result
 
@@ -428,17 +576,27 @@ if __name__ == "__main__":
 ║    1 → Basic Content Pipeline    (Researcher→Writer→Editor)  ║
 ║    2 → Multi-Context SEO Factory (Fork-and-Join pattern)     ║
 ║    3 → Data Analysis Pipeline    (Collect→Analyze→Report)    ║
+║    4 → Parallel Research + Memory (async_execution=True)     ║
 ╚══════════════════════════════════════════════════════════════╝
     """)
 
-    choice = input("Enter example number (1/2/3): ").strip()
+    choice = input("Enter example number (1/2/3/4): ").strip()
+    resume = baseline = dataset_path = None
+    if USE_RUNTIME:
+        resume = input("Resume run id (press Enter to start fresh): ").strip() or None
+        if choice == "3":
+            dataset_path = input("Local CSV / Parquet file to analyse (press Enter to skip): ").strip() or None
+        if choice == "1" and not resume:
+            baseline = input("Previous run id to re-edit incrementally (press Enter to skip): ").strip() or None
 
     if choice == "1":
-        example_1_basic_content_pipeline()
+        example_1_basic_content_pipeline(resume, baseline)
     elif choice == "2":
-        example_2_multi_context_seo_pipeline()
+        example_2_multi_context_seo_pipeline(resume)
     elif choice == "3":
-        example_3_data_analysis_pipeline()
+        example_3_data_analysis_pipeline(resume, dataset_path)
+    elif choice == "4":
+        example_4_parallel_research_with_memory(resume)
     else:
         print("Invalid choice. Running Example 1 by default...")
-        example_1_basic_content_pipeline()
\ No newline at end of file
+        example_1_basic_content_pipeline(resume)
\ No newline at end of file
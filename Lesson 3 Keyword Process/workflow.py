@@ -0,0 +1,73 @@
+"""
+============================================================
+  CrewAI — Chaining Crews  |  Workflow of Lesson Crews
+============================================================
+
+CONCEPT:
+  One crew's final output can be the next crew's input. This
+  file chains three crews from the lessons into one workflow:
+
+    EV data analysis        sequential.py, example 3
+        │  (executive report)
+        ▼
+    Market research         hierarchical.py, example 3
+        │  (market report)                    ┌─ EV explainer blog
+        ▼                                     │  Lesson 1 blog crew,
+    Market blog post        Lesson 1 crew     │  independent of the
+                                              └─ chain → runs in parallel
+
+  Each crew runs in its own process as soon as its inputs are
+  ready. Results are saved under .crew_workflow/, so running the
+  file again only re-runs crews whose inputs changed.
+
+INSTALL:
+  pip install crewai crewai-tools langchain-openai
+
+============================================================
+"""
+
+import os
+import sys
+
+import dotenv
+dotenv.load_dotenv()  # Load .env file if it exists
+
+# crew_runtime lives at the repository root (next to the .env file).
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+from crew_runtime import From, Node, Workflow
+
+LESSON_1 = os.path.join(ROOT, "Lesson 1  Key concepts with keywords  Agent - Task - Crew", "main.py")
+LESSON_3 = os.path.dirname(os.path.abspath(__file__))
+
+# ── Nodes and Edges ──────────────────────────────────────────────────
+# A node names a crew as "file.py:attribute"; the crew is built inside
+# the worker process. From("node") is the final output of that node.
+# Lesson 1's crew has no {analysis} / {report} placeholder, so those
+# edges are handed to its first task as context.
+flow = Workflow("ev-market-blog", [
+    Node("ev_analysis",
+         os.path.join(LESSON_3, "sequential.py") + ":build_data_analysis_crew",
+         {"analysis_subject": "Global EV Adoption 2020-2024"}),
+    Node("market_report",
+         os.path.join(LESSON_3, "hierarchical.py") + ":build_market_research_crew",
+         {"market": "EV charging infrastructure", "analysis": From("ev_analysis")}),
+    Node("market_blog", LESSON_1 + ":crew",
+         {"topic": "The EV charging market in 2025", "report": From("market_report")}),
+    Node("ev_explainer", LESSON_1 + ":crew",
+         {"topic": "How electric cars work"}),
+])
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print(f"  Workflow: {flow.name}  ({' → '.join(flow.order)})")
+    print("=" * 60)
+
+    result = flow.run(max_workers=4)
+
+    for name, artifact in result.artifacts.items():
+        status = "reused" if artifact["cached"] else f"ran in {artifact['seconds']}s"
+        print(f"  {name:<15} {status}")
+    print(f"\nTotal: {result.elapsed:.1f}s")
+    print("\n[MARKET BLOG]\n", result.outputs["market_blog"])
@@ -0,0 +1,188 @@
+"""
+crew_runtime — shared helpers for running the lesson crews at scale.
+
+The lesson scripts stay plain CrewAI tutorials. Anything they need
+for batch / concurrent / production-style runs lives here so that
+every lesson can import it (each script adds the repository root to
+sys.path, the same folder that holds the shared .env file).
+"""
+
+from .budget import (
+    Budget,
+    BudgetExceeded,
+    TokenBudget,
+    Tokenizer,
+    format_report,
+)
+from .checkpoint import CheckpointError, CheckpointStore
+from .datasets import Dataset, DatasetError, DatasetProfile
+from .dedup import DedupPolicy, canonical_url
+from .definition import (
+    AgentSpec,
+    CrewDefinition,
+    CrewResult,
+    RunContext,
+    TaskOutput,
+    TaskSpec,
+    new_run_id,
+)
+from .delegation import DelegationTracker
+from .distributed import (
+    Coordinator,
+    JobFailed,
+    RedisBroker,
+    SQLiteBroker,
+    Worker,
+    open_broker,
+)
+from .histogram import LatencyHistogram
+from .httppool import (
+    ConnectionPool,
+    HTTPError,
+    OpenAIChatLLM,
+    OpenAIEmbedder,
+    SerperSearchTool,
+)
+from .llm import FakeLLM, LLMResponse, as_llm
+from .memory import MemorySnapshot, RunMemory
+from .metrics import CrewMetrics, metrics_from_env
+from .prompts import MessageCache, SystemPrompts, chat_body
+from .replay import Recorder, ReplayError, Trace, replay
+from .retrieval import HashingEmbedder, OutputIndex
+from .routing import AgentPolicy, ModelRouter, ModelTier
+from .runlog import (
+    ConsoleSink,
+    DEBUG,
+    ERROR,
+    INFO,
+    JSONLinesSink,
+    Logger,
+    WARNING,
+)
+from .scheduler import (
+    AdmissionError,
+    BATCH,
+    CallGate,
+    DeadlineExceeded,
+    INTERACTIVE,
+    JobScheduler,
+    NORMAL,
+)
+from .scratchpad import ScratchpadPolicy
+from .templates import (
+    CompiledTemplate,
+    MissingInputsError,
+    PromptTemplates,
+    RenderedPrompts,
+    compile_template,
+)
+from .toolpool import ToolLimits, ToolPool
+from .validators import (
+    Headings,
+    Language,
+    MetaDescription,
+    NoURLs,
+    Regex,
+    Validator,
+    WordCount,
+)
+from .workflow import (
+    From,
+    Node,
+    Workflow,
+    WorkflowError,
+    WorkflowResult,
+    load_crew,
+)
+from .writer import OutputWriter, write_atomic
+
+__all__ = [
+    "AdmissionError",
+    "AgentPolicy",
+    "AgentSpec",
+    "BATCH",
+    "Budget",
+    "BudgetExceeded",
+    "CallGate",
+    "CheckpointError",
+    "CheckpointStore",
+    "CompiledTemplate",
+    "ConnectionPool",
+    "ConsoleSink",
+    "Coordinator",
+    "CrewDefinition",
+    "CrewMetrics",
+    "CrewResult",
+    "DEBUG",
+    "Dataset",
+    "DatasetError",
+    "DatasetProfile",
+    "DeadlineExceeded",
+    "DedupPolicy",
+    "DelegationTracker",
+    "ERROR",
+    "FakeLLM",
+    "From",
+    "HTTPError",
+    "HashingEmbedder",
+    "Headings",
+    "INFO",
+    "INTERACTIVE",
+    "JSONLinesSink",
+    "JobFailed",
+    "JobScheduler",
+    "LLMResponse",
+    "Language",
+    "LatencyHistogram",
+    "Logger",
+    "MemorySnapshot",
+    "MessageCache",
+    "MetaDescription",
+    "MissingInputsError",
+    "ModelRouter",
+    "ModelTier",
+    "NORMAL",
+    "NoURLs",
+    "Node",
+    "OpenAIChatLLM",
+    "OpenAIEmbedder",
+    "OutputIndex",
+    "OutputWriter",
+    "PromptTemplates",
+    "Recorder",
+    "RedisBroker",
+    "Regex",
+    "RenderedPrompts",
+    "ReplayError",
+    "RunContext",
+    "RunMemory",
+    "SQLiteBroker",
+    "ScratchpadPolicy",
+    "SerperSearchTool",
+    "SystemPrompts",
+    "TaskOutput",
+    "TaskSpec",
+    "TokenBudget",
+    "Tokenizer",
+    "ToolLimits",
+    "ToolPool",
+    "Trace",
+    "Validator",
+    "WARNING",
+    "WordCount",
+    "Worker",
+    "Workflow",
+    "WorkflowError",
+    "WorkflowResult",
+    "as_llm",
+    "canonical_url",
+    "chat_body",
+    "compile_template",
+    "format_report",
+    "load_crew",
+    "metrics_from_env",
+    "new_run_id",
+    "open_broker",
+    "replay",
+    "write_atomic",
+]
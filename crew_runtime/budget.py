@@ -0,0 +1,269 @@
+"""
+============================================================
+  crew_runtime.budget  |  Token accounting and budgets
+============================================================
+
+CONCEPT:
+  hierarchical.py warns that a manager means "higher token cost",
+  and Lesson 2 only caps requests per minute. Nothing says how many
+  tokens a run, a task or an agent used, and nothing stops a
+  manager that keeps delegating.
+
+  With kickoff(budget=TokenBudget(...)) every LLM call is counted
+  on this machine:
+
+    before   prompt tokens of the messages (tiktoken's encoding for
+             the model when installed, otherwise an estimate of
+             ~4 characters per word piece); a call that would cross
+             a HARD budget is not sent: BudgetExceeded is raised
+    after    completion tokens of the reply, added to the run, the
+             task and the agent; what the provider reported is kept
+             next to it for comparison
+
+  Budget(soft=, hard=) is a number of tokens. TokenBudget holds one
+  for the run, per task (index or name) and per agent (role).
+  Crossing a SOFT budget emits a `budget` event and switches on the
+  degradations for every agent the budget covers:
+
+    "compact"      the ReAct history is folded to TokenBudget.compact
+                   (a ScratchpadPolicy) before the next call
+    "delegation"   delegation tools refuse; the agent finishes alone
+    "model"        further calls go to TokenBudget.small_llm
+
+  result.usage is the run's report (tokens and calls per task and
+  agent, budgets hit, degradations); format_report() prints it.
+
+USAGE:
+  budget = TokenBudget(run=Budget(soft=60_000, hard=90_000),
+                       agents={"Crew Manager": Budget(soft=15_000)},
+                       small_llm=ChatOpenAI(model="gpt-4o-mini"))
+  result = template.kickoff(inputs, budget=budget)
+  print(format_report(result.usage))
+
+============================================================
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+
+from .llm import as_llm, model_name
+from .scratchpad import ScratchpadPolicy
+
+_PIECE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+DEGRADATIONS = ("compact", "delegation", "model")
+
+
+class BudgetExceeded(RuntimeError):
+    """A call would cross a hard token budget."""
+
+    def __init__(self, scope, name, used, limit, hit=None):
+        self.scope = scope
+        self.name = name
+        self.used = used
+        self.limit = limit
+        self.hit = hit   # the report entry of this call (RunBudget.hits)
+        where = scope if name == scope else f"{scope} {name!r}"
+        super().__init__(f"{where} token budget exceeded: the next call needs ~{used} of {limit}")
+
+
+# ── Counting ─────────────────────────────────────────────────────────
+class Tokenizer:
+    """Counts tokens locally: tiktoken when installed, else an estimate."""
+
+    def __init__(self, model=None):
+        self.encoding = None
+        try:
+            import tiktoken
+        except ImportError:
+            pass
+        else:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model or "")
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:  # no cached BPE file and no network: estimate instead
+                self.encoding = None
+        self.name = f"tiktoken:{self.encoding.name}" if self.encoding is not None else "estimate"
+
+    def count(self, text):
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return sum((len(piece) + 3) // 4 for piece in _PIECE.findall(text))
+
+    def count_messages(self, messages):
+        # chat format overhead: ~4 tokens per message, 3 to prime the reply
+        return sum(self.count(m["content"]) + 4 for m in messages) + 3
+
+
+_tokenizers = {}
+_tokenizers_lock = threading.Lock()
+
+
+def tokenizer_for(model):
+    """One Tokenizer per model name, created on first use."""
+    tokenizer = _tokenizers.get(model)
+    if tokenizer is None:
+        with _tokenizers_lock:
+            tokenizer = _tokenizers.get(model)
+            if tokenizer is None:
+                tokenizer = _tokenizers[model] = Tokenizer(model)
+    return tokenizer
+
+
+# ── Policy ───────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Budget:
+    soft: int = None    # tokens; crossing it turns on the degradations
+    hard: int = None    # tokens; a call that would cross it is refused
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    run: Budget = Budget()
+    tasks: object = None       # {task index or name: Budget}
+    agents: object = None      # {agent role: Budget}
+    degrade: tuple = DEGRADATIONS
+    small_llm: object = None   # used by "model"; None skips that step
+    compact: ScratchpadPolicy = ScratchpadPolicy(keep_last=1, notes_tokens=400, note_chars=120)
+    reserve: int = 256         # completion tokens assumed when checking a hard budget
+
+
+class Usage:
+    __slots__ = ("prompt", "completion", "calls", "reported_prompt", "reported_completion")
+
+    def __init__(self):
+        self.prompt = self.completion = self.calls = 0
+        self.reported_prompt = self.reported_completion = 0
+
+    @property
+    def total(self):
+        return self.prompt + self.completion
+
+    def as_dict(self):
+        return {"prompt": self.prompt, "completion": self.completion, "total": self.total,
+                "calls": self.calls, "reported_prompt": self.reported_prompt,
+                "reported_completion": self.reported_completion}
+
+
+# ── Per-run accounting ───────────────────────────────────────────────
+class RunBudget:
+    """Token usage of one run against a TokenBudget; put on RunContext.budget."""
+
+    def __init__(self, policy, definition):
+        self.policy = policy
+        self.definition = definition
+        self.small_llm = as_llm(policy.small_llm) if "model" in policy.degrade else None
+        self.actions = [a for a in policy.degrade if a != "model" or self.small_llm is not None]
+        self.run = Usage()
+        self.tasks = {}            # task index → Usage
+        self.agents = {}           # agent index → Usage
+        self.degraded = set()      # ("run", None) / ("task", i) / ("agent", i) past their soft budget
+        self.hits = []             # report entries, in order
+        self.tokenizers = set()
+        self._lock = threading.Lock()   # parallel (async_execution) tasks share the counters
+
+    def _scopes(self, agent_index, task_index):
+        """(scope, key, name, Budget, Usage) of every budget covering this call."""
+        policy = self.policy
+        scopes = [("run", None, "run", policy.run, self.run)]
+        task = self.definition.tasks[task_index]
+        budget = (policy.tasks or {}).get(task_index) or (policy.tasks or {}).get(task.name)
+        if budget is not None:
+            usage = self.tasks.setdefault(task_index, Usage())
+            scopes.append(("task", task_index, task.name or f"task {task_index}", budget, usage))
+        role = self.definition.all_agents[agent_index].role
+        budget = (policy.agents or {}).get(role)
+        if budget is not None:
+            scopes.append(("agent", agent_index, role, budget, self.agents.setdefault(agent_index, Usage())))
+        return scopes
+
+    def _active(self, agent_index, task_index):
+        with self._lock:
+            return any((scope, key) in self.degraded for scope, key, *_ in self._scopes(agent_index, task_index))
+
+    # ── degradations ──────────────────────────────────────────────
+    def llm_for(self, agent_index, task_index):
+        """The small model once a covering soft budget is hit, else None."""
+        if self.small_llm is not None and self._active(agent_index, task_index):
+            return self.small_llm
+        return None
+
+    def compact_policy(self, agent_index, task_index):
+        if "compact" in self.policy.degrade and self._active(agent_index, task_index):
+            return self.policy.compact
+        return None
+
+    def may_delegate(self, agent_index, task_index):
+        return "delegation" not in self.policy.degrade or not self._active(agent_index, task_index)
+
+    # ── counting ──────────────────────────────────────────────────
+    def before(self, agent_index, task_index, messages, llm):
+        """Prompt tokens of a call; BudgetExceeded (with its report entry
+        as .hit) if it would cross a hard budget."""
+        tokenizer = tokenizer_for(model_name(llm))
+        prompt = tokenizer.count_messages(messages)
+        with self._lock:
+            self.tokenizers.add(tokenizer.name)
+            for scope, _, name, budget, usage in self._scopes(agent_index, task_index):
+                needed = usage.total + prompt + self.policy.reserve
+                if budget.hard is not None and needed > budget.hard:
+                    hit = {"kind": "hard", "scope": scope, "name": name,
+                           "used": usage.total, "limit": budget.hard}
+                    self.hits.append(hit)
+                    raise BudgetExceeded(scope, name, needed, budget.hard, hit)
+        return prompt
+
+    def after(self, agent_index, task_index, prompt, response, llm):
+        """Record a finished call; returns the soft budgets it crossed (report entries)."""
+        completion = tokenizer_for(model_name(llm)).count(response.text)
+        crossed = []
+        with self._lock:
+            for usage in (self.run, self.tasks.setdefault(task_index, Usage()),
+                          self.agents.setdefault(agent_index, Usage())):
+                usage.prompt += prompt
+                usage.completion += completion
+                usage.calls += 1
+                usage.reported_prompt += response.prompt_tokens or 0
+                usage.reported_completion += response.completion_tokens or 0
+            for scope, key, name, budget, usage in self._scopes(agent_index, task_index):
+                if budget.soft is not None and usage.total >= budget.soft and (scope, key) not in self.degraded:
+                    self.degraded.add((scope, key))
+                    hit = {"kind": "soft", "scope": scope, "name": name, "used": usage.total,
+                           "limit": budget.soft, "actions": list(self.actions)}
+                    self.hits.append(hit)
+                    crossed.append(hit)
+        return crossed
+
+    # ── report ────────────────────────────────────────────────────
+    def report(self):
+        definition = self.definition
+        return {
+            "tokenizer": ", ".join(sorted(self.tokenizers)) or "none",
+            "run": dict(self.run.as_dict(), soft=self.policy.run.soft, hard=self.policy.run.hard),
+            "tasks": {definition.tasks[i].name or f"task {i}": u.as_dict() for i, u in sorted(self.tasks.items())},
+            "agents": {definition.all_agents[i].role: u.as_dict() for i, u in sorted(self.agents.items())},
+            "hits": list(self.hits),
+        }
+
+
+def format_report(report):
+    """The usage report as a small text table."""
+    if not report:
+        return "(no token budget on this run)"
+    run = report["run"]
+    limits = ", ".join(f"{k} {run[k]:,}" for k in ("soft", "hard") if run[k] is not None)
+    lines = [f"Tokens ({report['tokenizer']}): {run['total']:,} in {run['calls']} calls"
+             + (f"  [{limits}]" if limits else "")]
+    for title in ("tasks", "agents"):
+        for name, usage in report[title].items():
+            lines.append(f"  {title[:-1]:<6} {name[:40]:<40} {usage['prompt']:>9,} + {usage['completion']:>7,}"
+                         f"  ({usage['calls']} calls)")
+    for hit in report["hits"]:
+        action = f" → {', '.join(hit['actions'])}" if hit.get("actions") else ""
+        lines.append(f"  {hit['kind']} budget hit: {hit['scope']} {hit['name']!r} "
+                     f"{hit['used']:,}/{hit['limit']:,}{action}")
+    return "\n".join(lines)
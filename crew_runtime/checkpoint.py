@@ -0,0 +1,200 @@
+"""
+============================================================
+  crew_runtime.checkpoint  |  Durable checkpoint / resume
+============================================================
+
+CONCEPT:
+  Lesson 2's crew_run.log shows the research → write → edit
+  pipeline starting again from scratch after a failed run, and a
+  Ctrl-C in the input() menus of Lesson 3 throws away every task
+  that already finished.
+
+  CheckpointStore writes to a local SQLite file, as the run goes:
+
+    runs        run id, inputs, crew fingerprint, status
+    tasks       each completed task output + its memory delta
+    scratchpad  every Thought / Action / Observation step of a
+                task's own agent (a coworker's steps end up in the
+                delegating agent's observation)
+
+  Resuming restores the finished outputs and memory into a new
+  RunContext; the executor skips those tasks, and the agent of a
+  task that was cut short continues after its last recorded step,
+  so a failed pipeline only pays again for the work that was lost.
+
+USAGE:
+  store = CheckpointStore()                       # .crew_checkpoints/
+  template.kickoff(inputs, run_id=rid, checkpoint=store)
+  ...crash / Ctrl-C...
+  template.kickoff(resume=rid, checkpoint=store)
+
+============================================================
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .definition import TaskOutput
+from .executor import AgentStep
+
+DEFAULT_PATH = os.path.join(".crew_checkpoints", "checkpoints.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    inputs      TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    run_id       TEXT NOT NULL,
+    task         INTEGER NOT NULL,
+    name         TEXT,
+    agent        TEXT,
+    output       TEXT NOT NULL,
+    memory_delta TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (run_id, task)
+);
+CREATE TABLE IF NOT EXISTS scratchpad (
+    run_id      TEXT NOT NULL,
+    task        INTEGER NOT NULL,
+    agent       INTEGER NOT NULL,
+    text        TEXT NOT NULL,
+    action      TEXT,
+    action_input TEXT,
+    observation TEXT,
+    created_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scratchpad_run ON scratchpad (run_id, task);
+"""
+
+
+class CheckpointError(Exception):
+    """The requested run cannot be resumed."""
+
+
+class CheckpointStore:
+    """SQLite-backed checkpoints; safe to share between threads."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, sql, params):
+        conn = self._conn()
+        with conn:  # one transaction per checkpoint
+            conn.execute(sql, params)
+
+    # ── recording ─────────────────────────────────────────────────
+    def start(self, ctx):
+        """Register a fresh run and subscribe to its events."""
+        now = time.time()
+        self._write(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, 'running', ?, ?)",
+            (ctx.run_id, ctx.definition.fingerprint(), json.dumps(dict(ctx.inputs)), now, now),
+        )
+        ctx.listeners += (self.on_event,)
+
+    def on_event(self, ctx, event, data):
+        if event == "task_completed":
+            output = data["output"]
+            delta = [{"agent": m.agent, "task": m.task, "text": m.text} for m in data.get("memory_delta", ())]
+            self._write(
+                "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ctx.run_id, output.task, output.name, output.agent, output.raw, json.dumps(delta), time.time()),
+            )
+        elif event == "agent_step" and not data.get("depth"):
+            step = data["step"]
+            self._write(
+                "INSERT INTO scratchpad VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (ctx.run_id, data["task"], data["agent"], step.text, step.action,
+                 step.action_input, step.observation, time.time()),
+            )
+        elif event in ("run_completed", "run_failed"):
+            status = "completed" if event == "run_completed" else "failed"
+            self._write("UPDATE runs SET status=?, updated_at=? WHERE run_id=?",
+                        (status, time.time(), ctx.run_id))
+
+    # ── resuming ──────────────────────────────────────────────────
+    def restore(self, definition, run_id, inputs=None, **run_options):
+        """A RunContext for `run_id` with its finished tasks already filled in."""
+        conn = self._conn()
+        row = conn.execute("SELECT fingerprint, inputs FROM runs WHERE run_id=?", (run_id,)).fetchone()
+        if row is None:
+            raise CheckpointError(f"no checkpoint for run {run_id!r} in {self.path}")
+        fingerprint, saved_inputs = row
+        if fingerprint != definition.fingerprint():
+            raise CheckpointError(f"run {run_id!r} was recorded for a different crew")
+
+        ctx = definition.new_run(inputs if inputs is not None else json.loads(saved_inputs),
+                                 run_id=run_id, **run_options)
+        rows = conn.execute(
+            "SELECT task, name, agent, output, memory_delta FROM tasks WHERE run_id=? ORDER BY task",
+            (run_id,),
+        )
+        for task, name, agent, output, delta in rows:
+            ctx.outputs[task] = TaskOutput(task, name, agent, output)
+            if ctx.memory is not None:
+                for item in json.loads(delta):
+                    ctx.memory.save(item["agent"], item["task"], item["text"])
+
+        for task in range(len(definition.tasks)):
+            if task not in ctx.outputs:
+                steps = [AgentStep(s["text"], s["action"], s["action_input"], s["observation"])
+                         for s in self.scratchpad(run_id, task)]
+                if steps:
+                    ctx.resumed_steps[task] = steps
+
+        self._write("UPDATE runs SET status='running', updated_at=? WHERE run_id=?", (time.time(), run_id))
+        ctx.listeners += (self.on_event,)
+        return ctx
+
+    # ── inspection ────────────────────────────────────────────────
+    def runs(self, status=None):
+        sql = "SELECT run_id, status, inputs, updated_at FROM runs"
+        params = ()
+        if status:
+            sql += " WHERE status=?"
+            params = (status,)
+        return [
+            {"run_id": r[0], "status": r[1], "inputs": json.loads(r[2]), "updated_at": r[3]}
+            for r in self._conn().execute(sql + " ORDER BY updated_at DESC", params)
+        ]
+
+    def outputs(self, run_id):
+        """{task index: TaskOutput} of a run, e.g. as a kickoff baseline=."""
+        return {
+            r[0]: TaskOutput(*r) for r in self._conn().execute(
+                "SELECT task, name, agent, output FROM tasks WHERE run_id=? ORDER BY task", (run_id,))
+        }
+
+    def completed_tasks(self, run_id):
+        return [r[0] for r in self._conn().execute(
+            "SELECT task FROM tasks WHERE run_id=? ORDER BY task", (run_id,))]
+
+    def scratchpad(self, run_id, task):
+        return [
+            {"agent": r[0], "text": r[1], "action": r[2], "action_input": r[3], "observation": r[4]}
+            for r in self._conn().execute(
+                "SELECT agent, text, action, action_input, observation FROM scratchpad "
+                "WHERE run_id=? AND task=? ORDER BY rowid", (run_id, task))
+        ]
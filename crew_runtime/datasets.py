@@ -0,0 +1,712 @@
+"""
+============================================================
+  crew_runtime.datasets  |  Sharded analysis of local datasets
+============================================================
+
+CONCEPT:
+  example_3_data_analysis_pipeline() in sequential.py asks the
+  collector and the analyst to "describe" and "analyze" data that
+  only exists in the prompt. A real dataset is a CSV or Parquet
+  file of gigabytes; no context window holds it, and the LLM should
+  not be doing arithmetic anyway.
+
+  Dataset(path) never loads the file. Profiling it is a map-reduce:
+
+    shard     the file is cut into byte ranges on row boundaries
+              (Parquet: row groups), one per worker process. A
+              quoted field may span lines, so each cut moves to
+              the first line where whole rows parse again; with
+              no such line within RESYNC_BYTES, the two shards
+              around it become one
+    map       each worker streams its shard in chunks of chunk_rows
+              (pandas' C parser when installed, else the csv module)
+              and folds every chunk into mergeable partials:
+                count / nulls, mean and variance (Chan's merge),
+                min / max, a bounded reservoir sample (quantiles),
+                top values (bounded counters), pairwise sums
+                (correlations)
+              with NumPy / pandas doing the arithmetic when installed
+    reduce    partials merge exactly, in any order
+
+  Memory stays at about chunk_rows × workers rows whatever the file
+  size. Only the profile's text (a few KB) reaches the LLM.
+
+  A task given a dataset (from_crew(datasets=[(task, dataset)]))
+  gets the profile in its context, and its agent gets two tools,
+  each one more streaming pass over the shards:
+
+    "Describe dataset"     the profile: columns, stats, top values,
+                           strongest correlations
+    "Aggregate dataset"    {"group_by": ..., "value": ...} → count,
+                           sum, mean, min, max per group
+
+USAGE:
+  ev = Dataset("data/ev_sales.csv", chunk_rows=200_000)
+  print(ev.profile().to_text())
+  template = CrewDefinition.from_crew(crew, datasets=[(analyze_task, ev)])
+
+  python -m crew_runtime.datasets data.csv [--workers 8] [--group-by country --value units]
+
+============================================================
+"""
+
+import csv
+import io
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from .tools import ToolSpec
+
+SAMPLE = 4096            # reservoir size per numeric column (quantiles are exact below it)
+TOP = 64                 # counters kept per column for top values
+MAX_CORRELATED = 12      # numeric columns considered for correlations
+MAX_GROUPS = 1000        # groups kept by aggregate(); the rest are counted as "(other)"
+NUMERIC_SHARE = 0.9      # a chunk's column is numeric when this share of its values parse
+RESYNC_BYTES = 1 << 20   # how far past a shard cut to look for a row start
+PROBE_BYTES = 1 << 16    # read past a candidate row start to check it
+PROBE_ROWS = 8           # rows that must parse, with the header's field count, from a row start
+
+
+def _module(name):
+    try:
+        return __import__(name)
+    except ImportError:
+        return None
+
+
+def _float(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def _is_frame(chunk):
+    return hasattr(chunk, "iloc")
+
+
+# ── Mergeable partials ───────────────────────────────────────────────
+class ColumnStats:
+    """Partial statistics of one column; merge() combines two shards' partials."""
+
+    __slots__ = ("name", "count", "nulls", "numbers", "mean", "m2", "min", "max", "sample", "top")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0           # non-null values
+        self.nulls = 0
+        self.numbers = 0         # values that parsed as numbers
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sample = []
+        self.top = {}            # value → count (bounded, approximate past TOP values)
+
+    def add_numbers(self, n, mean, m2, low, high, sample):
+        if not n:
+            return
+        total = self.numbers + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.numbers * n / total
+        self.sample = _merge_samples(self.sample, self.numbers, sample, n)
+        self.numbers = total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def add_top(self, counts):
+        top = self.top
+        for value, n in counts.items():
+            top[value] = top.get(value, 0) + n
+        if len(top) > TOP * 4:
+            keep = sorted(top.items(), key=lambda item: -item[1])[:TOP * 2]
+            self.top = dict(keep)
+
+    def merge(self, other):
+        self.count += other.count
+        self.nulls += other.nulls
+        self.add_numbers(other.numbers, other.mean, other.m2, other.min, other.max, other.sample)
+        self.add_top(other.top)
+        return self
+
+    @property
+    def numeric(self):
+        return self.count and self.numbers >= self.count * NUMERIC_SHARE
+
+    def quantiles(self, points=(0.25, 0.5, 0.75)):
+        ordered = sorted(self.sample)
+        if not ordered:
+            return [None] * len(points)
+        return [ordered[min(len(ordered) - 1, int(p * len(ordered)))] for p in points]
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.numbers - 1)) if self.numbers > 1 else 0.0
+
+
+def _merge_samples(a, na, b, nb):
+    """A reservoir of ≤ SAMPLE values standing for na + nb values."""
+    if len(a) + len(b) <= SAMPLE:
+        return a + b
+    rng = random.Random(na * 7919 + nb)
+    a, b = a[:], b[:]
+    rng.shuffle(a)
+    rng.shuffle(b)
+    merged = []
+    while len(merged) < SAMPLE and (a or b):
+        if a and (not b or rng.random() < na / (na + nb)):
+            merged.append(a.pop())
+        else:
+            merged.append(b.pop())
+    return merged
+
+
+class Partial:
+    """Everything one shard contributes to a profile."""
+
+    def __init__(self, columns):
+        self.columns = {name: ColumnStats(name) for name in columns}
+        self.rows = 0
+        self.pairs = {}          # (a, b) → [n, Σx, Σy, Σxx, Σyy, Σxy]
+
+    def merge(self, other):
+        self.rows += other.rows
+        for name, stats in other.columns.items():
+            self.columns.setdefault(name, ColumnStats(name)).merge(stats)
+        for pair, sums in other.pairs.items():
+            mine = self.pairs.setdefault(pair, [0.0] * 6)
+            for i, value in enumerate(sums):
+                mine[i] += value
+        return self
+
+
+# ── Folding one chunk ────────────────────────────────────────────────
+def _fold_frame(partial, frame, pd, np):
+    """A pandas chunk: every statistic is a vectorized column operation."""
+    partial.rows += len(frame)
+    numeric = {}
+    for name in frame.columns:
+        stats = partial.columns.setdefault(str(name), ColumnStats(str(name)))
+        series = frame[name]
+        present = series.dropna()
+        stats.nulls += len(series) - len(present)
+        stats.count += len(present)
+        stats.add_top({str(k): int(v) for k, v in present.value_counts().head(TOP).items()})
+        values = pd.to_numeric(present, errors="coerce").dropna().to_numpy(dtype="float64")
+        if not len(values):
+            continue
+        mean = float(values.mean())
+        sample = values if len(values) <= SAMPLE else np.random.default_rng(len(values)).choice(
+            values, SAMPLE, replace=False)
+        stats.add_numbers(len(values), mean, float(((values - mean) ** 2).sum()),
+                          float(values.min()), float(values.max()), sample.tolist())
+        if len(values) >= len(present) * NUMERIC_SHARE and len(numeric) < MAX_CORRELATED:
+            numeric[str(name)] = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64")
+    names = list(numeric)
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            x, y = numeric[a], numeric[b]
+            both = ~(np.isnan(x) | np.isnan(y))
+            x, y = x[both], y[both]
+            _add_pair(partial, a, b, [len(x), x.sum(), y.sum(), (x * x).sum(), (y * y).sum(), (x * y).sum()])
+
+
+def _fold_columns(partial, columns):
+    """A chunk from the csv module: {column: [strings]}, folded in pure Python."""
+    numeric = {}
+    for name, values in columns.items():
+        stats = partial.columns.setdefault(name, ColumnStats(name))
+        present = [v for v in values if v not in ("", None)]
+        stats.nulls += len(values) - len(present)
+        stats.count += len(present)
+        counts = {}
+        for value in present:
+            counts[value] = counts.get(value, 0) + 1
+        if len(counts) > TOP:
+            counts = dict(sorted(counts.items(), key=lambda item: -item[1])[:TOP])
+        stats.add_top(counts)
+        parsed = [_float(v) for v in values]
+        numbers = [v for v in parsed if v is not None]
+        if not numbers:
+            continue
+        mean = sum(numbers) / len(numbers)
+        sample = numbers if len(numbers) <= SAMPLE else random.Random(len(numbers)).sample(numbers, SAMPLE)
+        stats.add_numbers(len(numbers), mean, sum((v - mean) ** 2 for v in numbers),
+                          min(numbers), max(numbers), sample)
+        if len(numbers) >= len(present) * NUMERIC_SHARE and len(numeric) < MAX_CORRELATED:
+            numeric[name] = parsed
+    names = list(numeric)
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            sums = [0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            for x, y in zip(numeric[a], numeric[b]):
+                if x is not None and y is not None:
+                    sums[0] += 1
+                    sums[1] += x
+                    sums[2] += y
+                    sums[3] += x * x
+                    sums[4] += y * y
+                    sums[5] += x * y
+            _add_pair(partial, a, b, sums)
+    partial.rows += len(next(iter(columns.values()), ()))
+
+
+def _add_pair(partial, a, b, sums):
+    mine = partial.pairs.setdefault((a, b), [0.0] * 6)
+    for i, value in enumerate(sums):
+        mine[i] += float(value)
+
+
+def _fold_groups(groups, chunk, group_by, value):
+    """Add one chunk to {group: [count, sum, min, max]}; unknown groups past MAX_GROUPS → "(other)"."""
+    if _is_frame(chunk):
+        import pandas as pd
+
+        numbers = pd.to_numeric(chunk[value], errors="coerce")
+        frame = pd.DataFrame({"g": chunk[group_by].astype(str), "v": numbers}).dropna()
+        rows = frame.groupby("g")["v"].agg(["count", "sum", "min", "max"]).itertuples()
+    else:
+        rows = {}
+        for key, raw in zip(chunk[group_by], chunk[value]):
+            number = _float(raw)
+            if number is None:
+                continue
+            entry = rows.get(key)
+            if entry is None:
+                rows[key] = [1, number, number, number]
+            else:
+                entry[0] += 1
+                entry[1] += number
+                entry[2] = min(entry[2], number)
+                entry[3] = max(entry[3], number)
+        rows = ((key, *entry) for key, entry in rows.items())
+    for key, count, total, low, high in rows:
+        key = str(key)
+        if key not in groups and len(groups) >= MAX_GROUPS:
+            key = "(other)"
+        entry = groups.get(key)
+        if entry is None:
+            groups[key] = [int(count), float(total), float(low), float(high)]
+        else:
+            entry[0] += int(count)
+            entry[1] += float(total)
+            entry[2] = min(entry[2], float(low))
+            entry[3] = max(entry[3], float(high))
+
+
+# ── Reading a shard ──────────────────────────────────────────────────
+class _Range(io.RawIOBase):
+    """Bytes [start, end) of a file; Dataset.shards() puts both on row starts."""
+
+    def __init__(self, path, start, end):
+        super().__init__()
+        self._file = open(path, "rb")
+        self._pos = start
+        self._end = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        want = min(len(buffer), self._end - self._pos)
+        if want <= 0:
+            return 0
+        self._file.seek(self._pos)
+        n = self._file.readinto(memoryview(buffer)[:want])
+        self._pos += n
+        return n
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _shard_chunks(spec, shard):
+    """Chunks (pandas frames or {column: [values]}) of one shard."""
+    kind = spec["kind"]
+    pd = _module("pandas")
+    if kind == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(spec["path"]).iter_batches(
+                batch_size=spec["chunk_rows"], row_groups=list(range(*shard)), columns=spec["columns"]):
+            yield batch.to_pandas() if pd is not None else {
+                name: [None if v is None else str(v) for v in values]
+                for name, values in batch.to_pydict().items()}
+        return
+    raw = _Range(spec["path"], shard[0], shard[1])
+    header = spec["header"]
+    try:
+        if pd is not None:
+            yield from pd.read_csv(io.BufferedReader(raw, 1 << 20), names=header, header=None,
+                                   chunksize=spec["chunk_rows"], delimiter=spec["delimiter"],
+                                   encoding=spec["encoding"], usecols=spec["columns"])
+            return
+        text = io.TextIOWrapper(io.BufferedReader(raw, 1 << 20), encoding=spec["encoding"], newline="")
+        wanted = [header.index(c) for c in spec["columns"]] if spec["columns"] else range(len(header))
+        rows = []
+        for row in csv.reader(text, delimiter=spec["delimiter"]):
+            rows.append(row)
+            if len(rows) >= spec["chunk_rows"]:
+                yield _columns(header, wanted, rows)
+                rows = []
+        if rows:
+            yield _columns(header, wanted, rows)
+    finally:
+        raw.close()
+
+
+def _row_start(f, offset, spec):
+    """File offset of the first row start after `offset`, or None.
+
+    A line inside a quoted multi-line field is not a row start. Read
+    from there, that field's closing quote shows up in the middle of
+    an unquoted field (or the rows have the wrong number of fields);
+    the true rows resume after it. Delimiter and quote are ASCII, so
+    this works on the raw bytes of any ASCII-compatible encoding.
+    """
+    base = offset - 1
+    f.seek(base)
+    data = f.read(RESYNC_BYTES + PROBE_BYTES)
+    at_eof = len(data) < RESYNC_BYTES + PROBE_BYTES
+    pos = data.find(b"\n") + 1  # a line belongs to the shard its first byte is in
+    while 0 < pos <= RESYNC_BYTES:
+        if pos == len(data):
+            return base + pos if at_eof else None
+        end = min(len(data), pos + PROBE_BYTES)
+        ok, bad = _rows_from(data, pos, end, at_eof and end == len(data), spec)
+        if ok:
+            return base + pos
+        pos = data.find(b"\n", pos if bad is None else bad) + 1
+    return None
+
+
+def _rows_from(data, pos, end, final, spec):
+    """(True, None) when PROBE_ROWS rows with the header's field count
+    parse from `pos`; else (False, index of the byte that proved it wrong)."""
+    delimiter = spec["delimiter"].encode("ascii")
+    fields = len(spec["header"])
+    special = re.compile(b'["\n' + re.escape(delimiter) + b"]")
+    in_quotes, field_start, row_start, count, rows = False, pos, pos, 1, 0
+    while True:
+        found = special.search(data, pos, end)
+        if found is None:
+            # the probe ran out: fine at the end of the file, or after some whole rows
+            return (final and not in_quotes) or rows > 0, None
+        i = found.start()
+        char = data[i:i + 1]
+        pos = i + 1
+        if in_quotes:
+            if char == b'"':
+                if data[pos:pos + 1] == b'"':  # an escaped quote
+                    pos += 1
+                elif data[pos:pos + 1] not in (delimiter, b"\r", b"\n", b""):
+                    return False, i
+                else:
+                    in_quotes = False
+        elif char == b'"':
+            if i != field_start:  # a closing quote: we started inside a quoted field
+                return False, i
+            in_quotes = True
+        elif char == delimiter:
+            count += 1
+            field_start = pos
+        else:
+            if count != fields and data[row_start:i].strip():
+                return False, i
+            rows += 1
+            if rows >= PROBE_ROWS:
+                return True, None
+            field_start = row_start = pos
+            count = 1
+
+
+def _columns(header, wanted, rows):
+    return {header[i]: [row[i] if i < len(row) else "" for row in rows] for i in wanted}
+
+
+def _profile_shard(spec, shard):
+    pd, np = _module("pandas"), _module("numpy")
+    partial = Partial(spec["columns"] or spec["header"])
+    for chunk in _shard_chunks(spec, shard):
+        if _is_frame(chunk):
+            _fold_frame(partial, chunk, pd, np)
+        else:
+            _fold_columns(partial, chunk)
+    return partial
+
+
+def _aggregate_shard(spec, shard, group_by, value):
+    groups = {}
+    for chunk in _shard_chunks(dict(spec, columns=[group_by, value]), shard):
+        _fold_groups(groups, chunk, group_by, value)
+    return groups
+
+
+# ── Dataset ──────────────────────────────────────────────────────────
+class DatasetError(ValueError):
+    """The file cannot be profiled (unknown format, unknown column, ...)."""
+
+
+class Dataset:
+    """A local CSV / Parquet file, analysed in shards; see the module docstring."""
+
+    def __init__(self, path, name=None, chunk_rows=100_000, workers=None, columns=None,
+                 delimiter=",", encoding="utf-8", processes=True):
+        self.path = path
+        self.name = name or os.path.basename(path)
+        self.kind = "parquet" if path.lower().endswith((".parquet", ".pq")) else "csv"
+        self.chunk_rows = chunk_rows
+        self.workers = workers or os.cpu_count() or 2
+        self.columns = list(columns) if columns else None
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.processes = processes  # False → threads (NumPy / pandas release the GIL)
+        self._results = {}          # (file version, what) → result
+        self._tools = None
+        self._lock = threading.Lock()
+
+    # ── layout ────────────────────────────────────────────────────
+    def _spec(self):
+        spec = {"kind": self.kind, "path": self.path, "chunk_rows": self.chunk_rows,
+                "columns": self.columns, "delimiter": self.delimiter, "encoding": self.encoding}
+        if self.kind == "csv":
+            with open(self.path, "rb") as f:
+                first = f.readline()
+                while first.count(b'"') % 2:  # a quoted column name spanning lines
+                    line = f.readline()
+                    if not line:
+                        break
+                    first += line
+                spec["data_start"] = f.tell()
+            text = io.StringIO(first.decode(self.encoding).lstrip("﻿"), newline="")
+            spec["header"] = next(csv.reader(text, delimiter=self.delimiter))
+        else:
+            import pyarrow.parquet as pq
+
+            spec["header"] = list(pq.ParquetFile(self.path).schema_arrow.names)
+        unknown = [c for c in self.columns or () if c not in spec["header"]]
+        if unknown:
+            raise DatasetError(f"{self.name} has no column(s) {', '.join(unknown)}")
+        return spec
+
+    def shards(self, spec):
+        if self.kind == "parquet":
+            import pyarrow.parquet as pq
+
+            groups = pq.ParquetFile(self.path).num_row_groups
+            step = max(1, math.ceil(groups / self.workers))
+            return [(i, min(groups, i + step)) for i in range(0, groups, step)]
+        start, size = spec["data_start"], os.path.getsize(self.path)
+        step = max(1 << 20, math.ceil((size - start) / self.workers))
+        cuts = [start]
+        with open(self.path, "rb") as f:
+            for offset in range(start + step, size, step):
+                cut = _row_start(f, offset, spec)
+                if cut is not None and cuts[-1] < cut < size:
+                    cuts.append(cut)
+        cuts.append(size)
+        return list(zip(cuts, cuts[1:]))
+
+    def _version(self):
+        info = os.stat(self.path)
+        return (info.st_size, info.st_mtime_ns)
+
+    # ── map-reduce ────────────────────────────────────────────────
+    def _map_reduce(self, func, args, reduce, initial):
+        spec = self._spec()
+        shards = self.shards(spec)
+        pool_type = ProcessPoolExecutor if self.processes and len(shards) > 1 else ThreadPoolExecutor
+        result = initial
+        with pool_type(max_workers=max(1, min(self.workers, len(shards)))) as pool:
+            pending = {pool.submit(func, spec, shard, *args) for shard in shards}
+            while pending:  # reduce as shards finish; nothing waits on the slowest
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = reduce(result, future.result())
+        return result, len(shards)
+
+    def _cached(self, key, compute):
+        key = (self._version(), key)
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+        result = compute()
+        with self._lock:
+            self._results = {k: v for k, v in self._results.items() if k[0] == key[0]}
+            self._results[key] = result
+        return result
+
+    def profile(self):
+        """A DatasetProfile of the whole file (cached until the file changes)."""
+        def compute():
+            start = time.perf_counter()
+            partial, shards = self._map_reduce(_profile_shard, (), lambda a, b: a.merge(b),
+                                               Partial(self.columns or ()))
+            return DatasetProfile(self, partial, shards, time.perf_counter() - start)
+
+        return self._cached("profile", compute)
+
+    def aggregate(self, group_by, value):
+        """{group: {"count", "sum", "mean", "min", "max"}}, largest groups first."""
+        header = self._spec()["header"]
+        for column in (group_by, value):
+            if column not in header:
+                raise DatasetError(f"{self.name} has no column {column!r}; columns: {', '.join(header)}")
+
+        def merge(groups, other):
+            for key, (count, total, low, high) in other.items():
+                if key not in groups and len(groups) >= MAX_GROUPS:
+                    key = "(other)"
+                entry = groups.get(key)
+                if entry is None:
+                    groups[key] = [count, total, low, high]
+                else:
+                    entry[0] += count
+                    entry[1] += total
+                    entry[2] = min(entry[2], low)
+                    entry[3] = max(entry[3], high)
+            return groups
+
+        def compute():
+            groups, _ = self._map_reduce(_aggregate_shard, (group_by, value), merge, {})
+            ordered = sorted(groups.items(), key=lambda item: -item[1][0])
+            return {key: {"count": c, "sum": s, "mean": s / c if c else None, "min": lo, "max": hi}
+                    for key, (c, s, lo, hi) in ordered}
+
+        return self._cached(("aggregate", group_by, value), compute)
+
+    # ── as tools ──────────────────────────────────────────────────
+    def tools(self):
+        """ToolSpecs an agent can call on this dataset."""
+        if self._tools is None:
+            def describe(**_):
+                return self.profile().to_text()
+
+            def aggregate(group_by="", value="", limit=25, **_):
+                try:
+                    groups = self.aggregate(group_by, value)
+                except DatasetError as exc:
+                    return str(exc)
+                return format_groups(groups, group_by, value, int(limit))
+
+            self._tools = (
+                ToolSpec("Describe dataset",
+                         f"Profile of the dataset {self.name}: columns, statistics, top values "
+                         "and correlations, computed over every row. Input is an empty JSON object.",
+                         describe),
+                ToolSpec("Aggregate dataset",
+                         f"Count, sum, mean, min and max of a numeric column per group of {self.name}, "
+                         "computed over every row. Input is a JSON object with keys group_by, value "
+                         "and optionally limit (groups shown).",
+                         aggregate,
+                         json.dumps({"group_by": {"type": "string"}, "value": {"type": "string"},
+                                     "limit": {"type": "integer"}})),
+            )
+        return self._tools
+
+
+def _number(value):
+    if value is None:
+        return "-"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return f"{int(value):,}"
+    return f"{value:.4g}" if abs(value) < 1000 else f"{value:,.0f}"
+
+
+def format_groups(groups, group_by, value, limit=25):
+    lines = [f"{value} by {group_by} ({len(groups)} groups):"]
+    for key, g in list(groups.items())[:limit]:
+        lines.append(f"  {key}: count {_number(g['count'])}, sum {_number(g['sum'])}, "
+                     f"mean {_number(g['mean'])}, min {_number(g['min'])}, max {_number(g['max'])}")
+    if len(groups) > limit:
+        lines.append(f"  ... {len(groups) - limit} more groups")
+    return "\n".join(lines)
+
+
+class DatasetProfile:
+    """Reduced statistics of a dataset and their compact text for the LLM."""
+
+    def __init__(self, dataset, partial, shards, seconds):
+        self.dataset = dataset
+        self.rows = partial.rows
+        self.columns = partial.columns
+        self.pairs = partial.pairs
+        self.shards = shards
+        self.seconds = seconds
+
+    def correlations(self, limit=5):
+        found = []
+        for (a, b), (n, sx, sy, sxx, syy, sxy) in self.pairs.items():
+            spread = (n * sxx - sx * sx) * (n * syy - sy * sy)
+            if n > 2 and spread > 0:
+                found.append((a, b, (n * sxy - sx * sy) / math.sqrt(spread)))
+        found.sort(key=lambda item: -abs(item[2]))
+        return found[:limit]
+
+    def to_text(self, max_columns=40):
+        dataset = self.dataset
+        size = os.path.getsize(dataset.path)
+        lines = [f"Dataset {dataset.name} ({dataset.kind.upper()}, {size / 1e6:,.1f} MB): "
+                 f"{self.rows:,} rows, {len(self.columns)} columns "
+                 f"(profiled in {self.shards} shards, {self.seconds:.1f}s)"]
+        numeric = [c for c in self.columns.values() if c.numeric]
+        text = [c for c in self.columns.values() if not c.numeric]
+        if numeric:
+            lines.append("Numeric columns: non-null / null, mean ± std, min, p25, median, p75, max")
+            for c in numeric[:max_columns]:
+                p25, p50, p75 = c.quantiles()
+                lines.append(f"  {c.name}: {c.count:,} / {c.nulls:,}, {_number(c.mean)} ± {_number(c.std)}, "
+                             f"{_number(c.min)}, {_number(p25)}, {_number(p50)}, {_number(p75)}, "
+                             f"{_number(c.max)}")
+        if text:
+            lines.append("Text columns: non-null / null, top values (share of rows)")
+            for c in text[:max_columns]:
+                top = sorted(c.top.items(), key=lambda item: -item[1])[:5]
+                shares = ", ".join(f"{value[:30]!r} {n / max(1, self.rows):.1%}" for value, n in top)
+                more = " ..." if len(c.top) > 5 else ""
+                lines.append(f"  {c.name}: {c.count:,} / {c.nulls:,}, {shares}{more}")
+        hidden = len(self.columns) - len(numeric[:max_columns]) - len(text[:max_columns])
+        if hidden > 0:
+            lines.append(f"  ({hidden} more columns not shown)")
+        pairs = self.correlations()
+        if pairs:
+            lines.append("Strongest correlations: " + ", ".join(f"{a} ~ {b} r={r:+.2f}" for a, b, r in pairs))
+        return "\n".join(lines)
+
+
+# ── Command line ─────────────────────────────────────────────────────
+def main(argv=None):
+    """python -m crew_runtime.datasets <file> [--workers N] [--chunk-rows N] [--group-by C --value C]"""
+    import resource
+
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args:
+        print(main.__doc__)
+        return 2
+
+    def option(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+
+    dataset = Dataset(args[0], workers=int(option("--workers", 0)) or None,
+                      chunk_rows=int(option("--chunk-rows", 100_000)))
+    print(dataset.profile().to_text())
+    if "--group-by" in args:
+        print(format_groups(dataset.aggregate(option("--group-by"), option("--value")),
+                            option("--group-by"), option("--value")))
+    peak = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    print(f"peak memory of one process: {peak / 1024:,.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
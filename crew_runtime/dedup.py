@@ -0,0 +1,166 @@
+"""
+============================================================
+  crew_runtime.dedup  |  Only novel sources reach the prompt
+============================================================
+
+CONCEPT:
+  research_task in Lesson 2 searches several queries with
+  n_results=10. The same article comes back for "AI trends" and
+  "latest AI developments", often under a different URL (utm_
+  tags, m. / www. hosts, AMP pages) or as a syndicated copy with a
+  slightly different snippet, and every copy is pasted into the
+  researcher's context and re-sent on each later iteration.
+
+  With a DedupPolicy on an agent, every tool observation is split
+  into results ("Title / Link / Snippet / ---" blocks, otherwise
+  paragraphs) and each result is checked against the run's
+  SeenSources:
+
+    URL        canonical form: lower-case host without www. / m.,
+               no fragment, no tracking parameters (utm_*, gclid,
+               fbclid, ...), sorted query, no trailing slash
+    content    MinHash signature of the words and word pairs; an
+               estimated Jaccard similarity of `threshold` or more
+               with an earlier result → a near-duplicate. Lookups go
+               through LSH bands of the signature, so a check is a
+               few dict probes, not a scan of everything seen.
+               (SimHash was tried first; on 20–40 word snippets one
+               changed phrase moves it as far as a reordering does.)
+
+  Results seen before (in any agent's tool call of the same run)
+  are dropped and replaced by a one-line note; the observation and
+  every later prompt that carries it shrink accordingly. Each
+  filtered call emits a `dedup` event (kept, dropped, chars saved).
+
+USAGE:
+  template = CrewDefinition.from_crew(crew, dedup=DedupPolicy(tools=("Search the internet",)))
+
+============================================================
+"""
+
+import hashlib
+import random
+import re
+import threading
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_URL = re.compile(r"https?://[^\s<>\"')\]]+")
+_LINK = re.compile(r"^\s*Link:\s*(\S+)", re.MULTILINE | re.IGNORECASE)
+_SEPARATOR = re.compile(r"^\s*-{3,}\s*$", re.MULTILINE)
+_TRACKING = frozenset(("gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src",
+                       "igshid", "spm", "_hsenc", "_hsmi", "yclid"))
+
+
+@dataclass(frozen=True)
+class DedupPolicy:
+    tools: tuple = ()         # tool names to filter; empty → every tool
+    threshold: float = 0.6    # estimated Jaccard similarity of a near-duplicate
+    min_chars: int = 40       # shorter results are never treated as duplicates
+
+
+def canonical_url(url):
+    parts = urlsplit(url.strip().rstrip(".,;"))
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "m.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = re.sub(r"/(amp|index\.html?)/?$", "/", parts.path or "/").rstrip("/") or "/"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+# MinHash: NUM_PERM hash functions (a·x + b) mod a Mersenne prime,
+# split into BANDS bands of ROWS rows for the LSH index
+NUM_PERM, BANDS, ROWS = 64, 16, 4
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingles(text):
+    words = [w.lower() for w in _WORD.findall(text)]
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash(text):
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+              for s in shingles(text)] or [0]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class SeenSources:
+    """URLs and content signatures of one run's tool results."""
+
+    def __init__(self, threshold=0.6):
+        self.threshold = threshold
+        self.urls = set()
+        self.index = [dict() for _ in range(BANDS)]   # band → rows → signatures
+        self._lock = threading.Lock()
+
+    def check(self, url, text, min_chars=40):
+        """None for a novel result (now remembered), else "url" or "content"."""
+        canonical = canonical_url(url) if url else None
+        signature = minhash(text) if len(text) >= min_chars else None
+        with self._lock:
+            if canonical is not None and canonical in self.urls:
+                return "url"
+            if signature is not None:
+                keys = [signature[i * ROWS:(i + 1) * ROWS] for i in range(BANDS)]
+                for band, key in zip(self.index, keys):
+                    for other in band.get(key, ()):
+                        if similarity(signature, other) >= self.threshold:
+                            return "content"
+                for band, key in zip(self.index, keys):
+                    band.setdefault(key, []).append(signature)
+            if canonical is not None:
+                self.urls.add(canonical)
+        return None
+
+
+def split_results(text):
+    """Search-result blocks when the output has them, otherwise paragraphs."""
+    if _SEPARATOR.search(text) and _LINK.search(text):
+        return [block.strip() for block in _SEPARATOR.split(text) if block.strip()], "\n---\n"
+    return [block.strip() for block in re.split(r"\n\s*\n", text) if block.strip()], "\n\n"
+
+
+def _url_and_content(block):
+    link = _LINK.search(block)
+    url = link.group(1) if link else None
+    if url is None:
+        found = _URL.search(block)
+        url = found.group(0) if found and len(found.group(0)) > len(block) / 2 else None
+    content = _LINK.sub("", block) if link else block
+    return url, content
+
+
+def filter_observation(seen, text, policy):
+    """(text with already-seen results removed, kept, dropped)."""
+    blocks, joiner = split_results(text or "")
+    if not blocks:
+        return text, 0, 0
+    kept = []
+    dropped = 0
+    for block in blocks:
+        url, content = _url_and_content(block)
+        if seen.check(url, content, policy.min_chars) is None:
+            kept.append(block)
+        else:
+            dropped += 1
+    if not dropped:
+        return text, len(kept), 0
+    note = f"[{dropped} result(s) omitted: same source or near-duplicate of one already seen in this run]"
+    body = joiner.join(kept)
+    if kept and joiner == "\n---\n":
+        body += "\n---"
+    return f"{body}\n{note}" if kept else note, len(kept), dropped
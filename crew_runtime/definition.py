@@ -0,0 +1,419 @@
+"""
+============================================================
+  crew_runtime.definition  |  Reusable crew templates
+============================================================
+
+CONCEPT:
+  Lesson 1 and Lesson 2 build ONE module-level `crew` object.
+  crew.kickoff() writes the interpolated strings and the task
+  outputs back onto that object, so two kickoffs for different
+  topics cannot run at the same time without deep-copying every
+  agent, task and LLM client first.
+
+  Here the crew is split in two:
+
+    CrewDefinition  (immutable, shared)
+      • agent + task specs, compiled prompt templates
+      • LLM clients and RPM limiters (one per process)
+
+    RunContext      (one per kickoff, cheap)
+      • inputs + rendered prompt view
+      • task outputs, per-agent iteration counters
+      • memory handle, event listeners
+
+  Any number of threads can kick off the same definition.
+
+USAGE:
+  template = CrewDefinition.from_crew(crew)       # once
+  result = template.kickoff({"topic": "AI"})       # per run
+  results = template.kickoff_many([{...}, {...}])  # concurrent
+  result = await template.kickoff_async({...}, timeout=300)   # asyncio
+
+============================================================
+"""
+
+import asyncio
+import hashlib
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+
+from .budget import RunBudget
+from .delegation import DelegationTracker
+from .llm import as_llm
+from .memory import RunMemory
+from .prompts import SystemPrompts
+from .ratelimit import RPMLimiter
+from .runlog import default_logger
+from .strings import StringTable
+from .templates import PromptTemplates
+from .tools import ToolSpec
+
+SEQUENTIAL = "sequential"
+HIERARCHICAL = "hierarchical"
+
+# crewai's built-in manager persona for Process.hierarchical + manager_llm
+DEFAULT_MANAGER = {
+    "role": "Crew Manager",
+    "goal": "Manage the team to complete the task in the best way possible.",
+    "backstory": (
+        "You are a seasoned manager with a knack for getting the best out of your team. "
+        "You are also known for your ability to delegate work to the right people, and "
+        "to ask the right questions to get the best out of your team. Even though you "
+        "don't perform tasks by yourself, you have a lot of experience in the field, "
+        "which allows you to properly evaluate the work of your team members."
+    ),
+}
+
+
+# ── Specs (immutable) ────────────────────────────────────────────────
+@dataclass(frozen=True)
+class AgentSpec:
+    role: str
+    goal: str
+    backstory: str
+    llm: object = None
+    tools: tuple = ()
+    max_iter: int = 15
+    max_rpm: int = None
+    allow_delegation: bool = False
+    verbose: bool = False
+    scratchpad: object = None  # ScratchpadPolicy; None keeps the full transcript
+    dedup: object = None       # DedupPolicy; None passes tool output through as is
+
+    @classmethod
+    def from_agent(cls, agent, llm=None, tool_overrides=None):
+        tools = []
+        for tool in getattr(agent, "tools", None) or ():
+            spec = ToolSpec.from_tool(tool)
+            tools.append(ToolSpec.from_tool((tool_overrides or {}).get(spec.name, spec)))
+        return cls(
+            role=agent.role,
+            goal=agent.goal,
+            backstory=agent.backstory,
+            llm=llm,
+            tools=tuple(tools),
+            max_iter=getattr(agent, "max_iter", None) or 15,
+            max_rpm=getattr(agent, "max_rpm", None),
+            allow_delegation=bool(getattr(agent, "allow_delegation", False)),
+            verbose=bool(getattr(agent, "verbose", False)),
+        )
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    description: str
+    expected_output: str
+    agent: int = None      # index into CrewDefinition.agents (None → manager decides)
+    context: tuple = None  # task indexes; None → previous task's output
+    output_file: str = None
+    name: str = None
+    validators: tuple = ()  # crew_runtime.validators checks on the final answer
+    max_repairs: int = 2    # targeted repair prompts before giving up
+    incremental: bool = False  # re-edit only changed paragraphs of a baseline run
+    async_execution: bool = False  # runs alongside the neighbouring async tasks
+    dataset: object = None  # crew_runtime.datasets.Dataset the task analyses
+
+
+class TaskOutput:
+    __slots__ = ("task", "name", "agent", "raw")
+
+    def __init__(self, task, name, agent, raw):
+        self.task = task
+        self.name = name
+        self.agent = agent
+        self.raw = raw
+
+    def __str__(self):
+        return self.raw
+
+
+class CrewResult:
+    __slots__ = ("run_id", "raw", "tasks_output", "iterations", "usage")
+
+    def __init__(self, run_id, tasks_output, iterations, usage=None):
+        self.run_id = run_id
+        self.tasks_output = tasks_output
+        self.raw = tasks_output[-1].raw if tasks_output else ""
+        self.iterations = iterations
+        self.usage = usage        # token report of a kickoff(budget=...) run
+
+    def __str__(self):
+        return self.raw
+
+
+# ── Definition (shared) ──────────────────────────────────────────────
+class CrewDefinition:
+    """Immutable crew template; see the module docstring."""
+
+    def __init__(self, agents, tasks, process=SEQUENTIAL, manager=None,
+                 memory=False, max_rpm=None, verbose=False, output_log_file=None):
+        agents = tuple(agents)
+        if process == HIERARCHICAL and manager is None:
+            raise ValueError("Process.hierarchical needs a manager agent or manager_llm")
+        self.agents = agents
+        self.tasks = tuple(tasks)
+        self.process = process
+        self.manager = manager
+        self.memory = memory
+        self.verbose = verbose
+        self.output_log_file = output_log_file
+        # Manager is addressed as the agent index right after the workers
+        self.all_agents = agents + ((manager,) if manager is not None else ())
+        self.prompts = PromptTemplates(
+            [{"role": a.role, "goal": a.goal, "backstory": a.backstory} for a in self.all_agents],
+            [{"description": t.description, "expected_output": t.expected_output,
+              "name": t.name} for t in self.tasks],
+        )
+        self.system_prompts = SystemPrompts(self.all_agents)  # tools sections rendered here, once
+        self.crew_limiter = RPMLimiter(max_rpm)
+        self.agent_limiters = tuple(RPMLimiter(a.max_rpm) for a in self.all_agents)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("CrewDefinition is immutable; build a new one instead")
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_crew(cls, crew, llm=None, tools=None, validators=None, incremental=(),
+                  scratchpad=None, dedup=None, datasets=None):
+        """Build a definition from a crewai Crew (the crew is left untouched).
+
+        `llm` is the fallback for agents that did not set one. `tools` maps
+        a tool name to a replacement, e.g. a pooled SerperSearchTool for
+        SerperDevTool ("Search the internet"). `validators` is a list of
+        (crewai Task, [checks]) pairs; tasks are pydantic models, which
+        cannot be dict keys. Tasks listed in `incremental` re-edit only
+        the paragraphs that changed when kicked off with a baseline=.
+        `scratchpad` (a ScratchpadPolicy) bounds every agent's ReAct history.
+        `dedup` (a DedupPolicy) drops tool results already seen in the run.
+        `datasets` is a list of (crewai Task, Dataset) pairs: the task gets
+        the dataset's profile as context and its agent the dataset's tools.
+        """
+        validators = {id(task): tuple(checks) for task, checks in (validators or ())}
+        incremental = {id(task) for task in incremental}
+        datasets = {id(task): dataset for task, dataset in (datasets or ())}
+        clients = {}
+
+        def client_for(obj):
+            if obj is None:
+                obj = llm
+            key = id(obj)
+            if key not in clients:
+                clients[key] = as_llm(obj)
+            return clients[key]
+
+        agents = list(crew.agents)
+        for task in crew.tasks:
+            if getattr(task, "agent", None) is not None and all(task.agent is not a for a in agents):
+                agents.append(task.agent)
+        agent_index = {id(a): i for i, a in enumerate(agents)}
+        task_index = {id(t): i for i, t in enumerate(crew.tasks)}
+
+        tasks = []
+        for task in crew.tasks:
+            context = getattr(task, "context", None)
+            tasks.append(TaskSpec(
+                description=task.description,
+                expected_output=task.expected_output,
+                agent=agent_index.get(id(getattr(task, "agent", None))),
+                context=tuple(task_index[id(t)] for t in context) if isinstance(context, (list, tuple)) else None,
+                output_file=getattr(task, "output_file", None),
+                name=getattr(task, "name", None),
+                validators=validators.get(id(task), ()),
+                incremental=id(task) in incremental,
+                async_execution=bool(getattr(task, "async_execution", False)),
+                dataset=datasets.get(id(task)),
+            ))
+
+        process = str(getattr(crew.process, "value", crew.process) or SEQUENTIAL)
+        process = HIERARCHICAL if HIERARCHICAL in process else SEQUENTIAL
+        manager = None
+        if getattr(crew, "manager_agent", None) is not None:
+            manager = AgentSpec.from_agent(crew.manager_agent, client_for(crew.manager_agent.llm), tools)
+            manager = replace(manager, allow_delegation=True, scratchpad=scratchpad, dedup=dedup)
+        elif process == HIERARCHICAL:
+            manager = AgentSpec(llm=client_for(getattr(crew, "manager_llm", None)),
+                                allow_delegation=True, scratchpad=scratchpad, dedup=dedup,
+                                **DEFAULT_MANAGER)
+
+        return cls(
+            [replace(AgentSpec.from_agent(a, client_for(getattr(a, "llm", None)), tools),
+                     scratchpad=scratchpad, dedup=dedup)
+             for a in agents],
+            tasks,
+            process=process,
+            manager=manager,
+            memory=bool(getattr(crew, "memory", False)),
+            max_rpm=getattr(crew, "max_rpm", None),
+            verbose=bool(getattr(crew, "verbose", False)),
+            output_log_file=_log_file(getattr(crew, "output_log_file", None)),
+        )
+
+    def derive(self, **changes):
+        """A new definition with some constructor arguments replaced."""
+        args = {
+            "agents": self.agents, "tasks": self.tasks, "process": self.process,
+            "manager": self.manager, "memory": self.memory,
+            "max_rpm": self.crew_limiter.max_rpm, "verbose": self.verbose,
+            "output_log_file": self.output_log_file,
+        }
+        args.update(changes)
+        return type(self)(**args)
+
+    def with_llms(self, llm_for):
+        """A new definition where each agent's llm is llm_for(agent_spec)."""
+        return self.derive(
+            agents=[replace(a, llm=llm_for(a)) for a in self.agents],
+            manager=replace(self.manager, llm=llm_for(self.manager)) if self.manager else None,
+        )
+
+    # ── running ───────────────────────────────────────────────────
+    def new_run(self, inputs=None, run_id=None, listeners=(), writer=None, baseline=None,
+                logger=None, tool_pool=None, budget=None):
+        return RunContext(self, inputs, run_id=run_id, listeners=listeners, writer=writer,
+                          baseline=baseline, logger=logger, tool_pool=tool_pool, budget=budget)
+
+    def fingerprint(self):
+        """Stable hash of the crew's shape, used to match checkpoints to crews."""
+        parts = [self.process]
+        parts += [f"{a.role}|{a.goal}|{a.backstory}" for a in self.all_agents]
+        parts += [f"{t.description}|{t.expected_output}|{t.agent}|{t.context}" for t in self.tasks]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def kickoff(self, inputs=None, run_id=None, listeners=(), checkpoint=None, resume=None,
+                writer=None, baseline=None, logger=None, tool_pool=None, budget=None):
+        """Run the crew once.
+
+        With a CheckpointStore every finished task is saved as it completes;
+        kickoff(resume=run_id, checkpoint=store) skips the tasks that run
+        already finished and continues from there. With an OutputWriter,
+        output_file= results are written in the background, atomically,
+        under the writer's per-run folder. baseline= (a CrewResult, or a
+        run id in `checkpoint`) lets incremental tasks patch that run's
+        output instead of regenerating it. logger= (a runlog.Logger)
+        receives the verbose trace; the default prints it to stdout.
+        tool_pool= (a ToolPool) runs tool calls under timeouts and limits.
+        budget= (a TokenBudget) counts tokens against soft / hard budgets;
+        the report is on result.usage.
+        """
+        from .executor import run_crew
+
+        return run_crew(self._context(inputs, run_id, listeners, checkpoint, resume,
+                                      writer, baseline, logger, tool_pool, budget))
+
+    async def kickoff_async(self, inputs=None, run_id=None, listeners=(), checkpoint=None, resume=None,
+                            writer=None, baseline=None, logger=None, tool_pool=None, budget=None,
+                            timeout=None, task_timeout=None):
+        """kickoff() as a coroutine; many runs share one event loop.
+
+        LLM calls await the client's acomplete() (a worker thread for
+        clients without one), max_rpm waits are asyncio sleeps and tools
+        run through ToolPool.run_async or, for `async def` tools, on the
+        loop. timeout= bounds the whole run and task_timeout= each task;
+        either raises asyncio.TimeoutError. Cancelling the awaiting task
+        cancels the in-flight LLM / HTTP call and sets ctx.cancel.
+        """
+        from .executor import run_crew_async
+
+        ctx = self._context(inputs, run_id, listeners, checkpoint, resume,
+                            writer, baseline, logger, tool_pool, budget)
+        return await asyncio.wait_for(run_crew_async(ctx, task_timeout), timeout)
+
+    def _context(self, inputs, run_id, listeners, checkpoint, resume, writer, baseline, logger,
+                 tool_pool, budget):
+        if isinstance(baseline, CrewResult):
+            baseline = {output.task: output for output in baseline.tasks_output}
+        elif isinstance(baseline, str):
+            if checkpoint is None:
+                raise ValueError("baseline=<run id> needs the checkpoint= store the run was saved to")
+            baseline = checkpoint.outputs(baseline)
+
+        if resume is not None:
+            if checkpoint is None:
+                raise ValueError("resume= needs the checkpoint= store the run was saved to")
+            ctx = checkpoint.restore(self, resume, inputs, listeners=listeners, writer=writer,
+                                     baseline=baseline, logger=logger, tool_pool=tool_pool,
+                                     budget=budget)
+        else:
+            ctx = self.new_run(inputs, run_id=run_id, listeners=listeners, writer=writer,
+                               baseline=baseline, logger=logger, tool_pool=tool_pool,
+                               budget=budget)
+            if checkpoint is not None:
+                checkpoint.start(ctx)
+        return ctx
+
+    def kickoff_many(self, inputs_list, max_workers=8, **kwargs):
+        """Run one kickoff per inputs dict concurrently; results keep input order."""
+        inputs_list = list(inputs_list)
+        for inputs in inputs_list:
+            self.prompts.validate(inputs)   # fail before any run starts
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda inputs: self.kickoff(inputs, **kwargs), inputs_list))
+
+    async def kickoff_many_async(self, inputs_list, max_concurrency=None, **kwargs):
+        """kickoff_async() per inputs dict, gathered on this loop; results keep input order."""
+        inputs_list = list(inputs_list)
+        for inputs in inputs_list:
+            self.prompts.validate(inputs)
+        limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def one(inputs):
+            if limit is None:
+                return await self.kickoff_async(inputs, **kwargs)
+            async with limit:
+                return await self.kickoff_async(inputs, **kwargs)
+
+        return await asyncio.gather(*(one(inputs) for inputs in inputs_list))
+
+
+def _log_file(value):
+    # crewai accepts output_log_file=True for its default "logs.txt"
+    if value is True:
+        return "logs.txt"
+    return value or None
+
+
+def new_run_id():
+    return uuid.uuid4().hex[:12]
+
+
+# ── Per-run state ────────────────────────────────────────────────────
+class RunContext:
+    """Everything that changes during one kickoff."""
+
+    def __init__(self, definition, inputs=None, run_id=None, listeners=(), writer=None,
+                 baseline=None, logger=None, tool_pool=None, budget=None):
+        self.run_id = run_id or new_run_id()
+        self.definition = definition
+        self.inputs = MappingProxyType(dict(inputs or {}))
+        self.prompts = definition.prompts.render(self.inputs)
+        self.outputs = {}            # task index → TaskOutput
+        self.resumed_steps = {}      # task index → [AgentStep] checkpointed before a crash
+        self.iterations = Counter()  # agent index → LLM calls
+        self.memory = RunMemory() if definition.memory else None
+        self.listeners = tuple(listeners)
+        self.writer = writer         # OutputWriter, or None for direct writes
+        self.baseline = dict(baseline or {})  # task index → TaskOutput of an earlier run
+        self.gate = None             # LLM call gate of a JobScheduler job
+        self.strings = StringTable()  # equal observations / outputs share one object
+        self.delegations = DelegationTracker()
+        self.log = (logger or default_logger()).bind(self)  # queued verbose trace
+        self.tool_pool = tool_pool   # ToolPool, or None to run tools on this thread
+        self.cancel = threading.Event()  # set → in-flight pooled tool calls stop
+        self.sources = None          # SeenSources of DedupPolicy agents, made on first use
+        self.budget = RunBudget(budget, definition) if budget is not None else None  # token accounting
+
+    def emit(self, event, **data):
+        for listener in self.listeners:
+            listener(self, event, data)
+
+    def result(self):
+        ordered = [self.outputs[i] for i in sorted(self.outputs)]
+        roles = self.prompts.agents
+        return CrewResult(self.run_id, ordered, {roles[i]["role"]: n for i, n in self.iterations.items()},
+                          self.budget.report() if self.budget is not None else None)
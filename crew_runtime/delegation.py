@@ -0,0 +1,74 @@
+"""
+crew_runtime.delegation — catch repeated and circular delegations.
+
+With allow_delegation=True on tech_lead and on the manager, the same
+question can bounce between agents ("Ask question to coworker" →
+the coworker delegates it back) until max_iter runs out, and every
+hop is a gpt-4o call. The tracker keys each delegation by
+(from agent, to agent, normalised question hash):
+
+  repeat  the same edge was already answered in this run
+          → the earlier answer is returned, no LLM call
+  cycle   the target agent already holds this question further up
+          the delegation chain, as asker or as coworker (A → B → A);
+          handing it on to an agent not yet on it (A → B → C) is fine
+          → the hop is refused and the agent is told to answer
+
+Normalising drops case, punctuation, filler words and word order, so
+"Can you estimate the backend effort?" and "estimate backend effort"
+share a key. Every hop is reported as a `delegation` event, and
+stats() counts the LLM calls the short-circuits saved.
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_FILLER = frozenset(
+    "a an the please can could you would will me us i we to of for on in and or "
+    "is are be this that it with about your our".split()
+)
+
+
+def question_key(text):
+    words = {w for w in _WORD.findall((text or "").lower()) if w not in _FILLER}
+    return hashlib.sha1(" ".join(sorted(words)).encode("utf-8")).hexdigest()[:16]
+
+
+class DelegationTracker:
+    """Per-run record of delegation edges and their answers."""
+
+    def __init__(self):
+        self.answers = {}         # (from, to, key) → (answer, LLM calls it took)
+        self.counts = Counter()   # ran / repeat / cycle
+        self.saved_calls = 0
+        self._lock = threading.Lock()
+
+    def check(self, source, target, key, chain):
+        """("cycle", None), ("repeat", answer) or (None, None) to go ahead.
+
+        `chain` holds the (agent, question key) pairs of the delegations
+        that led here: both the asking agent and its coworker.
+        """
+        if (target, key) in chain:
+            with self._lock:
+                self.counts["cycle"] += 1
+            return "cycle", None
+        with self._lock:
+            cached = self.answers.get((source, target, key))
+            if cached is None:
+                return None, None
+            self.counts["repeat"] += 1
+            self.saved_calls += cached[1]
+        return "repeat", cached[0]
+
+    def record(self, source, target, key, answer, calls):
+        with self._lock:
+            self.counts["ran"] += 1
+            self.answers[(source, target, key)] = (answer, calls)
+
+    def stats(self):
+        with self._lock:
+            return {"delegations": dict(self.counts), "saved_calls": self.saved_calls}
@@ -0,0 +1,498 @@
+"""
+============================================================
+  crew_runtime.distributed  |  Crews across worker processes
+============================================================
+
+CONCEPT:
+  kickoff_many() stops at one machine. Here a Coordinator puts
+  jobs on a BROKER and any number of Worker processes, on any
+  number of machines, take them off:
+
+    job     {crew spec, inputs} — a whole kickoff — or one task
+            of the crew plus the outputs of its context tasks
+    broker  SQLiteBroker  (one file, works offline; share it
+                           between processes of one machine)
+            RedisBroker   (any Redis-compatible server; several
+                           machines; needs `pip install redis`)
+
+  Job ids are hashes of what the job computes, so submitting the
+  same job twice runs it once and returns the stored result. A job
+  that FAILED on every attempt is queued again (attempts reset)
+  when it is submitted again.
+  A worker holds a LEASE on its job and renews it while working;
+  if the worker dies, the lease runs out and the job goes back on
+  the queue (up to max_attempts times).
+
+  Coordinator.map() spreads a batch of kickoffs (Lesson 1's
+  topics) over all workers; Coordinator.run_tasks() sends the
+  tasks of one sequential crew level by level along its context
+  graph, so tasks that do not depend on each other run on
+  different workers at the same time.
+
+USAGE:
+  # on every worker machine / process
+  python -m crew_runtime.distributed worker sqlite:///.crew_broker/jobs.sqlite3
+
+  # coordinator
+  coordinator = Coordinator(open_broker("sqlite:///.crew_broker/jobs.sqlite3"))
+  results = coordinator.map("Lesson 1  Key concepts with keywords  Agent - Task - Crew/main.py:crew",
+                            [{"topic": t} for t in topics])
+
+  Crew specs are the same as for workflow nodes: "file.py:attr"
+  or "package.module:attr", loaded inside the worker. Relative
+  file paths are resolved against the repository root, so one
+  spec works on every machine with a checkout of the lessons.
+
+============================================================
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import uuid
+
+from .definition import SEQUENTIAL, CrewResult, TaskOutput
+from .workflow import as_definition, load_crew
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobFailed(RuntimeError):
+    """A job failed on every attempt."""
+
+
+def job_id(payload):
+    """Idempotent id: the same crew, inputs and task always get the same id."""
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:24]
+
+
+# ── Brokers ──────────────────────────────────────────────────────────
+# A broker stores jobs as {id, payload, status, attempts, result, error}.
+# claim() hands one queued job to a worker under a lease; jobs whose
+# lease ran out are put back (or failed) before anything is claimed.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id       TEXT PRIMARY KEY,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker       TEXT,
+    lease_until  REAL,
+    result       TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, created_at);
+"""
+
+
+class SQLiteBroker:
+    """Broker in one SQLite file; safe across threads and local processes."""
+
+    def __init__(self, path=os.path.join(".crew_broker", "jobs.sqlite3")):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, job_id, payload, max_attempts=3):
+        """Add a job unless one with this id exists (a FAILED one is queued
+        again with fresh attempts); True when it was queued."""
+        now = time.time()
+        cursor = self._conn().execute(
+            "INSERT INTO jobs (job_id, payload, status, max_attempts, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (job_id) DO UPDATE SET status=excluded.status, attempts=0, "
+            "max_attempts=excluded.max_attempts, worker=NULL, lease_until=NULL, error=NULL, "
+            "created_at=excluded.created_at, updated_at=excluded.updated_at WHERE jobs.status=?",
+            (job_id, json.dumps(payload), QUEUED, max_attempts, now, now, FAILED),
+        )
+        return cursor.rowcount == 1
+
+    def claim(self, worker, lease=60.0):
+        """(job_id, payload) of the oldest queued job, or None."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET status=CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                "error=CASE WHEN attempts < max_attempts THEN error ELSE 'worker lost' END, "
+                "worker=NULL, updated_at=? WHERE status=? AND lease_until < ?",
+                (QUEUED, FAILED, now, RUNNING, now),
+            )
+            row = conn.execute(
+                "SELECT job_id, payload FROM jobs WHERE status=? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status=?, worker=?, attempts=attempts+1, lease_until=?, updated_at=? "
+                    "WHERE job_id=?",
+                    (RUNNING, worker, now + lease, now, row[0]),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return (row[0], json.loads(row[1])) if row else None
+
+    def heartbeat(self, job_id, worker, lease=60.0):
+        self._conn().execute(
+            "UPDATE jobs SET lease_until=? WHERE job_id=? AND worker=? AND status=?",
+            (time.time() + lease, job_id, worker, RUNNING),
+        )
+
+    def complete(self, job_id, worker, result):
+        # Only the worker that holds the job may finish it (a worker whose
+        # lease ran out must not overwrite the retry's result)
+        self._conn().execute(
+            "UPDATE jobs SET status=?, result=?, lease_until=NULL, updated_at=? "
+            "WHERE job_id=? AND worker=? AND status=?",
+            (DONE, json.dumps(result), time.time(), job_id, worker, RUNNING),
+        )
+
+    def fail(self, job_id, worker, error):
+        self._conn().execute(
+            "UPDATE jobs SET status=CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+            "error=?, worker=NULL, lease_until=NULL, updated_at=? WHERE job_id=? AND worker=? AND status=?",
+            (QUEUED, FAILED, error, time.time(), job_id, worker, RUNNING),
+        )
+
+    def status(self, job_id):
+        """{status, attempts, result, error} or None."""
+        row = self._conn().execute(
+            "SELECT status, attempts, result, error FROM jobs WHERE job_id=?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"status": row[0], "attempts": row[1],
+                "result": json.loads(row[2]) if row[2] else None, "error": row[3]}
+
+    def counts(self):
+        return dict(self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+
+# Server-side scripts: each runs atomically, so a job is never popped off
+# the queue without its lease (a worker dying between the two would lose it)
+_REDIS_ENQUEUE = """
+local key = KEYS[1]
+if redis.call('HSETNX', key, 'payload', ARGV[2]) == 0
+   and redis.call('HGET', key, 'status') ~= ARGV[5] then
+    return 0
+end
+redis.call('HSET', key, 'payload', ARGV[2], 'status', ARGV[4], 'attempts', 0,
+           'max_attempts', ARGV[3], 'worker', '', 'error', '')
+redis.call('LPUSH', KEYS[2], ARGV[1])
+return 1
+"""
+
+_REDIS_CLAIM = """
+local job_id = redis.call('RPOP', KEYS[1])
+if not job_id then
+    return false
+end
+local key = ARGV[1] .. job_id
+redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('HSET', key, 'status', ARGV[2], 'worker', ARGV[3])
+redis.call('ZADD', KEYS[2], ARGV[4], job_id)
+return {job_id, redis.call('HGET', key, 'payload')}
+"""
+
+# Finishing a job checks the holder and updates it in one step: a worker
+# whose lease ran out must not overwrite the retry's state
+_REDIS_COMPLETE = """
+if redis.call('HGET', KEYS[1], 'worker') ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HSET', KEYS[1], 'status', ARGV[3], 'result', ARGV[4])
+return 1
+"""
+
+_REDIS_FAIL = """
+if redis.call('HGET', KEYS[1], 'worker') ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+local attempts = tonumber(redis.call('HGET', KEYS[1], 'attempts') or '0')
+local max_attempts = tonumber(redis.call('HGET', KEYS[1], 'max_attempts') or '1')
+if attempts < max_attempts then
+    redis.call('HSET', KEYS[1], 'status', ARGV[4], 'worker', '', 'error', ARGV[3])
+    redis.call('LPUSH', KEYS[3], ARGV[1])
+else
+    redis.call('HSET', KEYS[1], 'status', ARGV[5], 'error', ARGV[3])
+end
+return 1
+"""
+
+
+class RedisBroker:
+    """Broker on a Redis-compatible server (Redis, Valkey, KeyDB, ...)."""
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="crew"):
+        import redis
+
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.queue = f"{prefix}:queue"
+        self.leases = f"{prefix}:leases"    # sorted set: job id → lease deadline
+        self._enqueue = self.redis.register_script(_REDIS_ENQUEUE)
+        self._claim = self.redis.register_script(_REDIS_CLAIM)
+        self._complete = self.redis.register_script(_REDIS_COMPLETE)
+        self._fail = self.redis.register_script(_REDIS_FAIL)
+
+    def _key(self, job_id):
+        return f"{self.prefix}:job:{job_id}"
+
+    def enqueue(self, job_id, payload, max_attempts=3):
+        added = self._enqueue(keys=[self._key(job_id), self.queue],
+                              args=[job_id, json.dumps(payload), max_attempts, QUEUED, FAILED])
+        return bool(added)
+
+    def _requeue_expired(self):
+        for job_id in self.redis.zrangebyscore(self.leases, 0, time.time()):
+            if not self.redis.zrem(self.leases, job_id):
+                continue  # another coordinator or worker got to it first
+            key = self._key(job_id)
+            attempts, max_attempts = self.redis.hmget(key, "attempts", "max_attempts")
+            if int(attempts or 0) < int(max_attempts or 1):
+                self.redis.hset(key, mapping={"status": QUEUED, "worker": ""})
+                self.redis.lpush(self.queue, job_id)
+            else:
+                self.redis.hset(key, mapping={"status": FAILED, "error": "worker lost"})
+
+    def claim(self, worker, lease=60.0):
+        self._requeue_expired()
+        claimed = self._claim(keys=[self.queue, self.leases],
+                              args=[self._key(""), RUNNING, worker, time.time() + lease])
+        if not claimed:
+            return None
+        job_id, payload = claimed
+        return job_id, json.loads(payload)
+
+    def heartbeat(self, job_id, worker, lease=60.0):
+        if self.redis.hget(self._key(job_id), "worker") == worker:
+            self.redis.zadd(self.leases, {job_id: time.time() + lease}, xx=True)
+
+    def complete(self, job_id, worker, result):
+        self._complete(keys=[self._key(job_id), self.leases],
+                       args=[job_id, worker, DONE, json.dumps(result)])
+
+    def fail(self, job_id, worker, error):
+        self._fail(keys=[self._key(job_id), self.leases, self.queue],
+                   args=[job_id, worker, error, QUEUED, FAILED])
+
+    def status(self, job_id):
+        data = self.redis.hgetall(self._key(job_id))
+        if not data:
+            return None
+        return {"status": data.get("status"), "attempts": int(data.get("attempts", 0)),
+                "result": json.loads(data["result"]) if data.get("result") else None,
+                "error": data.get("error")}
+
+    def counts(self):
+        counts = {}
+        for key in self.redis.scan_iter(f"{self.prefix}:job:*"):
+            status = self.redis.hget(key, "status")
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+
+def open_broker(url):
+    """'sqlite:///path/to/file.sqlite3' or 'redis://host:port/db'."""
+    if url.startswith("sqlite:///"):
+        return SQLiteBroker(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBroker(url)
+    raise ValueError(f"unsupported broker url {url!r}")
+
+
+# ── Worker ───────────────────────────────────────────────────────────
+class Worker:
+    """Claims jobs from a broker and runs them until stopped."""
+
+    def __init__(self, broker, worker_id=None, lease=60.0, poll=0.2):
+        self.broker = broker
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease = lease
+        self.poll = poll
+        self.processed = 0
+        self._definitions = {}   # crew spec → CrewDefinition, built once per process
+        self._stop = threading.Event()
+
+    def definition(self, spec):
+        if spec not in self._definitions:
+            self._definitions[spec] = as_definition(load_crew(spec))
+        return self._definitions[spec]
+
+    def execute(self, payload):
+        from .executor import execute_task, run_crew
+
+        definition = self.definition(payload["crew"])
+        ctx = definition.new_run(payload.get("inputs"))
+        if payload.get("task") is None:
+            result = run_crew(ctx)
+            return {"run_id": result.run_id, "tasks": [o.raw for o in result.tasks_output],
+                    "iterations": result.iterations}
+        for index, raw in payload.get("context", {}).items():
+            ctx.outputs[int(index)] = TaskOutput(int(index), None, None, raw)
+        output = execute_task(ctx, payload["task"])
+        return {"run_id": ctx.run_id, "raw": output.raw, "agent": output.agent}
+
+    def _keep_lease(self, job_id, done):
+        while not done.wait(self.lease / 3):
+            self.broker.heartbeat(job_id, self.worker_id, self.lease)
+
+    def run_one(self):
+        """Claim and run one job; False when the queue was empty."""
+        claimed = self.broker.claim(self.worker_id, self.lease)
+        if claimed is None:
+            return False
+        job_id, payload = claimed
+        done = threading.Event()
+        keeper = threading.Thread(target=self._keep_lease, args=(job_id, done), daemon=True)
+        keeper.start()
+        try:
+            result = self.execute(payload)
+        except Exception:
+            self.broker.fail(job_id, self.worker_id, traceback.format_exc(limit=5))
+        else:
+            self.broker.complete(job_id, self.worker_id, result)
+        finally:
+            done.set()
+            keeper.join()
+        self.processed += 1
+        return True
+
+    def run(self, max_jobs=None, exit_when_idle=False):
+        while not self._stop.is_set():
+            if max_jobs is not None and self.processed >= max_jobs:
+                return
+            if not self.run_one():
+                if exit_when_idle:
+                    return
+                self._stop.wait(self.poll)
+
+    def stop(self):
+        self._stop.set()
+
+
+# ── Coordinator ──────────────────────────────────────────────────────
+class Coordinator:
+    """Submits jobs to a broker and collects their results."""
+
+    def __init__(self, broker, max_attempts=3, poll=0.2):
+        self.broker = broker
+        self.max_attempts = max_attempts
+        self.poll = poll
+
+    def submit(self, crew, inputs=None, task=None, context=None):
+        """Queue one job (a kickoff, or one task); returns its idempotent id."""
+        payload = {"crew": crew, "inputs": dict(inputs or {})}
+        if task is not None:
+            payload["task"] = task
+            payload["context"] = {str(i): raw for i, raw in (context or {}).items()}
+        identifier = job_id(payload)
+        self.broker.enqueue(identifier, payload, self.max_attempts)
+        return identifier
+
+    def wait(self, job_ids, timeout=None):
+        """{job id: result} once every job is done; raises JobFailed."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        results, pending = {}, list(job_ids)
+        while pending:
+            for identifier in list(pending):
+                state = self.broker.status(identifier)
+                if state["status"] == DONE:
+                    results[identifier] = state["result"]
+                    pending.remove(identifier)
+                elif state["status"] == FAILED:
+                    raise JobFailed(f"job {identifier} failed after {state['attempts']} attempts:\n"
+                                    f"{state['error']}")
+            if pending:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"{len(pending)} jobs still running")
+                time.sleep(self.poll)
+        return results
+
+    def map(self, crew, inputs_list, timeout=None):
+        """One kickoff per inputs dict across all workers; results keep input order."""
+        ids = [self.submit(crew, inputs) for inputs in inputs_list]
+        results = self.wait(ids, timeout)
+        crews = []
+        for identifier in ids:
+            result = results[identifier]
+            outputs = [TaskOutput(i, None, None, raw) for i, raw in enumerate(result["tasks"])]
+            crews.append(CrewResult(result["run_id"], outputs, result["iterations"]))
+        return crews
+
+    def run_tasks(self, crew, inputs=None, timeout=None):
+        """One kickoff whose independent tasks run on different workers.
+
+        Tasks are sent level by level along the context graph (no
+        context → the previous task, like crewai). Sequential crews
+        without async_execution tasks only (ValueError otherwise); run
+        memory is not shared between workers.
+        """
+        definition = as_definition(load_crew(crew))
+        if definition.process != SEQUENTIAL:
+            raise ValueError(f"run_tasks() needs a sequential crew, not a {definition.process} one")
+        if any(task.async_execution for task in definition.tasks):
+            raise ValueError("run_tasks() does not run async_execution tasks; use map() for this crew")
+        needs = {}
+        for index, task in enumerate(definition.tasks):
+            needs[index] = set(task.context if task.context is not None else ((index - 1,) if index else ()))
+        outputs, run_id = {}, None
+        while len(outputs) < len(needs):
+            ready = [i for i, deps in needs.items() if i not in outputs and deps <= set(outputs)]
+            ids = {i: self.submit(crew, inputs, task=i, context={d: outputs[d] for d in needs[i]})
+                   for i in ready}
+            results = self.wait(ids.values(), timeout)
+            for index, identifier in ids.items():
+                outputs[index] = results[identifier]["raw"]
+                run_id = run_id or results[identifier]["run_id"]
+        tasks = [TaskOutput(i, definition.tasks[i].name, None, outputs[i]) for i in sorted(outputs)]
+        return CrewResult(run_id, tasks, {})
+
+
+# ── Command line ─────────────────────────────────────────────────────
+def main(argv=None):
+    """python -m crew_runtime.distributed worker <broker url> [--max-jobs N] [--exit-when-idle]"""
+    args = list(sys.argv[1:] if argv is None else argv)
+    if len(args) < 2 or args[0] != "worker":
+        print(main.__doc__)
+        return 2
+    max_jobs = int(args[args.index("--max-jobs") + 1]) if "--max-jobs" in args else None
+    worker = Worker(open_broker(args[1]))
+    print(f"worker {worker.worker_id} on {args[1]}")
+    try:
+        worker.run(max_jobs=max_jobs, exit_when_idle="--exit-when-idle" in args)
+    except KeyboardInterrupt:
+        pass
+    print(f"worker {worker.worker_id} processed {worker.processed} jobs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,682 @@
+"""
+============================================================
+  crew_runtime.executor  |  Runs a RunContext to completion
+============================================================
+
+Mirrors what crewai does on kickoff, but reads prompts from the
+run's rendered view and writes results into the RunContext:
+
+  Process.sequential   each task → its own agent; context is the
+                       listed tasks (or the previous task's output)
+  Process.hierarchical each task → the manager, who delegates to
+                       coworkers through two built-in tools
+
+Every agent works in a ReAct loop bounded by max_iter:
+
+  Thought → Action → Action Input → Observation → ... → Final Answer
+
+Events emitted on ctx (listeners receive ctx, event, data):
+  task_started, llm_call, tool_call, memory_read, agent_step,
+  task_completed, and then run_completed, or run_failed (error=the
+  exception) when the run raised or was cancelled
+
+Delegations are tracked per run: a repeated (from, to, question) is
+answered from the earlier result and a question sent back to an
+agent already holding it on the delegation chain is refused
+(event: delegation).
+
+An agent with a ScratchpadPolicy sends only its last steps in full
+and older ones as short notes, so its prompt stops growing.
+
+A task with validators gets its final answer checked locally; on
+failure the agent receives a short repair prompt listing only what
+is wrong (event: validation_failed) instead of redoing the task.
+
+An incremental task with a baseline run re-edits only the paragraphs
+of its source (last context task) that changed since that run and
+patches them into the previous output (event: incremental_edit).
+
+Agents with a DedupPolicy see only tool results that are new to the
+run: repeated URLs and near-duplicate snippets are dropped (event:
+dedup).
+
+A tool may stream (return an iterator of chunks); each chunk is
+emitted as a tool_output event. With a ToolPool (kickoff(tool_pool=))
+tool calls run off the agent thread under per-tool timeouts and
+concurrency limits.
+
+With a TokenBudget (kickoff(budget=)) every call's tokens are
+counted before and after it; a hard budget stops the run with
+BudgetExceeded and a soft one compacts history, stops delegation or
+switches to a smaller model (event: budget).
+
+A task with a Dataset (crew_runtime.datasets) gets the dataset's
+profile in its context, computed by a Compute request off the
+event loop, and its agent gets the dataset's tools.
+
+Verbose traces and output_log_file lines go to ctx.log, a queued
+RunLog (crew_runtime.runlog), never to stdout from the agent thread.
+
+The loop itself does no I/O. Agents and tasks are generators that
+yield an LLMCall or a ToolCall and get its result sent back; a
+driver performs the requests:
+
+  drive(ctx, steps)        on this thread (kickoff, scheduler,
+                           distributed workers)
+  drive_async(ctx, steps)  awaited on an event loop (kickoff_async):
+                           llm.acomplete / async tools / asyncio.sleep
+                           for max_rpm, so one loop runs many crews
+                           without a thread per run, and cancelling
+                           the task cancels the in-flight call
+
+Consecutive tasks with async_execution=True run as one parallel
+batch (threads under kickoff, one gather under kickoff_async); the
+next task waits for all of them. Under kickoff_async a failed or
+timed-out task cancels the rest of its batch. They share the run's RunMemory,
+whose per-agent segments take writes without a shared lock.
+
+Tasks already present in ctx.outputs (restored from a checkpoint)
+are skipped, which is how kickoff(resume=run_id) continues a run;
+the agent of a task that was cut short starts from the steps in
+ctx.resumed_steps instead of an empty scratchpad.
+============================================================
+"""
+
+import asyncio
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from . import incremental
+from .budget import BudgetExceeded
+from .definition import HIERARCHICAL, TaskOutput
+from .dedup import SeenSources, filter_observation
+from .delegation import question_key
+from .replay import ReplayError
+from .runlog import DEBUG, INFO
+from .scratchpad import Scratchpad
+from .toolpool import run_inline, run_inline_async
+from .tools import ToolSpec, find_tool, parse_action_input
+from .validators import repair_prompt, validate
+from .writer import write_atomic
+
+MAX_DELEGATION_DEPTH = 3
+
+# Raised to stop the whole run; never handed to the agent as a tool error
+RUN_CONTROL = (BudgetExceeded, ReplayError)
+
+
+_FINAL = re.compile(r"Final Answer\s*:", re.IGNORECASE)
+_ACTION = re.compile(r"Action\s*:\s*(.+?)\s*\n\s*Action Input\s*:\s*(.*)", re.IGNORECASE | re.DOTALL)
+
+OBSERVATION = "Observation: "
+
+FORCE_FINAL = (
+    "Now it's time you MUST give your absolute best final answer. "
+    "You'll ignore all previous instructions, stop using any tools, "
+    "and just return your absolute BEST Final answer."
+)
+
+
+# ── Scratchpad steps ─────────────────────────────────────────────────
+class AgentStep:
+    """One turn of the ReAct loop.
+
+    The action input is kept as a (start, end) span into `text` when it
+    is a plain substring, so long delegation inputs are stored once. The
+    observation is kept only as the "Observation: ..." message sent back
+    to the LLM; `observation` slices it out when asked.
+    """
+
+    __slots__ = ("text", "action", "_input", "message")
+
+    def __init__(self, text, action=None, action_input=None, observation=None):
+        self.text = text
+        self.action = sys.intern(action) if action else action
+        start = text.find(action_input) if action_input else -1
+        self._input = (start, start + len(action_input)) if start >= 0 else action_input
+        self.observation = observation
+
+    @property
+    def action_input(self):
+        if isinstance(self._input, tuple):
+            return self.text[self._input[0]:self._input[1]]
+        return self._input
+
+    @property
+    def observation(self):
+        return None if self.message is None else self.message[len(OBSERVATION):]
+
+    @observation.setter
+    def observation(self, observation):
+        self.message = None if observation is None else OBSERVATION + observation
+
+
+def parse_step(text):
+    """Return (final_answer, action, action_input); unused parts are None."""
+    final = _FINAL.search(text)
+    action = _ACTION.search(text)
+    if action and (not final or action.start() < final.start()):
+        action_input = action.group(2)
+        action_input = action_input.split("\nObservation")[0].strip()
+        return None, action.group(1).strip(), action_input
+    if final:
+        return text[final.end():].strip(), None, None
+    return text.strip(), None, None
+
+
+# ── Prompt building ──────────────────────────────────────────────────
+def task_prompt(description, expected_output, context="", memories=()):
+    prompt = f"Current Task: {description}\n"
+    if expected_output:
+        prompt += (
+            f"\nThis is the expect criteria for your final answer: {expected_output}\n"
+            "you MUST return the actual complete content as the final answer, not a summary.\n"
+        )
+    if context:
+        prompt += f"\nThis is the context you're working with:\n{context}\n"
+    if memories:
+        prompt += "\nRelevant notes from earlier in this run:\n" + "\n".join(f"- {m}" for m in memories) + "\n"
+    return prompt + "\nBegin! This is VERY important to you, use the tools available and give your best Final Answer."
+
+
+def scratchpad_messages(steps):
+    messages = []
+    for step in steps:
+        messages.append({"role": "assistant", "content": step.text})
+        if step.message is not None:
+            messages.append({"role": "user", "content": step.message})
+    return messages
+
+
+# ── Requests (performed by a driver) ─────────────────────────────────
+class LLMCall:
+    """Yielded by the loop; the driver sends back (LLMResponse, rate-limit wait)."""
+
+    __slots__ = ("agent_index", "messages", "llm")
+
+    def __init__(self, agent_index, messages, llm):
+        self.agent_index = agent_index
+        self.messages = messages
+        self.llm = llm              # the agent's client, or a budget's smaller model
+
+
+class ToolCall:
+    """Yielded by the loop; the driver sends back the observation (or throws)."""
+
+    __slots__ = ("tool", "action_input", "on_chunk")
+
+    def __init__(self, tool, action_input, on_chunk):
+        self.tool = tool
+        self.action_input = action_input
+        self.on_chunk = on_chunk
+
+
+class Compute:
+    """Yielded by the loop for local CPU / disk work; the driver sends back func(*args)."""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+
+def perform(ctx, request):
+    if isinstance(request, Compute):
+        return request.func(*request.args)
+    if isinstance(request, ToolCall):
+        if ctx.tool_pool is not None:  # bounded, timed, cancellable
+            return ctx.tool_pool.run(request.tool, request.action_input,
+                                     on_chunk=request.on_chunk, cancel=ctx.cancel)
+        return run_inline(request.tool, request.action_input, on_chunk=request.on_chunk)
+    definition = ctx.definition
+    index = request.agent_index
+    waited = definition.crew_limiter.acquire() + definition.agent_limiters[index].acquire()
+    with ctx.gate if ctx.gate is not None else nullcontext():  # JobScheduler's call order
+        response = request.llm.complete(request.messages)
+    return response, waited
+
+
+async def perform_async(ctx, request):
+    if isinstance(request, Compute):  # e.g. profiling a dataset: off the event loop
+        return await asyncio.to_thread(request.func, *request.args)
+    if isinstance(request, ToolCall):
+        if ctx.tool_pool is not None:
+            return await ctx.tool_pool.run_async(request.tool, request.action_input,
+                                                 on_chunk=request.on_chunk)
+        return await run_inline_async(request.tool, request.action_input, on_chunk=request.on_chunk)
+    if ctx.gate is not None:  # a blocking gate: keep it off the event loop
+        return await asyncio.to_thread(perform, ctx, request)
+    definition = ctx.definition
+    index = request.agent_index
+    waited = (await definition.crew_limiter.acquire_async()
+              + await definition.agent_limiters[index].acquire_async())
+    llm = request.llm
+    if hasattr(llm, "acomplete"):
+        response = await llm.acomplete(request.messages)
+    else:  # sync-only client: one worker thread for the length of the call
+        response = await asyncio.to_thread(llm.complete, request.messages)
+    return response, waited
+
+
+def drive(ctx, steps):
+    """Run a step generator to its return value, performing requests here."""
+    send, value = steps.send, None
+    while True:
+        try:
+            request = send(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            send, value = steps.send, perform(ctx, request)
+        except Exception as exc:  # raised inside the loop, where the request was made
+            send, value = steps.throw, exc
+
+
+async def drive_async(ctx, steps):
+    """drive() on an event loop; cancellation stops the run's pooled tool calls too."""
+    send, value = steps.send, None
+    try:
+        while True:
+            try:
+                request = send(value)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                send, value = steps.send, await perform_async(ctx, request)
+            except Exception as exc:
+                send, value = steps.throw, exc
+    except asyncio.CancelledError:
+        ctx.cancel.set()
+        raise
+    finally:
+        steps.close()
+
+
+# ── LLM + tools ──────────────────────────────────────────────────────
+def call_llm(ctx, agent_index, task_index, messages):
+    llm = ctx.definition.all_agents[agent_index].llm
+    budget = ctx.budget
+    if budget is not None:
+        llm = budget.llm_for(agent_index, task_index) or llm
+        try:
+            prompt_tokens = budget.before(agent_index, task_index, messages, llm)
+        except BudgetExceeded as exc:
+            ctx.emit("budget", agent=agent_index, **exc.hit)
+            ctx.log.error(ctx.prompts.agents[agent_index]["role"], "%s", exc)
+            raise
+    ctx.iterations[agent_index] += 1
+    response, waited = yield LLMCall(agent_index, messages, llm)
+    ctx.emit("llm_call", agent=agent_index, messages=messages, response=response,
+             rate_limit_wait=waited, prompt_chars=sum(len(m["content"]) for m in messages))
+    if budget is not None:
+        for hit in budget.after(agent_index, task_index, prompt_tokens, response, llm):
+            ctx.emit("budget", agent=agent_index, **hit)
+            ctx.log.warning(ctx.prompts.agents[agent_index]["role"], "soft token budget of %s %r hit "
+                            "(%d/%d); now: %s", hit["scope"], hit["name"], hit["used"], hit["limit"],
+                            ", ".join(hit["actions"]) or "nothing")
+    return response.text
+
+
+class DelegationTool(ToolSpec):
+    """A coworker tool: func is a generator running the coworker's loop."""
+
+    __slots__ = ()
+
+    def steps(self, action_input):
+        args = parse_action_input(action_input)
+        if isinstance(args, dict):
+            return self.func(**args)
+        return self.func(args)
+
+
+def delegation_tools(ctx, agent_index, task_index, depth, chain=()):
+    definition = ctx.definition
+    coworkers = [i for i in range(len(definition.agents)) if i != agent_index]
+    if not coworkers:
+        return []
+    roles = ", ".join(ctx.prompts.agents[i]["role"] for i in coworkers)
+
+    def coworker_index(name):
+        wanted = (name or "").strip().strip("'\"").lower()
+        for i in coworkers:
+            if ctx.prompts.agents[i]["role"].lower() == wanted:
+                return i
+        raise ValueError(f"Coworker '{name}' not found; choose one of: {roles}")
+
+    def delegate(task="", context="", coworker="", **_):
+        if depth >= MAX_DELEGATION_DEPTH:
+            return "Delegation depth limit reached; finish this yourself."
+        if ctx.budget is not None and not ctx.budget.may_delegate(agent_index, task_index):
+            return "The token budget for this work is nearly spent; do not delegate, finish this yourself."
+        target = coworker_index(coworker)
+        key = question_key(task)
+        status, answer = ctx.delegations.check(agent_index, target, key, chain)
+        ctx.emit("delegation", task=task_index, agent=agent_index, coworker=target,
+                 status=status or "ran", saved_calls=ctx.delegations.saved_calls)
+        if status == "cycle":
+            return ("This request is already being handled further up the delegation chain. "
+                    "Do not delegate it again; give your own best answer.")
+        if status == "repeat":
+            return f"(You already received this answer from {coworker} earlier in this run.)\n{answer}"
+        calls = sum(ctx.iterations.values())
+        answer = yield from run_agent(ctx, target, task_prompt(task, "", context), task_index,
+                           depth=depth + 1, chain=chain + ((agent_index, key), (target, key)))
+        ctx.delegations.record(agent_index, target, key, answer, sum(ctx.iterations.values()) - calls)
+        return answer
+
+    def ask(question="", context="", coworker="", **_):
+        return (yield from delegate(task=question, context=context, coworker=coworker))
+
+    return [
+        DelegationTool(
+            "Delegate work to coworker",
+            "Delegate a specific task to one of the following coworkers: "
+            f"{roles}. Input is a JSON object with keys task, context and coworker.",
+            delegate,
+        ),
+        DelegationTool(
+            "Ask question to coworker",
+            "Ask a specific question to one of the following coworkers: "
+            f"{roles}. Input is a JSON object with keys question, context and coworker.",
+            ask,
+        ),
+    ]
+
+
+def dedupe(ctx, agent_index, tool_name, observation):
+    """Drop results already seen in this run (agents with a DedupPolicy)."""
+    policy = ctx.definition.all_agents[agent_index].dedup
+    if policy is None or (policy.tools and tool_name not in policy.tools):
+        return observation
+    if ctx.sources is None:
+        ctx.sources = SeenSources(policy.threshold)
+    filtered, kept, dropped = filter_observation(ctx.sources, observation, policy)
+    if dropped:
+        ctx.emit("dedup", agent=agent_index, tool=tool_name, kept=kept, dropped=dropped,
+                 saved_chars=len(observation) - len(filtered))
+    return filtered
+
+
+def run_tool(ctx, agent_index, tools, action, action_input):
+    tool = find_tool(tools, action)
+    start = time.perf_counter()
+    if tool is None:
+        observation = f"Tool '{action}' does not exist. Use one of: {', '.join(t.name for t in tools)}"
+    else:
+        def on_chunk(chunk):
+            ctx.emit("tool_output", agent=agent_index, tool=tool.name, chunk=chunk)
+
+        try:
+            if isinstance(tool, DelegationTool):
+                observation = yield from tool.steps(action_input)
+            else:
+                observation = yield ToolCall(tool, action_input, on_chunk)
+        except RUN_CONTROL:  # e.g. a delegated coworker hit the hard budget: stop the run
+            raise
+        except Exception as exc:  # tool errors go back to the agent
+            observation = f"Error while using tool '{tool.name}': {exc}"
+        else:
+            observation = dedupe(ctx, agent_index, tool.name, observation)
+    ctx.emit("tool_call", agent=agent_index, tool=action, input=action_input,
+             output=observation, duration=time.perf_counter() - start)
+    return observation
+
+
+# ── Agent loop ───────────────────────────────────────────────────────
+def run_agent(ctx, agent_index, user_prompt, task_index, depth=0, chain=()):
+    """ReAct loop for one agent; returns its final answer.
+
+    `chain` holds the (agent, question key) pairs of the delegations that led here.
+    """
+    agent = ctx.definition.all_agents[agent_index]
+    tools = list(agent.tools)
+    dataset = ctx.definition.tasks[task_index].dataset
+    if dataset is not None and depth == 0:  # the task's own agent, not its coworkers
+        tools += dataset.tools()
+    if agent.allow_delegation:
+        tools += delegation_tools(ctx, agent_index, task_index, depth, chain)
+
+    # Every message is built once; with a ScratchpadPolicy only the last
+    # steps are sent in full and older ones are folded into notes
+    scratchpad = Scratchpad([
+        {"role": "system", "content": ctx.definition.system_prompts.get(ctx.prompts.agents[agent_index], tools)},
+        {"role": "user", "content": user_prompt},
+    ], agent.scratchpad)
+    # a resumed task continues after the steps its agent checkpointed
+    restored = ctx.resumed_steps.pop(task_index, ()) if depth == 0 else ()
+    for step in restored:
+        scratchpad.add(step, scratchpad_messages((step,)))
+    for _ in range(max(0, agent.max_iter - len(restored))):
+        if ctx.budget is not None:
+            compact = ctx.budget.compact_policy(agent_index, task_index)
+            if compact is not None and scratchpad.policy is not compact:
+                scratchpad.compact(compact)
+        text = yield from call_llm(ctx, agent_index, task_index, scratchpad.messages())
+        final, action, action_input = parse_step(text)
+        if action is None or not tools:
+            return final
+        step = AgentStep(text, action, action_input)
+        observation = yield from run_tool(ctx, agent_index, tools, action, action_input)
+        step.message = ctx.strings.share(OBSERVATION + observation)
+        _say(ctx, agent_index, "%s(%s)\n%s", action, step.action_input, step.message)
+        scratchpad.add(step, scratchpad_messages((step,)))
+        ctx.emit("agent_step", task=task_index, agent=agent_index, step=step, depth=depth)
+
+    messages = scratchpad.messages({"role": "user", "content": FORCE_FINAL})
+    return parse_step((yield from call_llm(ctx, agent_index, task_index, messages)))[0]
+
+
+# ── Tasks & crew ─────────────────────────────────────────────────────
+def _say(ctx, agent_index, msg, *args):
+    # verbose agents trace at INFO (shown by default), the others at DEBUG;
+    # formatting happens on the logger thread, and not at all when filtered
+    verbose = ctx.definition.verbose or ctx.definition.all_agents[agent_index].verbose
+    ctx.log.log(INFO if verbose else DEBUG, ctx.prompts.agents[agent_index]["role"], msg, *args)
+
+
+def _log_task(ctx, task_index, role, status, output=None):
+    """One line in crewai's output_log_file format, written by the logger thread."""
+    ctx.log.task(role, task_name=ctx.definition.tasks[task_index].name,
+                 task=ctx.prompts.tasks[task_index]["description"], status=status, output=output)
+
+
+def context_sources(ctx, task_index):
+    tasks = ctx.definition.tasks
+    task = tasks[task_index]
+    if task.context is not None:
+        return task.context
+    previous = task_index - 1
+    if task.async_execution:  # not a task running alongside this one
+        while previous >= 0 and tasks[previous].async_execution:
+            previous -= 1
+    return (previous,) if previous >= 0 else ()
+
+
+def task_context(ctx, task_index):
+    return "\n\n".join(ctx.outputs[i].raw for i in context_sources(ctx, task_index) if i in ctx.outputs)
+
+
+def incremental_edit(ctx, task_index, agent_index, rendered):
+    """Patch the baseline output of this task, or None to run it in full."""
+    baseline = ctx.baseline
+    sources = context_sources(ctx, task_index)
+    if task_index not in baseline or not sources:
+        return None
+    *others, source = sources
+    if source not in ctx.outputs or source not in baseline:
+        return None
+    if any(i not in baseline or ctx.outputs.get(i, baseline[i]).raw != baseline[i].raw for i in others):
+        return None  # other context (e.g. the research) moved: re-edit in full
+
+    patch = incremental.plan(baseline[source].raw, ctx.outputs[source].raw, baseline[task_index].raw)
+    ctx.emit("incremental_edit", task=task_index, agent=agent_index,
+             changed=patch.changed, total=patch.total)
+    if not patch.hunks:  # unchanged, or paragraphs only deleted: no LLM call
+        return patch.apply([])
+    if patch.changed_share > incremental.MAX_CHANGED_SHARE:
+        return None
+
+    _say(ctx, agent_index, "Re-editing %d of %d paragraphs", patch.changed, patch.total)
+    header = (f"Current Task: {rendered['description']}\n\n"
+              f"This is the expect criteria for your final answer: {rendered['expected_output']}")
+    reply = yield from call_llm(ctx, agent_index, task_index, [
+        {"role": "system", "content": ctx.definition.system_prompts.get(ctx.prompts.agents[agent_index])},
+        {"role": "user", "content": incremental.edit_prompt(header, patch)},
+    ])
+    edits = incremental.parse_edits(parse_step(reply)[0], len(patch.hunks))
+    return patch.apply(edits) if edits is not None else None
+
+
+def repair_output(ctx, task_index, agent_index, user_prompt, raw):
+    """Run the task's validators; ask for targeted fixes until they pass."""
+    task = ctx.definition.tasks[task_index]
+    system = ctx.definition.system_prompts.get(ctx.prompts.agents[agent_index])
+    for attempt in range(task.max_repairs + 1):
+        failures = validate(raw, task.validators)
+        if not failures:
+            return raw
+        final = attempt == task.max_repairs
+        ctx.emit("validation_failed", task=task_index, agent=agent_index,
+                 failures=failures, attempt=attempt, final=final)
+        if final:
+            return raw
+        _say(ctx, agent_index, "Repairing: %s", "; ".join(message for _, message in failures))
+        reply = yield from call_llm(ctx, agent_index, task_index, [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user_prompt},
+            {"role": "assistant", "content": f"Final Answer: {raw}"},
+            {"role": "user", "content": repair_prompt(failures)},
+        ])
+        raw = parse_step(reply)[0]
+    return raw
+
+
+def task_steps(ctx, task_index):
+    definition = ctx.definition
+    task = definition.tasks[task_index]
+    rendered = ctx.prompts.tasks[task_index]
+    if definition.process == HIERARCHICAL:
+        agent_index = len(definition.agents)  # the manager
+    elif task.agent is not None:
+        agent_index = task.agent
+    else:
+        raise ValueError(f"Task {task_index} has no agent; sequential crews need agent=")
+
+    role = ctx.prompts.agents[agent_index]["role"]
+    ctx.emit("task_started", task=task_index, agent=agent_index)
+    _say(ctx, agent_index, "Task: %.200s", rendered["description"])
+    _log_task(ctx, task_index, role, "started")
+    context = task_context(ctx, task_index)
+    if task.dataset is not None:
+        # the file itself never reaches the LLM: only its profile (a few KB)
+        profile = yield Compute(task.dataset.profile)
+        context = "\n\n".join(part for part in (context, profile.to_text()) if part)
+    memories = ()
+    if ctx.memory is not None:
+        # one snapshot per task: parallel tasks' later writes never change what it reads
+        found = ctx.memory.snapshot().search(rendered["description"],
+                                             exclude={o.raw for o in list(ctx.outputs.values())})
+        memories = tuple(item.text[:500] for item in found)
+        ctx.emit("memory_read", task=task_index, items=[[item.agent, item.task] for item in found])
+
+    user_prompt = task_prompt(rendered["description"], rendered["expected_output"], context, memories)
+    raw = None
+    if task.incremental and ctx.baseline:
+        raw = yield from incremental_edit(ctx, task_index, agent_index, rendered)
+    if raw is None:
+        raw = yield from run_agent(ctx, agent_index, user_prompt, task_index)
+    if task.validators:
+        raw = yield from repair_output(ctx, task_index, agent_index, user_prompt, raw)
+    raw = ctx.strings.share(raw)
+    output = ctx.outputs[task_index] = TaskOutput(task_index, task.name, role, raw)
+    memory_delta = []
+    if ctx.memory is not None:
+        memory_delta.append(ctx.memory.save(role, task_index, raw))
+    if task.output_file:
+        if ctx.writer is not None:
+            ctx.writer.submit(ctx.run_id, task.output_file, raw)  # off the agent thread
+        else:
+            write_atomic(task.output_file, raw)
+    _say(ctx, agent_index, "Final Answer: %s", raw)
+    _log_task(ctx, task_index, role, "completed", raw)
+    ctx.emit("task_completed", task=task_index, agent=agent_index, output=output,
+             memory_delta=memory_delta)
+    return output
+
+
+def execute_task(ctx, task_index):
+    return drive(ctx, task_steps(ctx, task_index))
+
+
+def task_batches(definition):
+    """Task indexes in run order; consecutive async_execution tasks share a batch."""
+    batches, parallel = [], []
+    for task_index, task in enumerate(definition.tasks):
+        if task.async_execution:
+            parallel.append(task_index)
+            continue
+        if parallel:
+            batches.append(parallel)
+            parallel = []
+        batches.append([task_index])
+    if parallel:
+        batches.append(parallel)
+    return batches
+
+
+def run_crew(ctx):
+    try:
+        for batch in task_batches(ctx.definition):
+            pending = [i for i in batch if i not in ctx.outputs]
+            if len(pending) > 1:
+                with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="crew-task") as pool:
+                    list(pool.map(lambda task_index: execute_task(ctx, task_index), pending))
+                if ctx.memory is not None:
+                    ctx.memory.merge()  # the join: later tasks search one merged index
+            elif pending:
+                execute_task(ctx, pending[0])
+        result = ctx.result()
+        ctx.emit("run_completed", result=result)
+        return result
+    except BaseException as exc:
+        ctx.emit("run_failed", error=exc)  # listeners drop / flush the run's state
+        raise
+    finally:
+        ctx.log.end()  # this run's log lines are out before kickoff returns or raises
+
+
+async def _all_or_none(coroutines):
+    """gather() that, when one task fails or the run is cancelled, cancels
+    the others and waits for them, so none calls the LLM or emits events
+    after run_failed."""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def run_crew_async(ctx, task_timeout=None):
+    """run_crew() on an event loop; each task is cancelled after task_timeout seconds."""
+    try:
+        for batch in task_batches(ctx.definition):
+            pending = [i for i in batch if i not in ctx.outputs]
+            await _all_or_none(asyncio.wait_for(drive_async(ctx, task_steps(ctx, i)), task_timeout)
+                               for i in pending)
+            if len(pending) > 1 and ctx.memory is not None:
+                ctx.memory.merge()
+        result = ctx.result()
+        ctx.emit("run_completed", result=result)
+        return result
+    except BaseException as exc:  # including cancellation and timeouts
+        ctx.emit("run_failed", error=exc)
+        raise
+    finally:
+        await asyncio.to_thread(ctx.log.end)
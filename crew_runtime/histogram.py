@@ -0,0 +1,58 @@
+"""
+crew_runtime.histogram — fixed-bucket latency histogram.
+
+Cheap enough to update on every LLM / tool call: one bisect and two
+additions under a lock. Quantiles are read from bucket bounds, which
+is all a dashboard or a routing decision needs.
+"""
+
+import bisect
+import threading
+
+# Upper bounds in seconds; the last bucket catches everything slower
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[min(index, len(self.counts) - 1)] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (None if empty)."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            for bound, n in zip(self.buckets, self.counts):
+                seen += n
+                if seen >= rank:
+                    return bound
+        return self.buckets[-1]
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self.counts)
+            count, total = self.count, self.total
+        return {
+            "count": count,
+            "sum": total,
+            "buckets": dict(zip(self.buckets, counts)),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
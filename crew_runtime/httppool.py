@@ -0,0 +1,552 @@
+"""
+============================================================
+  crew_runtime.httppool  |  One keep-alive pool for all HTTP
+============================================================
+
+CONCEPT:
+  Lesson 2 talks to three HTTP services, each with its own
+  connections:  ChatOpenAI (chat), the text-embedding-3-small
+  embedder and SerperDevTool (search). hierarchical.py adds a
+  fourth client for manager_llm. Under concurrency every one of
+  them pays its own TLS handshakes and opens its own sockets.
+
+  ConnectionPool is the single HTTP layer for all of them:
+
+    • keep-alive connections, reused LIFO, dropped when idle
+    • a per-host limit (max_per_host) on concurrent requests
+    • HTTP/2 through httpx when the `h2` package is installed,
+      otherwise HTTP/1.1 on the standard library
+    • metrics: requests, connections opened vs. reused
+
+HOW IT IS INJECTED:
+  pool = ConnectionPool(max_per_host=10)
+
+  ChatOpenAI(..., http_client=pool.httpx_client())   # langchain / openai SDK
+  OpenAIChatLLM("gpt-4o-mini", pool)                  # runtime chat client
+  OpenAIEmbedder(pool)                                # embeddings
+  SerperSearchTool(pool, n_results=10)                # web search
+
+ASYNC:
+  pool.arequest() (used by OpenAIChatLLM.acomplete under
+  kickoff_async) sends through an httpx.AsyncClient per event loop,
+  under the same per-host slots and metrics as request(); cancelling
+  the run aborts the request. Without httpx it falls back to the
+  blocking pool on a worker thread.
+
+  pool.close() closes the backend and every client it handed out.
+
+TRY IT OFFLINE:
+  python -m crew_runtime.httppool     # local mock server + metrics
+
+============================================================
+"""
+
+import asyncio
+import http.client
+import importlib.util
+import json as jsonlib
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from .llm import LLMResponse
+from .prompts import chat_body
+
+
+class HTTPError(Exception):
+    """Non-2xx response from a pooled request."""
+
+    def __init__(self, status, body, url):
+        self.status = status
+        self.body = body
+        self.url = url
+        super().__init__(f"HTTP {status} from {url}: {body[:200]!r}")
+
+
+class PooledResponse:
+    __slots__ = ("status", "headers", "body", "reused", "http_version", "decoded")
+
+    def __init__(self, status, headers, body, reused=False, http_version="HTTP/1.1", decoded=False):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.reused = reused
+        self.http_version = http_version
+        self.decoded = decoded      # body already gzip/br-decoded (httpx); headers still describe the wire
+
+    def json(self):
+        return jsonlib.loads(self.body.decode("utf-8"))
+
+    def raise_for_status(self, url=""):
+        if self.status >= 400:
+            raise HTTPError(self.status, self.body, url)
+        return self
+
+
+# ── Metrics ──────────────────────────────────────────────────────────
+class PoolMetrics:
+    """Thread-safe counters; snapshot() returns a plain dict."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts = {}
+
+    def record(self, host, reused, elapsed, failed=False):
+        with self._lock:
+            stats = self.hosts.setdefault(host, {
+                "requests": 0, "connections_opened": 0, "connections_reused": 0,
+                "errors": 0, "total_seconds": 0.0,
+            })
+            stats["requests"] += 1
+            stats["connections_reused" if reused else "connections_opened"] += 1
+            stats["errors"] += int(failed)
+            stats["total_seconds"] += elapsed
+
+    def snapshot(self):
+        with self._lock:
+            hosts = {host: dict(stats) for host, stats in self.hosts.items()}
+        totals = {"requests": 0, "connections_opened": 0, "connections_reused": 0, "errors": 0}
+        for stats in hosts.values():
+            for key in totals:
+                totals[key] += stats[key]
+        totals["reuse_ratio"] = totals["connections_reused"] / totals["requests"] if totals["requests"] else 0.0
+        totals["hosts"] = hosts
+        return totals
+
+
+# ── Backends ─────────────────────────────────────────────────────────
+# Errors of a keep-alive socket the server already closed: nothing of the
+# response arrived, so the request is safe to send again
+_STALE = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class _StdlibBackend:
+    """HTTP/1.1 keep-alive on http.client; one idle stack per host."""
+
+    http_version = "HTTP/1.1"
+
+    def __init__(self, timeout, idle_timeout):
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, key):
+        scheme, host, port = key
+        factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return factory(host, port, timeout=self.timeout)
+
+    def _checkout(self, key):
+        now = time.monotonic()
+        with self._lock:
+            stack = self._idle.get(key, [])
+            while stack:
+                conn, last_used = stack.pop()
+                if now - last_used < self.idle_timeout:
+                    return conn, True
+                conn.close()
+        return self._connect(key), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append((conn, time.monotonic()))
+
+    def send(self, key, method, path, body, headers, allow_reuse=True):
+        conn, reused = self._checkout(key) if allow_reuse else (self._connect(key), False)
+        try:
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+            except _STALE:
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive socket before answering;
+                # retry once on a fresh one. A timeout is never retried: the
+                # server may still be working on the request.
+                conn.close()
+                return self.send(key, method, path, body, headers, allow_reuse=False)
+            data = response.read()
+        except BaseException:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+        return PooledResponse(response.status, dict(response.getheaders()), data, reused)
+
+    def close(self):
+        with self._lock:
+            for stack in self._idle.values():
+                for conn, _ in stack:
+                    conn.close()
+            self._idle.clear()
+
+
+class _HttpxBackend:
+    """HTTP/2 (multiplexed) via httpx; reuse is read from the network stream."""
+
+    http_version = "HTTP/2"
+
+    def __init__(self, timeout, max_connections):
+        import httpx
+
+        self.client = httpx.Client(
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+        self._seen = weakref.WeakSet()
+
+    def send(self, key, method, path, body, headers):
+        scheme, host, port = key
+        response = self.client.request(method, f"{scheme}://{host}:{port}{path}",
+                                       content=body, headers=headers)
+        return _from_httpx(response, self._seen)
+
+    def close(self):
+        self.client.close()
+
+
+def _from_httpx(response, seen):
+    """PooledResponse of a read httpx response; reuse is read from its network stream."""
+    stream = response.extensions.get("network_stream")
+    try:
+        reused = stream in seen
+        seen.add(stream)
+    except TypeError:
+        reused = False
+    return PooledResponse(response.status_code, dict(response.headers), response.content,
+                          reused, response.http_version, decoded=True)
+
+
+def http2_available():
+    return (importlib.util.find_spec("httpx") is not None
+            and importlib.util.find_spec("h2") is not None)
+
+
+# ── Pool ─────────────────────────────────────────────────────────────
+class ConnectionPool:
+    """Shared keep-alive HTTP pool; see the module docstring."""
+
+    def __init__(self, max_per_host=10, timeout=60.0, idle_timeout=60.0, http2=True):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        if http2 and http2_available():
+            self.backend = _HttpxBackend(timeout, max_connections=max_per_host * 4)
+        else:
+            self.backend = _StdlibBackend(timeout, idle_timeout)
+        self.metrics = PoolMetrics()
+        self._slots = {}
+        self._lock = threading.Lock()
+        self._httpx_client = None
+        self._async_clients = weakref.WeakKeyDictionary()   # event loop → httpx.AsyncClient
+        self._async_seen = weakref.WeakSet()
+
+    @property
+    def http_version(self):
+        return self.backend.http_version
+
+    def _slot(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+        return slot
+
+    @contextmanager
+    def _host_slot(self, key):
+        with self._slot(key):
+            yield
+
+    async def _async_host_slot(self, slot):
+        # the same semaphore as the threads use, polled so a cancelled
+        # waiter never ends up holding a slot it cannot release
+        delay = 0.001
+        while not slot.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    @staticmethod
+    def _prepare(url, body, headers, json):
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = dict(headers or {})
+        if json is not None:
+            body = jsonlib.dumps(json).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        return key, path, body, headers
+
+    def request(self, method, url, body=None, headers=None, json=None):
+        key, path, body, headers = self._prepare(url, body, headers, json)
+        start = time.perf_counter()
+        with self._host_slot(key):
+            try:
+                response = self.backend.send(key, method, path, body, headers)
+            except Exception:
+                self.metrics.record(key[1], False, time.perf_counter() - start, failed=True)
+                raise
+        self.metrics.record(key[1], response.reused, time.perf_counter() - start)
+        return response
+
+    async def arequest(self, method, url, body=None, headers=None, json=None):
+        """request() on the running event loop: same host slots and metrics."""
+        client = self.async_client()
+        if client is None:  # no httpx: the blocking pool on a worker thread
+            return await asyncio.to_thread(self.request, method, url, body, headers, json)
+        key, path, body, headers = self._prepare(url, body, headers, json)
+        slot = self._slot(key)
+        start = time.perf_counter()
+        await self._async_host_slot(slot)
+        try:
+            response = await client.request(method, f"{key[0]}://{key[1]}:{key[2]}{path}",
+                                            content=body, headers=headers)
+        except Exception:
+            self.metrics.record(key[1], False, time.perf_counter() - start, failed=True)
+            raise
+        finally:
+            slot.release()
+        response = _from_httpx(response, self._async_seen)
+        self.metrics.record(key[1], response.reused, time.perf_counter() - start)
+        return response
+
+    def post_json(self, url, payload, headers=None):
+        return self.request("POST", url, json=payload, headers=headers).raise_for_status(url).json()
+
+    def httpx_client(self):
+        """An httpx.Client whose requests go through this pool.
+
+        Pass it to ChatOpenAI(http_client=...) (or openai.OpenAI) so the
+        openai SDK shares connections, limits and metrics with everything else.
+        """
+        import httpx
+
+        pool = self
+
+        class PoolTransport(httpx.BaseTransport):
+            def handle_request(self, request):
+                response = pool.request(request.method, str(request.url),
+                                        body=request.read(), headers=dict(request.headers))
+                # httpx decodes the body again from content-encoding: when the
+                # backend already decoded it, those headers no longer apply
+                dropped = {"transfer-encoding"}
+                if response.decoded:
+                    dropped |= {"content-encoding", "content-length"}
+                headers = [(k, v) for k, v in response.headers.items() if k.lower() not in dropped]
+                return httpx.Response(response.status, headers=headers,
+                                      content=response.body, request=request)
+
+        with self._lock:
+            if self._httpx_client is None:
+                self._httpx_client = httpx.Client(transport=PoolTransport(), timeout=self.timeout)
+        return self._httpx_client
+
+    def async_client(self):
+        """httpx.AsyncClient for the running event loop, or None without httpx."""
+        if importlib.util.find_spec("httpx") is None:
+            return None
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    http2=http2_available(),
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=self.max_per_host * 4,
+                                        max_keepalive_connections=self.max_per_host * 4),
+                )
+        return client
+
+    def close(self):
+        """Close the backend, httpx_client() and every event loop's async client."""
+        self.backend.close()
+        with self._lock:
+            client, self._httpx_client = self._httpx_client, None
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        if client is not None:
+            client.close()
+        for loop, async_client in async_clients:
+            _close_async(loop, async_client)
+
+
+def _close_async(loop, client):
+    """aclose() an httpx.AsyncClient on the loop that owns its connections."""
+    if loop.is_closed():
+        return  # its sockets went with the loop
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        loop.create_task(client.aclose())
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=10)
+    else:
+        loop.run_until_complete(client.aclose())
+
+
+# ── Clients built on the pool ────────────────────────────────────────
+def _openai_base_url(base_url):
+    return (base_url or os.getenv("OPENAI_API_BASE") or "https://api.openai.com/v1").rstrip("/")
+
+
+class OpenAIChatLLM:
+    """Chat Completions client for the runtime (see crew_runtime.llm)."""
+
+    def __init__(self, model="gpt-4o-mini", pool=None, api_key=None, base_url=None, temperature=0.7,
+                 message_cache=None):
+        self.model = model
+        self.pool = pool or ConnectionPool()
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.url = _openai_base_url(base_url) + "/chat/completions"
+        self.temperature = temperature
+        self.message_cache = message_cache  # a prompts.MessageCache; None → the shared one
+
+    def _body(self, messages, stop):
+        params = {"model": self.model, "temperature": self.temperature}
+        if stop:
+            params["stop"] = stop
+        return chat_body(params, messages, self.message_cache)  # long messages are encoded once
+
+    def _headers(self):
+        return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+    def complete(self, messages, stop=None):
+        start = time.perf_counter()
+        response = self.pool.request("POST", self.url, body=self._body(messages, stop),
+                                     headers=self._headers())
+        return self._response(response.raise_for_status(self.url).json(), start)
+
+    async def acomplete(self, messages, stop=None):
+        start = time.perf_counter()
+        response = await self.pool.arequest("POST", self.url, body=self._body(messages, stop),
+                                            headers=self._headers())
+        return self._response(response.raise_for_status(self.url).json(), start)
+
+    def _response(self, data, start):
+        usage = data.get("usage") or {}
+        return LLMResponse(
+            data["choices"][0]["message"]["content"] or "",
+            model=data.get("model", self.model),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            latency=time.perf_counter() - start,
+        )
+
+
+class OpenAIEmbedder:
+    """Embeddings client; embed(texts) -> list of vectors."""
+
+    def __init__(self, pool=None, model="text-embedding-3-small", api_key=None, base_url=None):
+        self.pool = pool or ConnectionPool()
+        self.model = model
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.url = _openai_base_url(base_url) + "/embeddings"
+
+    def embed(self, texts):
+        data = self.pool.post_json(self.url, {"model": self.model, "input": list(texts)},
+                                   {"Authorization": f"Bearer {self.api_key}"})
+        return [item["embedding"] for item in sorted(data["data"], key=lambda item: item["index"])]
+
+
+class SerperSearchTool:
+    """Drop-in for SerperDevTool on the runtime path, using the shared pool."""
+
+    name = "Search the internet"
+    description = ("A tool that can be used to search the internet with a search_query. "
+                   "Input is a JSON object with a search_query key.")
+
+    def __init__(self, pool=None, n_results=10, country=None, locale=None, api_key=None,
+                 url="https://google.serper.dev/search"):
+        self.pool = pool or ConnectionPool()
+        self.n_results = n_results
+        self.country = country
+        self.locale = locale
+        self.api_key = api_key or os.getenv("SERPER_API_KEY")
+        self.url = url
+
+    def search(self, search_query):
+        payload = {"q": search_query, "num": self.n_results}
+        if self.country:
+            payload["gl"] = self.country
+        if self.locale:
+            payload["hl"] = self.locale
+        data = self.pool.post_json(self.url, payload, {"X-API-KEY": self.api_key or ""})
+        return data.get("organic", [])[: self.n_results]
+
+    def run(self, search_query="", **kwargs):
+        results = self.search(search_query or kwargs.get("query", ""))
+        return "\n".join(
+            f"Title: {r.get('title', '')}\nLink: {r.get('link', '')}\nSnippet: {r.get('snippet', '')}\n---"
+            for r in results
+        )
+
+
+# ── Local mock server demo ───────────────────────────────────────────
+def serve_mock(port=0):
+    """Start a keep-alive mock of the OpenAI + Serper endpoints; returns (server, base_url)."""
+    import gzip
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):
+            payload = jsonlib.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path.endswith("/chat/completions"):
+                reply = {"model": payload.get("model"), "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+                         "choices": [{"message": {"content": "Final Answer: ok"}}]}
+            elif self.path.endswith("/embeddings"):
+                reply = {"data": [{"index": i, "embedding": [0.0, 1.0]} for i, _ in enumerate(payload["input"])]}
+            else:
+                reply = {"organic": [{"title": "t", "link": "https://example.com", "snippet": "s"}]}
+            body = jsonlib.dumps(reply).encode()
+            gzipped = "gzip" in self.headers.get("Accept-Encoding", "")  # as api.openai.com does
+            if gzipped:
+                body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    server, base = serve_mock()
+    pool = ConnectionPool(max_per_host=4, http2=False)
+    chat = OpenAIChatLLM("gpt-4o-mini", pool, api_key="test", base_url=base + "/v1")
+    embedder = OpenAIEmbedder(pool, api_key="test", base_url=base + "/v1")
+    search = SerperSearchTool(pool, api_key="test", url=base + "/search")
+
+    def one_run(i):
+        chat.complete([{"role": "user", "content": f"hello {i}"}])
+        embedder.embed([f"doc {i}"])
+        search.run(search_query=f"query {i}")
+
+    with ThreadPoolExecutor(max_workers=16) as workers:
+        list(workers.map(one_run, range(200)))
+    stats = pool.metrics.snapshot()
+    print(f"requests={stats['requests']} opened={stats['connections_opened']} "
+          f"reused={stats['connections_reused']} reuse_ratio={stats['reuse_ratio']:.1%}")
+    server.shutdown()
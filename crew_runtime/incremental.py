@@ -0,0 +1,212 @@
+"""
+============================================================
+  crew_runtime.incremental  |  Diff-aware re-editing
+============================================================
+
+CONCEPT:
+  When write_task changes a little (a fixed fact, one rewritten
+  section), re-running edit_task regenerates the whole 800–1000
+  word post. For an editor that keeps the paragraph structure of
+  the draft, that is wasted work.
+
+  With a baseline run (the previous draft + its edited version),
+  an incremental task instead:
+
+    1. aligns the OLD draft with the OLD final, paragraph by
+       paragraph (which final paragraphs came from which draft
+       paragraph; a meta line on top or an edit summary at the
+       bottom stay attached to the ends)
+    2. diffs the OLD draft against the NEW draft
+    3. sends ONLY the changed paragraphs to the editor, with the
+       neighbouring edited paragraphs for tone
+    4. patches the answers into the old final output
+
+  Unchanged draft → the old final is reused with no LLM call;
+  paragraphs only deleted → they are dropped from it, also with
+  no LLM call.
+  Too much changed (over max_changed_share) or an answer that
+  cannot be parsed → the executor falls back to a full run.
+
+USAGE:
+  template = CrewDefinition.from_crew(crew, incremental=[edit_task])
+  first = template.kickoff(inputs, checkpoint=store)
+  ...write_task / its inputs change...
+  template.kickoff(inputs, checkpoint=store, baseline=first.run_id)
+
+============================================================
+"""
+
+import difflib
+import re
+
+MAX_CHANGED_SHARE = 0.5   # above this a full re-edit is cheaper and safer
+MIN_SIMILARITY = 0.3      # draft/final paragraphs below this never align
+
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_MARKER = re.compile(r"^<<<(\d+)>>>\s*$", re.MULTILINE)
+
+
+def split_paragraphs(text):
+    return [p.strip() for p in _BLANK_LINES.split(text or "") if p.strip()]
+
+
+def join_paragraphs(paragraphs):
+    return "\n\n".join(paragraphs)
+
+
+def _normalise(paragraph):
+    return " ".join(paragraph.split())
+
+
+def _similarity(a, b):
+    return difflib.SequenceMatcher(None, a.split(), b.split(), autojunk=False).ratio()
+
+
+# ── Alignment: which final paragraphs came from which draft paragraph ──
+def align(draft, final):
+    """Group the final paragraphs by the draft paragraph they were edited from.
+
+    Returns (prefix, groups, suffix): groups[i] lists the final
+    paragraphs of draft[i]; prefix / suffix are final paragraphs before
+    the first / after the last aligned one (meta description, notes).
+    """
+    n, m = len(draft), len(final)
+    sim = [[_similarity(d, f) for f in final] for d in draft]
+    # Monotone alignment maximising total similarity (edit-distance DP)
+    score = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            best = max(score[i - 1][j], score[i][j - 1])
+            if sim[i - 1][j - 1] >= MIN_SIMILARITY:
+                best = max(best, score[i - 1][j - 1] + sim[i - 1][j - 1])
+            score[i][j] = best
+
+    owner = [None] * m
+    i, j = n, m
+    while i and j:
+        s = sim[i - 1][j - 1]
+        if s >= MIN_SIMILARITY and score[i][j] == score[i - 1][j - 1] + s:
+            owner[j - 1] = i - 1
+            i, j = i - 1, j - 1
+        elif score[i][j] == score[i - 1][j]:
+            i -= 1
+        else:
+            j -= 1
+
+    matched = [j for j in range(m) if owner[j] is not None]
+    if not matched:
+        return final, [[] for _ in draft], []
+    first, last = matched[0], matched[-1]
+    groups = [[] for _ in draft]
+    current = owner[first]
+    for j in range(first, last + 1):
+        if owner[j] is not None:
+            current = owner[j]
+        groups[current].append(final[j])  # unaligned paragraphs join the one above
+    return final[:first], groups, final[last + 1:]
+
+
+# ── Planning a patch ─────────────────────────────────────────────────
+class Hunk:
+    """A run of new draft paragraphs to edit, plus what they replace."""
+
+    __slots__ = ("draft", "previous")
+
+    def __init__(self, draft, previous):
+        self.draft = draft        # new draft paragraphs
+        self.previous = previous  # old final paragraphs they replace
+
+
+class Patch:
+    """Old final paragraphs and Hunks, in output order."""
+
+    def __init__(self, pieces, total):
+        self.pieces = pieces      # str (kept paragraph) or Hunk
+        self.total = total        # paragraphs in the new draft
+
+    @property
+    def hunks(self):
+        return [p for p in self.pieces if isinstance(p, Hunk)]
+
+    @property
+    def changed(self):
+        return sum(len(h.draft) for h in self.hunks)
+
+    @property
+    def changed_share(self):
+        return self.changed / self.total if self.total else 0.0
+
+    def neighbours(self, hunk):
+        """The kept paragraphs just before and after `hunk`."""
+        index = self.pieces.index(hunk)
+        before = next((p for p in reversed(self.pieces[:index]) if isinstance(p, str)), "")
+        after = next((p for p in self.pieces[index + 1:] if isinstance(p, str)), "")
+        return before, after
+
+    def apply(self, edits):
+        """The patched final text; `edits` holds one string per hunk."""
+        edits = iter(edits)
+        return join_paragraphs(next(edits) if isinstance(p, Hunk) else p for p in self.pieces)
+
+
+def plan(old_draft, new_draft, old_final):
+    old_paragraphs = split_paragraphs(old_draft)
+    new_paragraphs = split_paragraphs(new_draft)
+    prefix, groups, suffix = align(old_paragraphs, split_paragraphs(old_final))
+
+    pieces = list(prefix)
+    matcher = difflib.SequenceMatcher(
+        None, [_normalise(p) for p in old_paragraphs], [_normalise(p) for p in new_paragraphs],
+        autojunk=False,
+    )
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        previous = [p for group in groups[i1:i2] for p in group]
+        if op == "equal":
+            pieces.extend(previous)
+        elif op in ("replace", "insert"):
+            pieces.append(Hunk(new_paragraphs[j1:j2], previous))
+        # "delete": the draft dropped these paragraphs, so does the final
+    pieces.extend(suffix)
+    return Patch(pieces, len(new_paragraphs))
+
+
+# ── Talking to the editor ────────────────────────────────────────────
+def edit_prompt(task_header, patch):
+    """`task_header` is the task's usual prompt, without its context."""
+    parts = [
+        task_header,
+        "The draft changed since you last edited it. Below are ONLY the changed "
+        "passages. Edit each one by the same rules; the surrounding paragraphs "
+        "are already edited and are shown for tone and continuity only.",
+    ]
+    for number, hunk in enumerate(patch.hunks, 1):
+        before, after = patch.neighbours(hunk)
+        parts.append(f"── Passage {number} ──")
+        if before:
+            parts.append(f"(paragraph before, do not return it)\n{before}")
+        if hunk.previous:
+            parts.append("(your previous edit of this passage)\n" + join_paragraphs(hunk.previous))
+        parts.append("(new draft — edit this)\n" + join_paragraphs(hunk.draft))
+        if after:
+            parts.append(f"(paragraph after, do not return it)\n{after}")
+    markers = "\n...\n".join(f"<<<{n}>>>" for n in range(1, len(patch.hunks) + 1))
+    parts.append(
+        "Return every edited passage in order, each under its marker line, "
+        f"as your Final Answer:\n{markers}"
+    )
+    return "\n\n".join(parts)
+
+
+def parse_edits(text, count):
+    """Edited passages by marker, or None when the answer is not usable."""
+    found = list(_MARKER.finditer(text or ""))
+    if [int(m.group(1)) for m in found] != list(range(1, count + 1)):
+        return None
+    edits = []
+    for index, match in enumerate(found):
+        end = found[index + 1].start() if index + 1 < len(found) else len(text)
+        body = text[match.end():end].strip()
+        if not body:
+            return None
+        edits.append(body)
+    return edits
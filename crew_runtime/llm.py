@@ -0,0 +1,181 @@
+"""
+============================================================
+  crew_runtime.llm  |  One small interface for every model
+============================================================
+
+The lessons hand crewai three different kinds of model objects:
+
+  • langchain ChatOpenAI        → has .invoke(messages)
+  • crewai LLM (newer versions) → has .call(messages)
+  • a plain function            → fn(messages) -> str
+
+The runtime only ever calls client.complete(messages, stop=None)
+and gets back an LLMResponse. as_llm() wraps whatever the lesson
+used. FakeLLM answers from a script so crews can run offline.
+
+kickoff_async() awaits client.acomplete(messages) when a client has
+it (langchain's ainvoke, an `async def` function, FakeLLM's
+asyncio.sleep); cancelling the run cancels that call. Clients with
+only complete() are run on a worker thread instead.
+
+Messages are plain dicts:  {"role": "system"|"user"|"assistant",
+                            "content": "..."}
+============================================================
+"""
+
+import asyncio
+import inspect
+import itertools
+import threading
+import time
+
+
+class LLMResponse:
+    """Text returned by a model call plus what it cost."""
+
+    __slots__ = ("text", "model", "prompt_tokens", "completion_tokens", "latency")
+
+    def __init__(self, text, model=None, prompt_tokens=0, completion_tokens=0, latency=0.0):
+        self.text = text
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.latency = latency
+
+    def __repr__(self):
+        return f"LLMResponse(model={self.model!r}, text={self.text[:40]!r})"
+
+
+def model_name(obj, default=None):
+    """Best-effort model name of a langchain / crewai / runtime client."""
+    for attr in ("model", "model_name"):
+        value = getattr(obj, attr, None)
+        if isinstance(value, str):
+            return value
+    return default
+
+
+# ── Adapters ─────────────────────────────────────────────────────────
+class LangChainLLM:
+    """Wraps a langchain chat model (ChatOpenAI, ...)."""
+
+    _ROLES = {"system": "system", "user": "human", "assistant": "ai"}
+
+    def __init__(self, chat_model):
+        self.chat_model = chat_model
+        self.model = model_name(chat_model, "unknown")
+
+    def _messages(self, messages):
+        return [(self._ROLES.get(m["role"], m["role"]), m["content"]) for m in messages]
+
+    def complete(self, messages, stop=None):
+        start = time.perf_counter()
+        return self._response(self.chat_model.invoke(self._messages(messages), stop=stop), start)
+
+    async def acomplete(self, messages, stop=None):
+        start = time.perf_counter()
+        return self._response(await self.chat_model.ainvoke(self._messages(messages), stop=stop), start)
+
+    def _response(self, result, start):
+        usage = getattr(result, "usage_metadata", None) or {}
+        if not usage:
+            token_usage = (getattr(result, "response_metadata", None) or {}).get("token_usage") or {}
+            usage = {
+                "input_tokens": token_usage.get("prompt_tokens", 0),
+                "output_tokens": token_usage.get("completion_tokens", 0),
+            }
+        return LLMResponse(
+            text=result.content if hasattr(result, "content") else str(result),
+            model=self.model,
+            prompt_tokens=usage.get("input_tokens", 0),
+            completion_tokens=usage.get("output_tokens", 0),
+            latency=time.perf_counter() - start,
+        )
+
+
+class CallableLLM:
+    """Wraps fn(messages) -> str (or -> LLMResponse)."""
+
+    def __init__(self, fn, model="callable"):
+        self.fn = fn
+        self.model = model
+
+    def complete(self, messages, stop=None):
+        start = time.perf_counter()
+        return self._response(self.fn(messages), start)
+
+    async def acomplete(self, messages, stop=None):
+        start = time.perf_counter()
+        if inspect.iscoroutinefunction(self.fn):
+            return self._response(await self.fn(messages), start)
+        return self._response(await asyncio.to_thread(self.fn, messages), start)
+
+    def _response(self, result, start):
+        if isinstance(result, LLMResponse):
+            return result
+        return LLMResponse(str(result), model=self.model, latency=time.perf_counter() - start)
+
+
+class FakeLLM:
+    """Offline model for demos, tests and benchmarks.
+
+        FakeLLM(["Final Answer: done"])                # scripted, cycles
+        FakeLLM(respond=lambda messages: "...")        # computed
+        FakeLLM(latency=0.2)                           # simulated network time
+    """
+
+    def __init__(self, responses=None, respond=None, latency=0.0, model="fake"):
+        self._responses = itertools.cycle(responses) if responses else None
+        self._respond = respond
+        self.latency = latency
+        self.model = model
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages, stop=None):
+        start = time.perf_counter()
+        scripted = self._next()
+        if self.latency:
+            time.sleep(self.latency)
+        return self._answer(messages, scripted, start)
+
+    async def acomplete(self, messages, stop=None):
+        start = time.perf_counter()
+        scripted = self._next()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._answer(messages, scripted, start)
+
+    def _next(self):
+        with self._lock:
+            self.calls += 1
+            return next(self._responses) if self._responses else None
+
+    def _answer(self, messages, scripted, start):
+        if self._respond is not None:
+            text = self._respond(messages)
+        elif scripted is not None:
+            text = scripted
+        else:
+            text = "Thought: I now can give a great answer\nFinal Answer: " + messages[-1]["content"][:200]
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        return LLMResponse(
+            text,
+            model=self.model,
+            prompt_tokens=prompt_chars // 4,
+            completion_tokens=len(text) // 4,
+            latency=time.perf_counter() - start,
+        )
+
+
+def as_llm(obj):
+    """Return a runtime client (something with .complete) for `obj`."""
+    if obj is None or hasattr(obj, "complete"):
+        return obj
+    if hasattr(obj, "invoke"):
+        return LangChainLLM(obj)
+    if hasattr(obj, "call"):
+        return CallableLLM(obj.call, model=model_name(obj, "crewai"))
+    if callable(obj):
+        return CallableLLM(obj)
+    raise TypeError(f"Cannot use {type(obj).__name__} as an LLM")
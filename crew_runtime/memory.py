@@ -0,0 +1,147 @@
+"""
+crew_runtime.memory — short-term memory handle for one run.
+
+Lesson 2 turns on memory=True so later agents can recall what
+earlier ones produced. Each run gets its own RunMemory (never
+shared between kickoffs); items are ranked against the task text by
+plain word overlap, which needs no embedding call.
+
+Tasks with async_execution=True run at the same time and write to
+the same RunMemory, so writers never share a lock:
+
+  segments   one append-only list per agent; save() appends to the
+             writer's own segment (a list append, atomic in CPython)
+  snapshot   a task reads memory.snapshot() taken when it starts:
+             the merged index plus each segment up to its length at
+             that moment, so later writes never change what it sees
+  merge      every `merge_every` writes (and when parallel tasks
+             join) the unmerged tails are folded, in write order,
+             into a new word index, built aside and published by
+             swapping one reference; readers keep whichever index
+             they started on
+"""
+
+import itertools
+import re
+import threading
+from collections import Counter
+
+_WORD = re.compile(r"\w{3,}", re.UNICODE)
+
+
+def _words(text):
+    return frozenset(w.lower() for w in _WORD.findall(text or ""))
+
+
+class MemoryItem:
+    __slots__ = ("agent", "task", "text", "words", "seq")
+
+    def __init__(self, agent, task, text, seq=0):
+        self.agent = agent
+        self.task = task
+        self.text = text
+        self.words = _words(text)
+        self.seq = seq               # write order across all segments
+
+
+class _Merged:
+    """Immutable merged state: items, word → item positions, merged length per segment."""
+
+    __slots__ = ("items", "index", "offsets")
+
+    def __init__(self, items, index, offsets):
+        self.items = items
+        self.index = index
+        self.offsets = offsets
+
+
+class MemorySnapshot:
+    """What one task may read, fixed when it was taken."""
+
+    __slots__ = ("merged", "tail")
+
+    def __init__(self, merged, tail):
+        self.merged = merged
+        self.tail = tail             # items written since the last merge
+
+    def search(self, query, limit=3, exclude=()):
+        """Items sharing the most words with `query`, best first (oldest first on ties)."""
+        wanted = _words(query)
+        items = self.merged.items
+        overlap = Counter()
+        for word in wanted:
+            for position in self.merged.index.get(word, ()):
+                overlap[position] += 1
+        scored = [(n, items[position]) for position, n in overlap.items()]
+        scored += [(len(wanted & item.words), item) for item in self.tail]
+        scored = [(n, item) for n, item in scored if n and item.text not in exclude]
+        scored.sort(key=lambda entry: (-entry[0], entry[1].seq))
+        return [item for _, item in scored[:limit]]
+
+    def __len__(self):
+        return len(self.merged.items) + len(self.tail)
+
+
+class RunMemory:
+    """Per-agent append-only segments with snapshot reads and a merged index."""
+
+    def __init__(self, merge_every=32):
+        self.merge_every = merge_every
+        self._segments = {}          # agent → [MemoryItem], appended by that agent's tasks
+        self._seq = itertools.count()
+        self._merged = _Merged((), {}, {})
+        self._new_segment = threading.Lock()   # taken once per agent, never per write
+        self._merging = threading.Lock()       # serialises merges only
+
+    def save(self, agent, task, text):
+        item = MemoryItem(agent, task, text, next(self._seq))
+        segment = self._segments.get(agent)
+        if segment is None:
+            with self._new_segment:
+                segment = self._segments.setdefault(agent, [])
+        segment.append(item)
+        if (item.seq + 1) % self.merge_every == 0:
+            self.merge(blocking=False)  # a merge already running will be followed by the next one
+        return item
+
+    def snapshot(self):
+        merged = self._merged
+        tail = []
+        for agent, segment in list(self._segments.items()):
+            tail.extend(segment[merged.offsets.get(agent, 0):])
+        return MemorySnapshot(merged, tuple(tail))
+
+    def merge(self, blocking=True):
+        """Fold every segment's unmerged tail into a new index; False if one is running."""
+        if not self._merging.acquire(blocking):
+            return False
+        try:
+            merged = self._merged
+            items = list(merged.items)
+            index = {word: list(positions) for word, positions in merged.index.items()}
+            offsets = dict(merged.offsets)
+            tails = []
+            for agent, segment in list(self._segments.items()):
+                end = len(segment)
+                tails.extend(segment[offsets.get(agent, 0):end])
+                offsets[agent] = end
+            # in write order, whatever order the segments were created in
+            for item in sorted(tails, key=lambda item: item.seq):
+                for word in item.words:
+                    index.setdefault(word, []).append(len(items))
+                items.append(item)
+            self._merged = _Merged(tuple(items), index, offsets)
+            return True
+        finally:
+            self._merging.release()
+
+    def search(self, query, limit=3, exclude=()):
+        return self.snapshot().search(query, limit, exclude)
+
+    @property
+    def items(self):
+        """Every item, in write order."""
+        return sorted(itertools.chain.from_iterable(list(self._segments.values())), key=lambda i: i.seq)
+
+    def __len__(self):
+        return sum(len(segment) for segment in list(self._segments.values()))
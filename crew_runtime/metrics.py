@@ -0,0 +1,268 @@
+"""
+============================================================
+  crew_runtime.metrics  |  Live metrics for running crews
+============================================================
+
+CONCEPT:
+  verbose=True prints every thought to stdout, which tells a
+  person what one crew is doing but tells nobody how a box full
+  of kickoffs is coping. CrewMetrics is an event LISTENER that
+  keeps a handful of counters and histograms:
+
+    crew_tasks_in_flight{agent}         tasks being worked on now
+    crew_runs_failed_total              kickoffs that raised
+    crew_llm_call_seconds{agent}        LLM latency histogram
+    crew_llm_tokens_total{kind}         prompt / completion tokens
+    crew_rate_limit_wait_seconds_total  time spent in RPM limiters
+    crew_tool_call_seconds{tool}        tool latency histogram
+    crew_cache_hits_total{cache}        prompt render cache,
+    crew_cache_misses_total{cache}      delegation answers
+    crew_memory_items                   memory items of live runs
+    crew_queue_depth{queue}             JobScheduler / OutputWriter
+
+  serve() exposes them on a local port, in Prometheus text format
+  at /metrics and as JSON at /metrics.json. Disabled means not
+  attached: no listener, no thread, no cost.
+
+USAGE:
+  metrics = CrewMetrics().serve(port=9464)
+  metrics.watch_scheduler(scheduler)          # optional queues
+  template.kickoff(inputs, listeners=(metrics,))
+
+  # or, in the lesson scripts:
+  CREW_METRICS_PORT=9464 python main_runtime.py
+  curl localhost:9464/metrics
+
+============================================================
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .histogram import LatencyHistogram
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class CrewMetrics:
+    """Event listener aggregating run metrics; see the module docstring."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.in_flight = Counter()         # agent role → running tasks
+        self.llm_latency = {}              # agent role → LatencyHistogram
+        self.tool_latency = {}             # tool name → LatencyHistogram
+        self.counters = Counter()
+        self.cache = Counter()             # (cache, "hits" | "misses") → n
+        self.gauges = {}                   # (name, labels) → callable
+        self._runs = {}                    # run id → RunContext of live runs
+        self._tasks = {}                   # (run id, task) → agent role of running tasks
+        self._definitions = {}             # id → [CrewDefinition, live runs, render hits, misses counted]
+        self._lock = threading.Lock()
+        self.server = None
+
+    # ── listener ──────────────────────────────────────────────────
+    def __call__(self, ctx, event, data):
+        with self._lock:
+            if ctx.run_id not in self._runs:
+                self._runs[ctx.run_id] = ctx
+                self._definitions.setdefault(id(ctx.definition), [ctx.definition, 0, 0, 0])[1] += 1
+                self.counters["runs_started"] += 1
+        if event == "llm_call":
+            role = ctx.prompts.agents[data["agent"]]["role"]
+            response = data["response"]
+            self._histogram(self.llm_latency, role).observe(response.latency or 0.0)
+            with self._lock:
+                self.counters["llm_calls"] += 1
+                self.counters["prompt_tokens"] += response.prompt_tokens or 0
+                self.counters["completion_tokens"] += response.completion_tokens or 0
+                self.counters["prompt_chars"] += data.get("prompt_chars", 0)
+                self.counters["rate_limit_wait"] += data.get("rate_limit_wait", 0.0)
+        elif event == "tool_call":
+            self._histogram(self.tool_latency, data["tool"]).observe(data["duration"])
+        elif event == "task_started":
+            role = ctx.prompts.agents[data["agent"]]["role"]
+            with self._lock:
+                self._tasks[ctx.run_id, data["task"]] = role
+                self.in_flight[role] += 1
+        elif event == "task_completed":
+            with self._lock:
+                self._tasks.pop((ctx.run_id, data["task"]), None)
+                self.in_flight[ctx.prompts.agents[data["agent"]]["role"]] -= 1
+                self.counters["tasks_completed"] += 1
+        elif event == "delegation":
+            with self._lock:
+                self.cache["delegation", "hits" if data["status"] == "repeat" else "misses"] += 1
+        elif event in ("run_completed", "run_failed"):
+            with self._lock:
+                if self._runs.pop(ctx.run_id, None) is not None:
+                    self._release(ctx.definition)
+                for key in [key for key in self._tasks if key[0] == ctx.run_id]:
+                    self.in_flight[self._tasks.pop(key)] -= 1  # tasks cut short by the failure
+                self.counters["runs_completed" if event == "run_completed" else "runs_failed"] += 1
+
+    def _release(self, definition):
+        """Count a definition's render cache stats; forget it after its last live run."""
+        entry = self._definitions[id(definition)]
+        self._count_renders(entry)
+        entry[1] -= 1
+        if not entry[1]:
+            del self._definitions[id(definition)]  # do not keep definitions (and their agents) alive
+
+    def _count_renders(self, entry):
+        prompts = entry[0].prompts
+        hits, misses = prompts.cache_hits, prompts.cache_misses
+        self.cache["prompt_render", "hits"] += hits - entry[2]
+        self.cache["prompt_render", "misses"] += misses - entry[3]
+        entry[2], entry[3] = hits, misses
+
+    def _histogram(self, table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(key, LatencyHistogram())
+        return histogram
+
+    # ── extra sources ─────────────────────────────────────────────
+    def add_gauge(self, name, fn, **labels):
+        """Read fn() at every scrape, e.g. a queue length."""
+        self.gauges[name, tuple(sorted(labels.items()))] = fn
+        return self
+
+    def watch_scheduler(self, scheduler, name="jobs"):
+        self.add_gauge("crew_queue_depth", scheduler.depth, queue=name)
+        return self.add_gauge("crew_jobs_running", lambda: scheduler.running, queue=name)
+
+    def watch_writer(self, writer, name="output_writer"):
+        return self.add_gauge("crew_queue_depth", writer.depth, queue=name)
+
+    # ── reading ───────────────────────────────────────────────────
+    def snapshot(self):
+        with self._lock:
+            for entry in self._definitions.values():
+                self._count_renders(entry)
+            runs = list(self._runs.values())
+            counters = dict(self.counters)
+            in_flight = {role: n for role, n in self.in_flight.items() if n}
+            cache = dict(self.cache)
+        elapsed = max(time.time() - self.started, 1e-9)
+        tokens = counters.get("prompt_tokens", 0) + counters.get("completion_tokens", 0)
+        return {
+            "uptime_seconds": elapsed,
+            "runs_in_flight": len(runs),
+            "tasks_in_flight": in_flight,
+            "counters": counters,
+            "tokens_per_second": tokens / elapsed,
+            "memory_items": sum(len(ctx.memory) for ctx in runs if ctx.memory is not None),
+            "cache": {f"{name}_{kind}": n for (name, kind), n in cache.items()},
+            "llm_latency": {role: h.snapshot() for role, h in list(self.llm_latency.items())},
+            "tool_latency": {tool: h.snapshot() for tool, h in list(self.tool_latency.items())},
+            "gauges": {
+                name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}": fn()
+                for (name, labels), fn in list(self.gauges.items())
+            },
+        }
+
+    def render_prometheus(self):
+        snap = self.snapshot()
+        counters = snap["counters"]
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_label(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        def histogram(name, help_text, label, table):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, snap_h in table.items():
+                cumulative = 0
+                for bound, count in snap_h["buckets"].items():
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{label}="{_label(key)}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label}="{_label(key)}"}} {snap_h["sum"]}')
+                lines.append(f'{name}_count{{{label}="{_label(key)}"}} {snap_h["count"]}')
+
+        metric("crew_runs_in_flight", "gauge", "Kickoffs currently running.", [((), snap["runs_in_flight"])])
+        metric("crew_tasks_in_flight", "gauge", "Tasks currently running, per agent.",
+               [((("agent", role),), n) for role, n in snap["tasks_in_flight"].items()])
+        metric("crew_tasks_completed_total", "counter", "Tasks completed.",
+               [((), counters.get("tasks_completed", 0))])
+        metric("crew_runs_failed_total", "counter", "Kickoffs that raised or were cancelled.",
+               [((), counters.get("runs_failed", 0))])
+        metric("crew_llm_calls_total", "counter", "LLM calls made.", [((), counters.get("llm_calls", 0))])
+        metric("crew_llm_tokens_total", "counter", "Tokens reported by the LLM.",
+               [((("kind", "prompt"),), counters.get("prompt_tokens", 0)),
+                ((("kind", "completion"),), counters.get("completion_tokens", 0))])
+        metric("crew_prompt_chars_total", "counter", "Characters sent in prompts.",
+               [((), counters.get("prompt_chars", 0))])
+        metric("crew_rate_limit_wait_seconds_total", "counter", "Time spent waiting on RPM limiters.",
+               [((), counters.get("rate_limit_wait", 0.0))])
+        metric("crew_memory_items", "gauge", "Memory items held by running kickoffs.",
+               [((), snap["memory_items"])])
+        cache = {}
+        for key, n in snap["cache"].items():
+            name, _, kind = key.rpartition("_")
+            cache.setdefault(kind, []).append(((("cache", name),), n))
+        metric("crew_cache_hits_total", "counter", "Cache hits.", cache.get("hits", []))
+        metric("crew_cache_misses_total", "counter", "Cache misses.", cache.get("misses", []))
+        histogram("crew_llm_call_seconds", "LLM call latency.", "agent", snap["llm_latency"])
+        histogram("crew_tool_call_seconds", "Tool call latency.", "tool", snap["tool_latency"])
+        by_name = {}
+        for (name, labels), fn in list(self.gauges.items()):
+            by_name.setdefault(name, []).append((labels, fn()))
+        for name, samples in by_name.items():
+            metric(name, "gauge", name.replace("_", " ") + ".", samples)
+        return "\n".join(lines) + "\n"
+
+    # ── HTTP endpoint ─────────────────────────────────────────────
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serve /metrics (Prometheus text) and /metrics.json in a daemon thread."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps(metrics.snapshot(), default=str).encode("utf-8")
+                    content_type = "application/json"
+                elif self.path.startswith("/metrics"):
+                    body = metrics.render_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # keep stdout for the crews
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, name="crew-metrics", daemon=True).start()
+        return self
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
+
+
+def metrics_from_env(variable="CREW_METRICS_PORT"):
+    """A serving CrewMetrics when the variable holds a port, else None."""
+    port = os.getenv(variable)
+    if not port:
+        return None
+    return CrewMetrics().serve(int(port))
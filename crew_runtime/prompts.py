@@ -0,0 +1,218 @@
+"""
+============================================================
+  crew_runtime.prompts  |  System prompts compiled once
+============================================================
+
+CONCEPT:
+  Every agent loop starts by building a system prompt from role,
+  goal and backstory plus one line per tool (and, for crewai tools
+  such as SerperDevTool, their argument schema) and the ReAct
+  format block. Every iteration then sends that prompt again, with
+  the whole scratchpad, and the HTTP client JSON-encodes all of it
+  again. With five agents in hierarchical.py example 2 and a batch
+  of kickoffs, the same strings are rebuilt and re-encoded
+  thousands of times.
+
+  CrewDefinition compiles its prompts when it is built:
+
+    tools      the tools section of each agent (tool lines with
+               schemas, the names list, the format block) is
+               rendered once; ToolSpec keeps its line and schema
+    system     SystemPrompts.get() returns ONE shared string per
+               distinct (rendered agent, tools): a bounded LRU, so
+               a batch of runs with the same agents reuses it
+    bytes      a MessageCache keeps the JSON encoding of long
+               message contents (bounded, keyed by their hash);
+               chat_body() joins the cached fragments, so an
+               iteration only encodes what is new (OpenAIChatLLM
+               sends its requests this way)
+
+USAGE:
+  prompt = definition.system_prompts.get(rendered_agent, tools)
+  body = chat_body({"model": "gpt-4o-mini"}, messages)
+
+  python -m crew_runtime.prompts      # per-iteration CPU, before / after
+
+============================================================
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+FORMAT_WITH_TOOLS = (
+    "\n\nUse the following format:\n\n"
+    "Thought: you should always think about what to do\n"
+    "Action: the action to take, only one name of [{names}]\n"
+    "Action Input: the input to the action, just a simple JSON object\n"
+    "Observation: the result of the action\n\n"
+    "Once all necessary information is gathered:\n\n"
+    "Thought: I now know the final answer\n"
+    "Final Answer: the final answer to the original input question"
+)
+FORMAT_WITHOUT_TOOLS = (
+    "\nTo give my best complete final answer to the task use the exact following format:\n\n"
+    "Thought: I now can give a great answer\n"
+    "Final Answer: Your final answer must be the great and the most complete as possible."
+)
+
+
+# ── Building ─────────────────────────────────────────────────────────
+def tools_section(tools):
+    """Everything after the agent's goal: tool lines and the ReAct format."""
+    if not tools:
+        return FORMAT_WITHOUT_TOOLS
+    return (
+        "\nYou ONLY have access to the following tools, and should NEVER make up "
+        "tools that are not listed here:\n\n"
+        + "\n".join(t.prompt_line() for t in tools)
+        + FORMAT_WITH_TOOLS.replace("{names}", ", ".join(t.name for t in tools))
+    )
+
+
+def system_prompt(rendered_agent, tools):
+    return (
+        f"You are {rendered_agent['role']}. {rendered_agent['backstory']}\n"
+        f"Your personal goal is: {rendered_agent['goal']}"
+        + tools_section(tools)
+    )
+
+
+class SystemPrompts:
+    """System prompts of one CrewDefinition; one shared string per distinct prompt."""
+
+    def __init__(self, agents=(), cache_size=1024):
+        self._sections = {}
+        for agent in agents:  # compile step: the static tools of every agent
+            self.section(tuple(agent.tools))
+        self.section(())
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def section(self, tools):
+        key = tuple(t.prompt_line() for t in tools)
+        section = self._sections.get(key)
+        if section is None:
+            section = self._sections[key] = tools_section(tools)
+        return section
+
+    def get(self, rendered_agent, tools=()):
+        key = (rendered_agent["role"], rendered_agent["goal"], rendered_agent["backstory"],
+               tuple(t.prompt_line() for t in tools))
+        with self._lock:
+            prompt = self._cache.get(key)
+            if prompt is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return prompt
+        prompt = (f"You are {key[0]}. {key[2]}\nYour personal goal is: {key[1]}"
+                  + self.section(tuple(tools)))
+        with self._lock:
+            self.misses += 1
+            prompt = self._cache.setdefault(key, prompt)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return prompt
+
+
+# ── Serialized messages ──────────────────────────────────────────────
+MIN_CACHED = 256             # shorter contents are cheaper to encode than to look up
+
+
+class MessageCache:
+    """JSON of long message contents, bounded to `max_chars` (0 turns it off).
+
+    Entries are keyed by role, length and hash(content), which CPython
+    stores on the str after its first use, so the cache holds only the
+    encoded fragments and never keeps a run's prompts or observations
+    alive itself.
+    """
+
+    def __init__(self, max_chars=2_000_000):
+        self.max_chars = max_chars
+        self.chars = 0
+        self._fragments = OrderedDict()   # (role, len, hash) → JSON of the message
+        self._lock = threading.Lock()
+
+    def message_json(self, message):
+        """JSON of one {"role", "content"} message; long contents are encoded once."""
+        content = message["content"]
+        if len(content) < MIN_CACHED or len(message) != 2 or not self.max_chars:
+            return json.dumps(message, ensure_ascii=False)
+        key = (message["role"], len(content), hash(content))
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                return fragment
+        fragment = json.dumps(message, ensure_ascii=False)
+        with self._lock:
+            if key not in self._fragments:
+                self._fragments[key] = fragment
+                self.chars += len(fragment)
+                while self.chars > self.max_chars:
+                    self.chars -= len(self._fragments.popitem(last=False)[1])
+        return fragment
+
+    def __len__(self):
+        return len(self._fragments)
+
+
+MESSAGES = MessageCache()    # the process-wide default; OpenAIChatLLM(message_cache=) takes another
+
+
+def message_json(message, cache=None):
+    return (MESSAGES if cache is None else cache).message_json(message)
+
+
+def chat_body(params, messages, cache=None):
+    """UTF-8 JSON of `params` plus "messages", built from cached fragments."""
+    cache = MESSAGES if cache is None else cache
+    head = json.dumps(params, ensure_ascii=False)
+    return (head[:-1] + (', "messages": [' if len(head) > 2 else '"messages": [')
+            + ", ".join(cache.message_json(m) for m in messages) + "]}").encode("utf-8")
+
+
+# ── Micro-benchmark ──────────────────────────────────────────────────
+if __name__ == "__main__":
+    import time
+
+    from .tools import ToolSpec
+
+    search = ToolSpec("Search the internet", "A tool that can be used to search the internet with a "
+                      "search_query.", None, json.dumps({"search_query": {
+                          "type": "string", "description": "Mandatory search query you want to use "
+                          "to search the internet"}}))
+    agents = [{"role": f"Agent {i}", "goal": "Plan and build the product in detail " * 3,
+               "backstory": "Seasoned engineer with a long track record of shipping. " * 12}
+              for i in range(5)]
+    tools = [search] + [ToolSpec(f"Tool {i}", "Does one specific thing well. " * 4, None) for i in range(4)]
+    history = [{"role": "user", "content": "Current Task: build the product. " * 60}]
+    for step in range(6):
+        history.append({"role": "assistant", "content": f"Thought: step {step}\nAction: Tool 1\n"
+                        'Action Input: {"q": "x"}'})
+        history.append({"role": "user", "content": "Observation: " + "result text " * 150})
+    params = {"model": "gpt-4o-mini", "temperature": 0.7}
+    iterations = 20000
+
+    def before(agent):
+        messages = [{"role": "system", "content": system_prompt(agent, tools)}] + history
+        return json.dumps(dict(params, messages=messages), ensure_ascii=False).encode("utf-8")
+
+    compiled = SystemPrompts()
+
+    def after(agent):
+        messages = [{"role": "system", "content": compiled.get(agent, tools)}] + history
+        return chat_body(params, messages)
+
+    assert json.loads(before(agents[0])) == json.loads(after(agents[0]))
+    for label, build in (("rebuild + json.dumps", before), ("compiled + cached bytes", after)):
+        start = time.process_time()
+        for i in range(iterations):
+            build(agents[i % len(agents)])
+        per_call = (time.process_time() - start) / iterations * 1e6
+        print(f"{label:<26} {per_call:8.1f} µs CPU per iteration "
+              f"({len(history) + 1} messages, {len(before(agents[0])):,} bytes)")
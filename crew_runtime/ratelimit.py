@@ -0,0 +1,58 @@
+"""
+crew_runtime.ratelimit — max_rpm guardrail shared by all runs.
+
+Lesson 2 sets max_rpm on the researcher (10/min) and on the crew
+(20/min). A requests-per-minute budget belongs to the API key, not
+to one kickoff, so a CrewDefinition owns one limiter per agent plus
+one for the crew, and every concurrent run draws from the same ones.
+"""
+
+import asyncio
+import collections
+import threading
+import time
+
+
+class RPMLimiter:
+    """Sliding 60-second window; acquire() blocks until a slot is free."""
+
+    def __init__(self, max_rpm, period=60.0):
+        self.max_rpm = max_rpm
+        self.period = period
+        self._calls = collections.deque()
+        self._cond = threading.Condition()
+
+    def _take(self, now):
+        """Record a call at `now` if a slot is free; else seconds until one is."""
+        while self._calls and now - self._calls[0] >= self.period:
+            self._calls.popleft()
+        if len(self._calls) < self.max_rpm:
+            self._calls.append(now)
+            return None
+        return self.period - (now - self._calls[0])
+
+    def acquire(self):
+        """Take one slot; returns the number of seconds spent waiting."""
+        if not self.max_rpm:
+            return 0.0
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                delay = self._take(now)
+                if delay is None:
+                    return now - start
+                self._cond.wait(delay)
+
+    async def acquire_async(self):
+        """acquire() for an event loop: waits with asyncio.sleep, not a thread."""
+        if not self.max_rpm:
+            return 0.0
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                delay = self._take(now)
+            if delay is None:
+                return now - start
+            await asyncio.sleep(delay)
@@ -0,0 +1,325 @@
+"""
+============================================================
+  crew_runtime.replay  |  Record a kickoff, replay it offline
+============================================================
+
+CONCEPT:
+  crew_run.log.txt says what each task produced, not how: which
+  prompts went out, what the model answered, what Serper returned.
+  A slow or odd production run cannot be reproduced from it.
+
+  Recorder is an event LISTENER that appends one JSON line per
+  event of a kickoff as it happens (gzip when the path ends in
+  .gz), so a process that crashes leaves the trace up to the crash:
+
+    run     crew fingerprint, inputs, baseline outputs
+    llm     agent, hash of the messages, response text, tokens,
+            latency
+    tool    agent, tool, input, output, duration
+    memory  task, which items the memory search returned
+    task    final output of each task
+
+  replay() runs the same CrewDefinition against that trace: every
+  agent's llm and tools are swapped for stubs that hand back the
+  recorded answers in order, rate limits and output files are off,
+  and nothing touches the network. Prompts are re-built by the real
+  executor and compared with the recorded hashes; any difference
+  (prompt, memory hit or task output) is a DIVERGENCE, reported
+  with the first event where it happened.
+
+  What remains of the wall time is pure orchestration: prompt
+  rendering, parsing, scratchpads, memory search, events. With
+  realtime=True the recorded LLM / tool latencies are slept
+  instead, which reproduces a production run's timeline.
+
+USAGE:
+  template.kickoff(inputs, listeners=(Recorder("traces/{run_id}.jsonl.gz"),))
+  report = replay(template, "traces/3f2c9a1b7d4e.jsonl.gz")
+  report.orchestration_seconds, report.divergences
+
+  # regression benchmark from the command line:
+  python -m crew_runtime.replay "Lesson 2 .../main_runtime.py:template" trace.jsonl.gz --repeat 20
+
+============================================================
+"""
+
+import collections
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import replace
+
+from .llm import LLMResponse
+from .runlog import ERROR, Logger
+from .tools import ToolSpec
+
+
+class ReplayError(RuntimeError):
+    """The trace does not belong to this crew, or ran out of events."""
+
+
+def messages_hash(messages):
+    digest = hashlib.sha1()
+    for message in messages:
+        digest.update(message["role"].encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(message["content"].encode("utf-8"))
+        digest.update(b"\1")
+    return digest.hexdigest()[:20]
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+# ── Recording ────────────────────────────────────────────────────────
+class Recorder:
+    """Listener writing a replayable trace per run; "{run_id}" in the path."""
+
+    def __init__(self, path="traces/{run_id}.jsonl.gz"):
+        self.path = path
+        self.paths = {}            # run id → trace file
+        self._files = {}           # run id → open trace of the live run
+        self._lock = threading.Lock()
+
+    def _add(self, ctx, entry, last=False):
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            f = self._files.get(ctx.run_id)
+            if f is None:
+                path = self.path.format(run_id=ctx.run_id)
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                f = self._files[ctx.run_id] = _open(path, "w")
+                self.paths[ctx.run_id] = path
+                header = {
+                    "type": "run", "run_id": ctx.run_id, "crew": ctx.definition.fingerprint(),
+                    "inputs": dict(ctx.inputs), "started": time.time(),
+                    "baseline": {str(i): o.raw for i, o in ctx.baseline.items()},
+                }
+                f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            f.write(line + "\n")
+            f.flush()  # on disk as it happens: a crash keeps the trace so far
+            if last:
+                del self._files[ctx.run_id]
+                f.close()
+
+    def __call__(self, ctx, event, data):
+        if event == "llm_call":
+            response = data["response"]
+            self._add(ctx, {
+                "type": "llm", "agent": data["agent"], "prompt": messages_hash(data["messages"]),
+                "text": response.text, "model": response.model,
+                "prompt_tokens": response.prompt_tokens, "completion_tokens": response.completion_tokens,
+                "latency": response.latency,
+            })
+        elif event == "tool_call":
+            self._add(ctx, {
+                "type": "tool", "agent": data["agent"], "tool": data["tool"],
+                "input": data["input"], "output": data["output"], "duration": data["duration"],
+            })
+        elif event == "memory_read":
+            self._add(ctx, {"type": "memory", "task": data["task"], "items": data["items"]})
+        elif event == "task_completed":
+            self._add(ctx, {"type": "task", "task": data["task"], "output": data["output"].raw})
+        elif event in ("run_completed", "run_failed"):
+            # a failed run is closed too: its trace shows how far it got
+            entry = {"type": "end"} if event == "run_completed" else {"type": "failed", "error": repr(data["error"])}
+            self._add(ctx, entry, last=True)
+
+
+class Trace:
+    """A recorded run, loaded from disk."""
+
+    def __init__(self, header, events):
+        self.header = header
+        self.events = events
+
+    @classmethod
+    def load(cls, path):
+        entries = []
+        with _open(path, "r") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        entries.append(json.loads(line))
+            except EOFError:  # the gzip stream of a crashed run: keep what was flushed
+                pass
+        if not entries or entries[0].get("type") != "run":
+            raise ReplayError(f"{path} is not a crew_runtime trace")
+        return cls(entries[0], entries[1:])
+
+    def of_type(self, kind):
+        return [e for e in self.events if e["type"] == kind]
+
+    @property
+    def recorded_seconds(self):
+        """LLM + tool time of the recorded run."""
+        return (sum(e["latency"] or 0.0 for e in self.of_type("llm"))
+                + sum(e["duration"] for e in self.of_type("tool")))
+
+
+# ── Replaying ────────────────────────────────────────────────────────
+class _Stubs:
+    """Recorded answers, handed out in order per agent (and tool)."""
+
+    def __init__(self, trace, realtime, divergences):
+        self.llm = collections.defaultdict(collections.deque)
+        self.tools = collections.defaultdict(collections.deque)
+        for event in trace.events:
+            if event["type"] == "llm":
+                self.llm[event["agent"]].append(event)
+            elif event["type"] == "tool":
+                self.tools[event["agent"], event["tool"].strip().lower()].append(event)
+        self.realtime = realtime
+        self.divergences = divergences
+        self.calls = 0
+        self._lock = threading.Lock()   # parallel (async_execution) tasks replay at once
+
+    def count(self):
+        """Number this LLM call across the run."""
+        with self._lock:
+            self.calls += 1
+            return self.calls
+
+    def next(self, table, key, what):
+        try:
+            return table[key].popleft()
+        except IndexError:
+            raise ReplayError(f"trace has no more {what} events for {key!r}") from None
+
+
+class _ReplayLLM:
+    def __init__(self, stubs, agent_index):
+        self.stubs = stubs
+        self.agent_index = agent_index
+        self.model = "replay"
+
+    def complete(self, messages, stop=None):
+        stubs = self.stubs
+        event = stubs.next(stubs.llm, self.agent_index, "llm")
+        call = stubs.count()
+        if messages_hash(messages) != event["prompt"]:
+            stubs.divergences.append(("prompt", self.agent_index, call))
+        if stubs.realtime and event["latency"]:
+            time.sleep(event["latency"])
+        return LLMResponse(event["text"], model=event["model"], prompt_tokens=event["prompt_tokens"],
+                           completion_tokens=event["completion_tokens"], latency=event["latency"])
+
+
+def _replay_tool(stubs, agent_index, spec):
+    key = (agent_index, spec.name.strip().lower())
+
+    def run(*args, **kwargs):
+        event = stubs.next(stubs.tools, key, "tool")
+        if stubs.realtime:
+            time.sleep(event["duration"])
+        return event["output"]
+
+    return ToolSpec(spec.name, spec.description, run, spec.schema)
+
+
+class ReplayReport:
+    __slots__ = ("result", "divergences", "orchestration_seconds", "recorded_seconds", "llm_calls")
+
+    def __init__(self, result, divergences, orchestration_seconds, recorded_seconds, llm_calls):
+        self.result = result
+        self.divergences = divergences      # [(kind, where, detail)], empty when identical
+        self.orchestration_seconds = orchestration_seconds
+        self.recorded_seconds = recorded_seconds
+        self.llm_calls = llm_calls
+
+    def __repr__(self):
+        return (f"ReplayReport(llm_calls={self.llm_calls}, orchestration={self.orchestration_seconds:.4f}s, "
+                f"recorded={self.recorded_seconds:.2f}s, divergences={len(self.divergences)})")
+
+
+def replay(definition, trace, realtime=False, strict=False):
+    """Re-run `definition` against a recorded trace (path or Trace); returns a ReplayReport.
+
+    strict=True raises ReplayError at the first divergence instead of
+    collecting them.
+    """
+    from .definition import TaskOutput
+
+    if not isinstance(trace, Trace):
+        trace = Trace.load(trace)
+    if trace.header["crew"] != definition.fingerprint():
+        raise ReplayError("the trace was recorded for a different crew")
+
+    divergences = []
+    stubs = _Stubs(trace, realtime, divergences)
+
+    def offline(index, agent):
+        tools = tuple(_replay_tool(stubs, index, tool) for tool in agent.tools)
+        return replace(agent, llm=_ReplayLLM(stubs, index), tools=tools, max_rpm=None)
+
+    count = len(definition.agents)
+    offline_definition = definition.derive(
+        agents=[offline(i, a) for i, a in enumerate(definition.agents)],
+        manager=offline(count, definition.manager) if definition.manager is not None else None,
+        tasks=[replace(t, output_file=None) for t in definition.tasks],
+        max_rpm=None, output_log_file=None,
+    )
+
+    memory = collections.deque(trace.of_type("memory"))
+    outputs = {e["task"]: e["output"] for e in trace.of_type("task")}
+
+    def check(ctx, event, data):
+        found = None
+        if event == "memory_read":
+            expected = memory.popleft() if memory else None
+            if expected is None or [list(i) for i in data["items"]] != expected["items"]:
+                found = ("memory", data["task"], data["items"])
+        elif event == "task_completed":
+            if outputs.get(data["task"]) != data["output"].raw:
+                found = ("output", data["task"], data["output"].raw[:200])
+        if found is not None:
+            divergences.append(found)
+        if strict and divergences:
+            raise ReplayError(f"replay diverged: {divergences[0]}")
+
+    baseline = {int(i): TaskOutput(int(i), None, None, raw) for i, raw in trace.header["baseline"].items()}
+    start = time.perf_counter()
+    with Logger(level=ERROR, sinks=[]) as quiet:
+        result = offline_definition.kickoff(trace.header["inputs"], listeners=(check,),
+                                            baseline=baseline or None, logger=quiet)
+    elapsed = time.perf_counter() - start
+    if strict and divergences:
+        raise ReplayError(f"replay diverged: {divergences[0]}")
+    return ReplayReport(result, divergences, elapsed, trace.recorded_seconds, stubs.calls)
+
+
+# ── Command line ─────────────────────────────────────────────────────
+def main(argv=None):
+    """python -m crew_runtime.replay <crew spec> <trace> [--repeat N] [--realtime]"""
+    from .workflow import as_definition, load_crew
+
+    args = list(sys.argv[1:] if argv is None else argv)
+    if len(args) < 2:
+        print(main.__doc__)
+        return 2
+    repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else 1
+    definition = as_definition(load_crew(args[0]))
+    trace = Trace.load(args[1])
+    timings = []
+    for _ in range(repeat):
+        report = replay(definition, trace, realtime="--realtime" in args)
+        timings.append(report.orchestration_seconds)
+        if report.divergences:
+            print(f"diverged: {report.divergences[0]}")
+            return 1
+    timings.sort()
+    print(f"{report.llm_calls} llm calls, recorded LLM+tool time {report.recorded_seconds:.2f}s")
+    print(f"replay x{repeat}: best {timings[0] * 1000:.2f} ms, "
+          f"median {timings[len(timings) // 2] * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
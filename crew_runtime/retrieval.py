@@ -0,0 +1,356 @@
+"""
+============================================================
+  crew_runtime.retrieval  |  Local index over past outputs
+============================================================
+
+CONCEPT:
+  research_output.md, final_blog.md and Lesson 1's
+  output_<topic>.md pile up, and a new run on an overlapping topic
+  searches the web and re-researches all of it again.
+
+  OutputIndex keeps every past output in one SQLite file
+  (.crew_index/outputs.sqlite3), split into ~800-character chunks:
+
+    full text  an FTS5 table ranked with BM25
+    vectors    one embedding per chunk: local feature hashing by
+               default, or OpenAIEmbedder for real semantics
+    search     both rankings merged by reciprocal rank fusion;
+               each hit carries its age and how many of the
+               query's words it covers
+
+  It is updated incrementally: scan() re-indexes only files whose
+  mtime changed, and as a LISTENER it indexes every task output the
+  moment the task completes (listener_for(tasks) only those tasks':
+  index research, not the blog posts written from it, or the
+  researcher gets LLM prose back as "earlier research").
+
+  in_front_of(tool) wraps the web search tool under the same name,
+  so the researcher consults the index before every search: when
+  enough fresh chunks cover the query, they are served directly
+  (no Serper call, and usually fewer ReAct iterations); otherwise
+  the real search runs and its results are indexed for next time.
+
+USAGE:
+  index = OutputIndex()
+  index.scan(["research_output.md"])
+  search = index.in_front_of(SerperSearchTool(pool), max_age=7 * 86400)
+  template = CrewDefinition.from_crew(crew, tools={search.name: search})
+  template.kickoff(inputs, listeners=(index.listener_for([0]),))   # the research task
+
+============================================================
+"""
+
+import glob
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+
+from .tools import ToolSpec
+
+DEFAULT_PATH = os.path.join(".crew_index", "outputs.sqlite3")
+CHUNK_CHARS = 800
+RRF_K = 60      # reciprocal rank fusion constant
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_STOP = frozenset(
+    "a an the and or of to in on for with by is are was were be been this that these those "
+    "it its as at from about into over what which who how why when latest new".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source     TEXT PRIMARY KEY,
+    mtime      REAL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id       INTEGER PRIMARY KEY,
+    source   TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text     TEXT NOT NULL,
+    created  REAL NOT NULL,
+    vector   BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_source ON chunks (source);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(text, tokenize='unicode61 remove_diacritics 2');
+"""
+
+
+def terms(text):
+    return [w for w in (m.lower() for m in _WORD.findall(text or "")) if w not in _STOP]
+
+
+def chunk_text(text, size=CHUNK_CHARS):
+    """Paragraphs packed into chunks of about `size` characters."""
+    chunks, current = [], ""
+    for paragraph in re.split(r"\n\s*\n", text or ""):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) > size:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+        while len(current) > size * 2:  # one huge paragraph
+            chunks.append(current[:size])
+            current = current[size:]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class HashingEmbedder:
+    """Local, dependency-free vectors: signed feature hashing of words and word pairs."""
+
+    def __init__(self, dim=256):
+        self.dim = dim
+
+    def embed(self, texts):
+        vectors = []
+        for text in texts:
+            words = terms(text)
+            vector = [0.0] * self.dim
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+                vector[h % self.dim] += 1.0 if h >> 63 else -1.0
+            vectors.append(vector)
+        return vectors
+
+
+def _normalise(vector):
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return array("f", (x / norm for x in vector))
+
+
+class Hit:
+    __slots__ = ("source", "text", "score", "age", "coverage")
+
+    def __init__(self, source, text, score, age, coverage):
+        self.source = source
+        self.text = text
+        self.score = score          # reciprocal rank fusion of BM25 + vector ranks
+        self.age = age              # seconds since the chunk was indexed
+        self.coverage = coverage    # share of the query's words found in the chunk
+
+    def __repr__(self):
+        return f"Hit({self.source!r}, score={self.score:.4f}, coverage={self.coverage:.2f})"
+
+
+def _age_text(seconds):
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h"
+    return f"{int(seconds // 86400)} days"
+
+
+class OutputIndex:
+    """SQLite FTS5 + vector index over task outputs; safe to share between threads."""
+
+    def __init__(self, path=DEFAULT_PATH, embedder=None):
+        self.path = path
+        self.embedder = embedder or HashingEmbedder()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._vectors = None   # chunk id → normalised vector, loaded on first search
+        self.stats = {"served": 0, "passed_through": 0}
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ── indexing ──────────────────────────────────────────────────
+    def add(self, source, text, mtime=None):
+        """(Re-)index one source; returns False when it is unchanged."""
+        conn = self._conn()
+        row = conn.execute("SELECT mtime FROM sources WHERE source=?", (source,)).fetchone()
+        if row is not None and mtime is not None and row[0] == mtime:
+            return False
+        chunks = chunk_text(text)
+        vectors = [_normalise(v) for v in self.embedder.embed(chunks)] if chunks else []
+        now = time.time()
+        with self._lock, conn:
+            old = [r[0] for r in conn.execute("SELECT id FROM chunks WHERE source=?", (source,))]
+            if old:
+                marks = ",".join("?" * len(old))
+                conn.execute(f"DELETE FROM chunks WHERE id IN ({marks})", old)
+                conn.execute(f"DELETE FROM chunks_fts WHERE rowid IN ({marks})", old)
+            added = {}
+            for position, (chunk, vector) in enumerate(zip(chunks, vectors)):
+                cursor = conn.execute(
+                    "INSERT INTO chunks (source, position, text, created, vector) VALUES (?, ?, ?, ?, ?)",
+                    (source, position, chunk, now, vector.tobytes()),
+                )
+                conn.execute("INSERT INTO chunks_fts (rowid, text) VALUES (?, ?)", (cursor.lastrowid, chunk))
+                added[cursor.lastrowid] = vector
+            conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (source, mtime, now))
+            if self._vectors is not None:
+                for chunk_id in old:
+                    self._vectors.pop(chunk_id, None)
+                self._vectors.update(added)
+        return True
+
+    def scan(self, patterns):
+        """Index files matching the glob patterns; unchanged files are skipped."""
+        changed = 0
+        for pattern in [patterns] if isinstance(patterns, str) else patterns:
+            for path in glob.glob(pattern):
+                if not os.path.isfile(path):
+                    continue
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+                changed += self.add(os.path.abspath(path), text, os.path.getmtime(path))
+        return changed
+
+    def listener(self, ctx, event, data):
+        """Index each task output as soon as the task completes."""
+        if event == "task_completed":
+            output = data["output"]
+            self.add(f"run:{ctx.run_id}/{output.name or output.task}", output.raw)
+
+    def listener_for(self, tasks):
+        """listener() for the outputs of these tasks only (indexes or names)."""
+        wanted = set(tasks)
+
+        def listener(ctx, event, data):
+            if event == "task_completed" and (data["output"].task in wanted or data["output"].name in wanted):
+                self.listener(ctx, event, data)
+
+        return listener
+
+    def count(self, key):
+        with self._lock:  # searches run on many agent threads at once
+            self.stats[key] += 1
+
+    # ── searching ─────────────────────────────────────────────────
+    def _load_vectors(self):
+        with self._lock:
+            if self._vectors is None:
+                vectors = {}
+                for chunk_id, blob in self._conn().execute("SELECT id, vector FROM chunks"):
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    vectors[chunk_id] = vector
+                self._vectors = vectors
+            return dict(self._vectors)
+
+    def _vector_ranking(self, query, limit):
+        vectors = self._load_vectors()
+        if not vectors:
+            return []
+        wanted = _normalise(self.embedder.embed([query])[0])
+        # chunks embedded by another embedder (another size) are left to BM25
+        ids = [i for i, vector in vectors.items() if len(vector) == len(wanted)]
+        if not ids:
+            return []
+        try:
+            import numpy
+        except ImportError:
+            scores = [sum(a * b for a, b in zip(wanted, vectors[i])) for i in ids]
+        else:
+            matrix = numpy.frombuffer(b"".join(vectors[i].tobytes() for i in ids), dtype=numpy.float32)
+            scores = (matrix.reshape(len(ids), -1) @ numpy.frombuffer(wanted.tobytes(), dtype=numpy.float32)).tolist()
+        ranked = sorted(zip(scores, ids), reverse=True)[:limit]
+        return [chunk_id for score, chunk_id in ranked if score > 0]
+
+    def _bm25_ranking(self, words, limit):
+        if not words:
+            return []
+        match = " OR ".join(f'"{w}"' for w in sorted(set(words)))
+        rows = self._conn().execute(
+            "SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts) LIMIT ?",
+            (match, limit),
+        )
+        return [r[0] for r in rows]
+
+    def search(self, query, limit=5, max_age=None, candidates=50):
+        """Best chunks for `query`: BM25 and vector rankings fused."""
+        words = terms(query)
+        fused = {}
+        for ranking in (self._bm25_ranking(words, candidates), self._vector_ranking(query, candidates)):
+            for rank, chunk_id in enumerate(ranking):
+                fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+        if not fused:
+            return []
+        best = sorted(fused, key=fused.get, reverse=True)
+        marks = ",".join("?" * len(best))
+        rows = {r[0]: r[1:] for r in self._conn().execute(
+            f"SELECT id, source, text, created FROM chunks WHERE id IN ({marks})", best)}
+        now = time.time()
+        wanted = set(words)
+        hits = []
+        for chunk_id in best:
+            if chunk_id not in rows:
+                continue
+            source, text, created = rows[chunk_id]
+            if max_age is not None and now - created > max_age:
+                continue
+            coverage = len(wanted & set(terms(text))) / len(wanted) if wanted else 0.0
+            hits.append(Hit(source, text, fused[chunk_id], now - created, coverage))
+            if len(hits) == limit:
+                break
+        return hits
+
+    def format(self, hits):
+        return "\n---\n".join(
+            f"Source: {hit.source} (indexed {_age_text(hit.age)} ago)\n{hit.text}" for hit in hits
+        )
+
+    # ── as tools ──────────────────────────────────────────────────
+    def tool(self, limit=4, max_age=None):
+        """A tool the researcher can call explicitly ("Search previous research")."""
+        def run(search_query="", **kwargs):
+            hits = self.search(search_query or kwargs.get("query", ""), limit, max_age)
+            return self.format(hits) if hits else "Nothing relevant in earlier research."
+
+        return ToolSpec(
+            "Search previous research",
+            "Search the outputs of earlier research and blog runs before searching the internet. "
+            "Input is a JSON object with a search_query key.",
+            run,
+        )
+
+    def in_front_of(self, tool, max_age=7 * 86400, min_coverage=0.8, min_hits=2, limit=4):
+        """`tool` (a web search) that answers from the index when it can."""
+        return _CachedSearch(self, tool, max_age, min_coverage, min_hits, limit)
+
+
+class _CachedSearch:
+    """Same name and description as the wrapped search tool."""
+
+    def __init__(self, index, tool, max_age, min_coverage, min_hits, limit):
+        self.index = index
+        self.inner = tool
+        self.name = tool.name
+        self.description = tool.description
+        self.args_schema = getattr(tool, "args_schema", None)
+        self.max_age = max_age
+        self.min_coverage = min_coverage
+        self.min_hits = min_hits
+        self.limit = limit
+
+    def run(self, search_query="", **kwargs):
+        query = search_query or kwargs.get("query", "")
+        hits = [h for h in self.index.search(query, self.limit, self.max_age)
+                if h.coverage >= self.min_coverage]
+        if len(hits) >= self.min_hits:
+            self.index.count("served")
+            return "From earlier research (no web search needed):\n" + self.index.format(hits)
+        self.index.count("passed_through")
+        result = str(self.inner.run(search_query=query, **kwargs))
+        self.index.add(f"search:{query.strip().lower()}", result.replace("\n---\n", "\n\n"))
+        return result
@@ -0,0 +1,209 @@
+"""
+============================================================
+  crew_runtime.routing  |  Per-agent model tiering
+============================================================
+
+CONCEPT:
+  Every Lesson 2 agent shares one gpt-4o-mini client, and in
+  hierarchical.py every worker uses the same default model while
+  the manager uses gpt-4o. The editor only fixes grammar; it does
+  not need the researcher's tier.
+
+  ModelRouter picks a model per agent CALL from a declared policy:
+
+    ModelTier     a model + its price and a quality rank
+    AgentPolicy   min_quality, max_latency, max_cost per call,
+                  validators for the final answer and an
+                  optional validate(text) check
+
+  The router starts each call on the cheapest tier that meets the
+  policy (using the observed p95 latency of every tier), and moves
+  one tier up ONLY when the answer is rejected: empty, a Final
+  Answer failing the policy's validators, or validate() → False.
+  apply() gives each agent the validators of its task (the same
+  crew_runtime.validators checks that drive repair prompts), so a
+  draft the small model gets wrong is retried one tier up before
+  any repair round. Every call is timed into a per-tier latency
+  histogram; kickoff_async() awaits the tier's acomplete().
+
+USAGE:
+  router = ModelRouter(
+      [ModelTier("mini", ChatOpenAI(model="gpt-4o-mini"), quality=1,
+                 input_cost=0.15, output_cost=0.60),
+       ModelTier("4o", ChatOpenAI(model="gpt-4o"), quality=3,
+                 input_cost=2.50, output_cost=10.0)],
+      policies={"Senior Content Editor": AgentPolicy(max_quality=1)},
+  )
+  template = router.apply(CrewDefinition.from_crew(crew))
+
+  Prices are USD per 1M tokens. FakeLLM(latency=...) tiers make
+  the whole thing testable offline.
+============================================================
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from .definition import HIERARCHICAL
+from .executor import parse_step
+from .histogram import LatencyHistogram
+from .llm import as_llm
+from .validators import validate
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    name: str
+    llm: object
+    quality: int = 1
+    input_cost: float = 0.0    # USD per 1M prompt tokens
+    output_cost: float = 0.0   # USD per 1M completion tokens
+
+
+@dataclass(frozen=True)
+class AgentPolicy:
+    min_quality: int = 0
+    max_quality: int = None        # cap escalation (None → any tier)
+    max_latency: float = None      # seconds, compared with a tier's observed p95
+    max_cost: float = None         # USD per call, estimated before the call
+    expected_output_tokens: int = 800
+    validators: tuple = ()         # crew_runtime.validators checks on a Final Answer
+    validate: object = None        # validate(text) -> bool; False escalates (replaces the above)
+
+
+def accepts(policy, text):
+    """True when `text` may be returned without trying a higher tier."""
+    if policy.validate is not None:
+        return bool(policy.validate(text))
+    if not (text and text.strip()):
+        return False
+    if not policy.validators:
+        return True
+    final, action, _ = parse_step(text)
+    # Action steps are judged by their tool results, not by the task's format rules
+    return action is not None or not validate(final, policy.validators)
+
+
+class ModelRouter:
+    """Routes each agent call across model tiers; see the module docstring."""
+
+    def __init__(self, tiers, policies=None, default_policy=AgentPolicy()):
+        self.tiers = tuple(sorted(
+            (replace(t, llm=as_llm(t.llm)) for t in tiers),
+            key=lambda t: (t.quality, t.input_cost + t.output_cost),
+        ))
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy
+        self.latency = {t.name: LatencyHistogram() for t in self.tiers}
+        self.calls = {t.name: 0 for t in self.tiers}
+        self.escalations = {t.name: 0 for t in self.tiers}
+        self._lock = threading.Lock()
+
+    # ── selection ─────────────────────────────────────────────────
+    def ladder(self, policy):
+        """Tiers this policy may use, cheapest / lowest quality first."""
+        return [
+            t for t in self.tiers
+            if t.quality >= policy.min_quality
+            and (policy.max_quality is None or t.quality <= policy.max_quality)
+        ] or [self.tiers[-1]]
+
+    def estimate_cost(self, tier, messages, policy):
+        prompt_tokens = sum(len(m["content"]) for m in messages) / 4
+        return (prompt_tokens * tier.input_cost
+                + policy.expected_output_tokens * tier.output_cost) / 1_000_000
+
+    def first_tier(self, ladder, messages, policy):
+        for index, tier in enumerate(ladder):
+            p95 = self.latency[tier.name].quantile(0.95)
+            if policy.max_latency is not None and p95 is not None and p95 > policy.max_latency:
+                continue
+            if policy.max_cost is not None and self.estimate_cost(tier, messages, policy) > policy.max_cost:
+                continue
+            return index
+        return 0
+
+    # ── calls ─────────────────────────────────────────────────────
+    def complete(self, role, messages, stop=None):
+        policy = self.policies.get(role, self.default_policy)
+        ladder = self.ladder(policy)
+        for position in range(self.first_tier(ladder, messages, policy), len(ladder)):
+            tier = ladder[position]
+            start = time.perf_counter()
+            response = tier.llm.complete(messages, stop=stop)
+            if self._done(tier, start, policy, response, position == len(ladder) - 1):
+                return response
+        return response
+
+    async def acomplete(self, role, messages, stop=None):
+        """complete() for kickoff_async(): cancelling the caller cancels the tier's call."""
+        policy = self.policies.get(role, self.default_policy)
+        ladder = self.ladder(policy)
+        for position in range(self.first_tier(ladder, messages, policy), len(ladder)):
+            tier = ladder[position]
+            start = time.perf_counter()
+            if hasattr(tier.llm, "acomplete"):
+                response = await tier.llm.acomplete(messages, stop=stop)
+            else:
+                response = await asyncio.to_thread(tier.llm.complete, messages, stop)
+            if self._done(tier, start, policy, response, position == len(ladder) - 1):
+                return response
+        return response
+
+    def _done(self, tier, start, policy, response, last):
+        self.latency[tier.name].observe(time.perf_counter() - start)
+        with self._lock:
+            self.calls[tier.name] += 1
+        if last or accepts(policy, response.text):
+            return True
+        with self._lock:
+            self.escalations[tier.name] += 1
+        return False
+
+    def for_agent(self, role):
+        return RoutedLLM(self, role)
+
+    def apply(self, definition):
+        """A copy of `definition` whose agents all call through this router.
+
+        An agent whose policy has no validators of its own gets those of
+        the one validated task it runs; agents with several validated
+        tasks, and every agent of a hierarchical crew, escalate on empty
+        answers only.
+        """
+        checks = {}
+        for task in definition.tasks:
+            if task.validators and task.agent is not None and definition.process != HIERARCHICAL:
+                checks.setdefault(definition.agents[task.agent].role, []).append(task.validators)
+        for role, found in checks.items():
+            policy = self.policies.get(role, self.default_policy)
+            if len(found) == 1 and not policy.validators and policy.validate is None:
+                self.policies[role] = replace(policy, validators=found[0])
+        return definition.with_llms(lambda agent: self.for_agent(agent.role))
+
+    def stats(self):
+        return {
+            t.name: {
+                "calls": self.calls[t.name],
+                "escalated": self.escalations[t.name],
+                "latency": self.latency[t.name].snapshot(),
+            }
+            for t in self.tiers
+        }
+
+
+class RoutedLLM:
+    """LLM client bound to one agent role; what AgentSpec.llm holds."""
+
+    def __init__(self, router, role):
+        self.router = router
+        self.role = role
+        self.model = f"routed:{role}"
+
+    def complete(self, messages, stop=None):
+        return self.router.complete(self.role, messages, stop=stop)
+
+    async def acomplete(self, messages, stop=None):
+        return await self.router.acomplete(self.role, messages, stop=stop)
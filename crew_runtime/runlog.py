@@ -0,0 +1,319 @@
+"""
+============================================================
+  crew_runtime.runlog  |  Levelled, queued run logging
+============================================================
+
+CONCEPT:
+  verbose=True used to print() every task and final answer on the
+  agent thread, and output_log_file= opened and appended to a file
+  per line under a global lock. With kickoff_many() that is
+  terminal I/O and string formatting inside the agent loop, and
+  lines of concurrent runs interleave.
+
+  A Logger owns one queue and one background thread:
+
+    ctx.log.info("%s → %s", action, observation)
+        level check      → returns at once when filtered out
+        record           → (time, level, run, agent, format, args)
+        put_nowait()     → never blocks; a full queue drops and
+                           counts the record (logger.dropped)
+    thread
+        format           → "%" formatting happens here, not in
+                           the agent loop
+        sinks            → ConsoleSink, JSONLinesSink, TaskLogSink
+
+  Levels follow the stdlib numbers (DEBUG 10 … ERROR 40). Agents
+  and crews with verbose=True log their trace at INFO, the others
+  at DEBUG, so the default Logger (INFO, console) prints what
+  verbose used to print and Logger(level=DEBUG) traces everything.
+  output_log_file= becomes a TaskLogSink that keeps its file open
+  and writes crewai's line format.
+
+  ConsoleSink(group_runs=True) holds each run's lines until the
+  run ends, so concurrent runs never interleave on the terminal.
+
+USAGE:
+  logger = Logger(level=DEBUG, sinks=[JSONLinesSink("logs/{run_id}.jsonl")])
+  template.kickoff_many(inputs, logger=logger)
+  logger.close()                        # drain the queue
+
+============================================================
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+
+_END = "end"      # record kind marking the end of a run
+_TASK = "task"    # task status line for output_log_file
+_STOP = object()
+
+
+class Record:
+    __slots__ = ("time", "level", "run_id", "source", "msg", "args", "fields", "sinks", "kind")
+
+    def __init__(self, level, run_id, source, msg, args, fields, sinks, kind="log"):
+        self.time = time.time()
+        self.level = level
+        self.run_id = run_id
+        self.source = source
+        self.msg = msg
+        self.args = args
+        self.fields = fields
+        self.sinks = sinks
+        self.kind = kind
+
+    def message(self):
+        return self.msg % self.args if self.args else self.msg
+
+
+# ── Sinks (called on the logger thread only) ─────────────────────────
+class ConsoleSink:
+    """`[run] agent: message` lines on a stream."""
+
+    def __init__(self, stream=None, level=DEBUG, group_runs=False):
+        self.stream = stream
+        self.level = level
+        self.group_runs = group_runs
+        self._held = {}   # run id → lines waiting for the end of the run
+
+    def emit(self, record):
+        if record.kind == _END:
+            lines = self._held.pop(record.run_id, None)
+            if lines:
+                self._write("".join(lines))
+            return
+        line = f"[{record.run_id}] {record.source}: {record.message()}\n"
+        if self.group_runs:
+            self._held.setdefault(record.run_id, []).append(line)
+        else:
+            self._write(line)
+
+    def _write(self, text):
+        stream = self.stream or sys.stdout
+        stream.write(text)
+
+    def flush(self):
+        for run_id in list(self._held):
+            self._write("".join(self._held.pop(run_id)))
+        (self.stream or sys.stdout).flush()
+
+    def close(self):
+        self.flush()
+
+
+class JSONLinesSink:
+    """One JSON object per record; "{run_id}" in the path gives a file per run."""
+
+    def __init__(self, path, level=DEBUG):
+        self.path = path
+        self.level = level
+        self._files = {}
+
+    def _file(self, run_id):
+        path = self.path.format(run_id=run_id)
+        f = self._files.get(path)
+        if f is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            f = self._files[path] = open(path, "a", encoding="utf-8")
+        return f
+
+    def emit(self, record):
+        if record.kind == _END:
+            if "{run_id}" in self.path:
+                f = self._files.pop(self.path.format(run_id=record.run_id), None)
+                if f is not None:
+                    f.close()
+            return
+        f = self._file(record.run_id)
+        entry = {"ts": record.time, "level": LEVEL_NAMES.get(record.level, record.level),
+                 "run": record.run_id, "agent": record.source, "message": record.message()}
+        entry.update(record.fields)
+        f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class TaskLogSink:
+    """crewai's output_log_file format; receives the task records of its runs."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def emit(self, record):
+        if record.kind == _END:
+            self.flush()  # the run's lines are on disk when kickoff returns
+            return
+        if record.kind != _TASK:
+            return
+        fields = record.fields
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        line = (f'{datetime.fromtimestamp(record.time):%Y-%m-%d %H:%M:%S}: '
+                f'task_name="{fields["task_name"]}", task="{fields["task"]}", '
+                f'agent="{record.source}", status="{fields["status"]}"')
+        if fields.get("output") is not None:
+            line += f', output="{fields["output"]}"'
+        self._file.write(line + "\n")
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ── Logger ───────────────────────────────────────────────────────────
+class Logger:
+    """Queue + background thread in front of a list of sinks."""
+
+    def __init__(self, level=INFO, sinks=None, max_queue=100000):
+        self.level = level
+        self.sinks = list(sinks) if sinks is not None else [ConsoleSink()]
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._task_sinks = {}     # output_log_file path → TaskLogSink
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def bind(self, ctx):
+        """The RunLog of one kickoff."""
+        path = ctx.definition.output_log_file
+        extra = ()
+        if path:
+            with self._lock:
+                sink = self._task_sinks.get(path)
+                if sink is None:
+                    sink = self._task_sinks[path] = TaskLogSink(path)
+            extra = (sink,)
+        return RunLog(self, ctx.run_id, extra)
+
+    def put(self, record, block=False):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put(record, block=block)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="crew-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _loop(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is _STOP:
+                    return
+                if record.kind != _TASK and record.level >= self.level:
+                    for sink in self.sinks:
+                        if record.level >= sink.level:
+                            sink.emit(record)
+                for sink in record.sinks:
+                    sink.emit(record)
+            except Exception as exc:  # a broken sink must not stop logging
+                sys.stderr.write(f"crew_runtime.runlog: sink failed: {exc}\n")
+            finally:
+                if record is not _STOP and record.kind == _END:
+                    record.fields["done"].set()
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued record went through the sinks."""
+        if self._thread is not None:
+            self._queue.join()
+        for sink in self.sinks + list(self._task_sinks.values()):
+            sink.flush()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        for sink in self.sinks + list(self._task_sinks.values()):
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RunLog:
+    """Logger bound to one run; put on RunContext.log."""
+
+    __slots__ = ("logger", "run_id", "sinks", "level")
+
+    def __init__(self, logger, run_id, sinks=()):
+        self.logger = logger
+        self.run_id = run_id
+        self.sinks = sinks            # this run's TaskLogSink, if any
+        self.level = logger.level
+
+    def log(self, level, source, msg, *args, **fields):
+        if level < self.level:
+            return  # filtered out: no record, no formatting
+        self.logger.put(Record(level, self.run_id, source, msg, args, fields, self.sinks))
+
+    def task(self, source, **fields):
+        """A status line for output_log_file (task_name, task, status, output)."""
+        if self.sinks:
+            self.logger.put(Record(INFO, self.run_id, source, "", (), fields, self.sinks, kind=_TASK),
+                            block=True)  # never dropped
+
+    def debug(self, source, msg, *args, **fields):
+        self.log(DEBUG, source, msg, *args, **fields)
+
+    def info(self, source, msg, *args, **fields):
+        self.log(INFO, source, msg, *args, **fields)
+
+    def warning(self, source, msg, *args, **fields):
+        self.log(WARNING, source, msg, *args, **fields)
+
+    def error(self, source, msg, *args, **fields):
+        self.log(ERROR, source, msg, *args, **fields)
+
+    def end(self, timeout=5.0):
+        """Mark the run finished and wait until its records went out."""
+        done = threading.Event()
+        self.logger.put(Record(ERROR, self.run_id, None, "", (), {"done": done}, self.sinks, kind=_END),
+                        block=True)
+        done.wait(timeout)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_logger():
+    """Process-wide Logger(INFO, console), created on first use."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = Logger()
+    return _default
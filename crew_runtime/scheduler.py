@@ -0,0 +1,304 @@
+"""
+============================================================
+  crew_runtime.scheduler  |  Priorities, deadlines, admission
+============================================================
+
+CONCEPT:
+  kickoff_many() is first-come-first-served: with hundreds of
+  SEO-factory and Lesson 1 blog runs queued, one urgent blog
+  post waits behind all of them, and the shared RPM budget goes
+  to whoever asked first.
+
+  JobScheduler sits in front of kickoff:
+
+    priority   INTERACTIVE < NORMAL < BATCH (lower runs first)
+    deadline   seconds from submit; orders jobs AND their LLM
+               calls earliest-deadline-first within a class. It
+               is checked when the job leaves the queue and again
+               when a worker picks it up (DeadlineExceeded); a job
+               that has started is never stopped by its deadline
+    jobs       at most max_jobs run at once; `reserved` of those
+               slots are kept for INTERACTIVE jobs only
+    LLM calls  every call of every job passes one CallGate with a
+               shared requests-per-minute budget and a cap on
+               calls in flight; waiting calls are granted in
+               (priority, deadline) order, not arrival order
+    admission  each job's tokens are projected from earlier jobs
+               of the same crew; a job that would push the
+               projected total over the class's share of
+               token_budget is refused with AdmissionError
+
+  An interactive job therefore never waits for a batch job's
+  queue position or its LLM calls, only for calls in flight.
+
+USAGE:
+  scheduler = JobScheduler(max_jobs=16, max_rpm=500, token_budget=2_000_000)
+  urgent = scheduler.submit(blog, {"topic": "AI"}, priority=INTERACTIVE, deadline=60)
+  bulk = [scheduler.submit(seo, {"topic": t}, priority=BATCH) for t in topics]
+  urgent.result()          # CrewResult
+  scheduler.stats()        # latency per priority class
+
+============================================================
+"""
+
+import collections
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .histogram import LatencyHistogram
+
+INTERACTIVE, NORMAL, BATCH = 0, 1, 2
+CLASS_NAMES = {INTERACTIVE: "interactive", NORMAL: "normal", BATCH: "batch"}
+
+# Share of token_budget each class may fill; the rest is headroom for
+# the classes above it
+DEFAULT_SHARES = {INTERACTIVE: 1.0, NORMAL: 0.9, BATCH: 0.7}
+
+
+class AdmissionError(RuntimeError):
+    """The job would exceed the projected token budget of its class."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """The job's deadline passed before it could start."""
+
+
+# ── LLM call gate ────────────────────────────────────────────────────
+class CallGate:
+    """Shared RPM budget + in-flight cap, granted in (priority, deadline) order."""
+
+    def __init__(self, max_rpm=None, max_inflight=None, period=60.0):
+        self.max_rpm = max_rpm
+        self.max_inflight = max_inflight
+        self.period = period
+        self._calls = collections.deque()
+        self._waiting = []
+        self._inflight = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _free_in(self, now):
+        """Seconds until a call may start (0 when it may start now)."""
+        if self.max_inflight and self._inflight >= self.max_inflight:
+            return None  # woken by release()
+        while self._calls and now - self._calls[0] >= self.period:
+            self._calls.popleft()
+        if self.max_rpm and len(self._calls) >= self.max_rpm:
+            return self.period - (now - self._calls[0])
+        return 0
+
+    def acquire(self, priority=NORMAL, deadline=None):
+        """Block until this call's turn; returns the seconds spent waiting."""
+        start = time.monotonic()
+        ticket = (priority, deadline if deadline is not None else float("inf"), next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                now = time.monotonic()
+                free_in = self._free_in(now)
+                if self._waiting[0] == ticket and free_in == 0:
+                    heapq.heappop(self._waiting)
+                    self._inflight += 1
+                    self._calls.append(now)
+                    self._cond.notify_all()  # the next ticket may be able to go too
+                    return now - start
+                self._cond.wait(free_in or None)
+
+    def release(self):
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify_all()
+
+    def ticket(self, priority=NORMAL, deadline=None):
+        return _Ticket(self, priority, deadline)
+
+
+class _Ticket:
+    """Context manager put on RunContext.gate; wraps each LLM call of one job."""
+
+    __slots__ = ("gate", "priority", "deadline")
+
+    def __init__(self, gate, priority, deadline):
+        self.gate = gate
+        self.priority = priority
+        self.deadline = deadline
+
+    def __enter__(self):
+        self.gate.acquire(self.priority, self.deadline)
+        return self
+
+    def __exit__(self, *exc):
+        self.gate.release()
+
+
+# ── Jobs ─────────────────────────────────────────────────────────────
+class Job:
+    __slots__ = ("definition", "inputs", "priority", "deadline", "estimate",
+                 "run_options", "future", "submitted", "started", "tokens")
+
+    def __init__(self, definition, inputs, priority, deadline, estimate, run_options):
+        self.definition = definition
+        self.inputs = inputs
+        self.priority = priority
+        self.deadline = deadline     # absolute time.monotonic(), or None
+        self.estimate = estimate     # projected tokens
+        self.run_options = run_options
+        self.future = Future()
+        self.submitted = time.monotonic()
+        self.started = None
+        self.tokens = 0
+
+
+class JobScheduler:
+    """Priority / deadline job queue in front of CrewDefinition runs."""
+
+    def __init__(self, max_jobs=16, reserved=2, max_rpm=None, max_inflight=None,
+                 token_budget=None, default_estimate=20000, shares=None):
+        self.max_jobs = max_jobs
+        self.reserved = min(reserved, max_jobs - 1)
+        self.gate = CallGate(max_rpm, max_inflight or max_jobs)
+        self.token_budget = token_budget
+        self.default_estimate = default_estimate
+        self.shares = dict(DEFAULT_SHARES, **(shares or {}))
+        self.projected = 0                 # tokens of admitted, unfinished jobs
+        self.estimates = {}                # crew fingerprint → tokens per job (EWMA)
+        self.latency = {c: LatencyHistogram() for c in CLASS_NAMES}
+        self.queue_wait = {c: LatencyHistogram() for c in CLASS_NAMES}
+        self.counts = collections.Counter()
+        self._queue = []
+        self._running = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="crew-job")
+
+    # ── submitting ────────────────────────────────────────────────
+    def submit(self, definition, inputs=None, priority=NORMAL, deadline=None, **run_options):
+        """Queue one run; returns a Future resolving to its CrewResult.
+
+        `deadline` is in seconds from now and only applies until the job
+        starts (see the module docstring). Raises AdmissionError when the
+        job does not fit the projected token budget of its class.
+        """
+        definition.prompts.validate(inputs or {})
+        estimate = self.estimates.get(definition.fingerprint(), self.default_estimate)
+        absolute = time.monotonic() + deadline if deadline is not None else None
+        job = Job(definition, inputs, priority, absolute, estimate, run_options)
+        with self._lock:
+            if self.token_budget is not None:
+                limit = self.token_budget * self.shares.get(priority, 1.0)
+                if self.projected + estimate > limit:
+                    self.counts["rejected"] += 1
+                    raise AdmissionError(
+                        f"{CLASS_NAMES.get(priority, priority)} job needs ~{estimate} tokens; "
+                        f"{self.projected} of {int(limit)} already projected")
+            self.projected += estimate
+            key = absolute if absolute is not None else float("inf")
+            heapq.heappush(self._queue, (priority, key, next(self._seq), job))
+            self.counts["submitted"] += 1
+            self._pump()
+        return job.future
+
+    def _can_start(self, priority):
+        if priority == INTERACTIVE:
+            return self._running < self.max_jobs
+        return self._running < self.max_jobs - self.reserved
+
+    def _pump(self):
+        # Under self._lock. The heap is ordered by class first, so if its
+        # head cannot start, nothing behind it can either.
+        while self._queue and self._can_start(self._queue[0][0]):
+            job = heapq.heappop(self._queue)[3]
+            if job.deadline is not None and time.monotonic() > job.deadline:
+                self.projected -= job.estimate
+                self.counts["expired"] += 1
+                job.future.set_exception(DeadlineExceeded("deadline passed while queued"))
+                continue
+            self._running += 1
+            self._pool.submit(self._run, job)
+
+    # ── running ───────────────────────────────────────────────────
+    def _run(self, job):
+        from .executor import run_crew
+
+        job.started = time.monotonic()
+        self.queue_wait[job.priority].observe(job.started - job.submitted)
+        if job.deadline is not None and job.started > job.deadline:
+            # the pool may start a popped job late; it has not cost anything yet
+            with self._lock:
+                self._running -= 1
+                self.projected -= job.estimate
+                self.counts["expired"] += 1
+                self._pump()
+            job.future.set_exception(DeadlineExceeded("deadline passed before the job started"))
+            return
+
+        def count_tokens(ctx, event, data):
+            if event == "llm_call":
+                response = data["response"]
+                job.tokens += (response.prompt_tokens or 0) + (response.completion_tokens or 0)
+
+        options = dict(job.run_options)
+        options["listeners"] = tuple(options.get("listeners", ())) + (count_tokens,)
+        outcome = "failed"
+        try:
+            ctx = job.definition.new_run(job.inputs, **options)
+            ctx.gate = self.gate.ticket(job.priority, job.deadline)
+            result = run_crew(ctx)
+            outcome = "completed"
+        except BaseException as exc:
+            job.future.set_exception(exc)
+        else:
+            job.future.set_result(result)
+        finally:
+            self.latency[job.priority].observe(time.monotonic() - job.submitted)
+            with self._lock:
+                self.counts[outcome] += 1
+                self._running -= 1
+                self.projected -= job.estimate
+                if job.tokens:
+                    key = job.definition.fingerprint()
+                    previous = self.estimates.get(key)
+                    self.estimates[key] = job.tokens if previous is None else int(0.8 * previous + 0.2 * job.tokens)
+                self._pump()
+
+    # ── inspection / shutdown ─────────────────────────────────────
+    def depth(self):
+        """Jobs queued and not started yet."""
+        with self._lock:
+            return len(self._queue)
+
+    @property
+    def running(self):
+        """Jobs running now."""
+        with self._lock:
+            return self._running
+
+    def stats(self):
+        with self._lock:
+            counts, queued, running, projected = dict(self.counts), len(self._queue), self._running, self.projected
+        return {
+            "counts": counts,
+            "queued": queued,
+            "running": running,
+            "projected_tokens": projected,
+            "classes": {
+                name: {
+                    "latency": self.latency[c].snapshot(),
+                    "p99": self.latency[c].quantile(0.99),
+                    "queue_wait_p95": self.queue_wait[c].quantile(0.95),
+                }
+                for c, name in CLASS_NAMES.items()
+            },
+        }
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
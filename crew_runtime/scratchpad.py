@@ -0,0 +1,109 @@
+"""
+============================================================
+  crew_runtime.scratchpad  |  Bounded ReAct history
+============================================================
+
+CONCEPT:
+  Every ReAct iteration re-sends the whole transcript: Thought,
+  Action, Action Input and the full Observation of every earlier
+  step. For tech_lead or custom_manager in hierarchical.py, who
+  delegate over many steps, iteration N pays for N-1 steps, so a
+  long loop costs O(N²) prompt tokens and each call gets slower.
+
+  A ScratchpadPolicy keeps the last `keep_last` steps verbatim and
+  folds older ones into NOTES, one line each:
+
+    3. Delegate work to coworker({"task": "Estimate the backend…)
+       → The API needs three services: auth, billing and …
+
+  The notes have their own budget (`notes_tokens`); past it the
+  oldest notes are dropped and counted. The prompt therefore stops
+  growing after keep_last steps, and so does per-call latency.
+
+  Every llm_call event carries prompt_chars, so the prompt size of
+  each iteration is visible to any listener.
+
+USAGE:
+  template = CrewDefinition.from_crew(crew, scratchpad=ScratchpadPolicy(keep_last=4))
+
+============================================================
+"""
+
+import collections
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ScratchpadPolicy:
+    keep_last: int = 4          # steps sent verbatim
+    notes_tokens: int = 1500    # budget for the folded notes (≈ 4 characters / token)
+    note_chars: int = 300       # excerpt of each folded observation
+
+
+def _excerpt(text, limit):
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _thought(text):
+    head = (text or "").split("Action:", 1)[0]
+    return _excerpt(head.replace("Thought:", "", 1), 160)
+
+
+class Scratchpad:
+    """History for one agent loop: head messages + notes + recent steps."""
+
+    def __init__(self, head, policy=None):
+        self.head = list(head)
+        self.policy = policy
+        self.recent = collections.deque()   # (step, its messages)
+        self.notes = collections.deque()
+        self.notes_chars = 0
+        self.folded = 0
+        self.dropped = 0
+        self._notes_message = None
+
+    def add(self, step, messages):
+        self.recent.append((step, messages))
+        if self.policy is None:
+            return
+        while len(self.recent) > self.policy.keep_last:
+            self._fold(self.recent.popleft()[0])
+
+    def compact(self, policy):
+        """Switch to a tighter policy, folding the steps it no longer keeps."""
+        self.policy = policy
+        while len(self.recent) > policy.keep_last:
+            self._fold(self.recent.popleft()[0])
+
+    def _fold(self, step):
+        self.folded += 1
+        note = (
+            f"{self.folded}. {step.action}({_excerpt(step.action_input, 120)})"
+            f"\n   → {_excerpt(step.observation, self.policy.note_chars)}"
+        )
+        thought = _thought(step.text)
+        if thought:
+            note = f"{note}\n   (thought: {thought})"
+        self.notes.append(note)
+        self.notes_chars += len(note)
+        budget = self.policy.notes_tokens * 4
+        while self.notes and self.notes_chars > budget:
+            self.notes_chars -= len(self.notes.popleft())
+            self.dropped += 1
+        body = "\n".join(self.notes)
+        if self.dropped:
+            body = f"({self.dropped} earlier steps omitted)\n{body}"
+        self._notes_message = {
+            "role": "user",
+            "content": "Notes on your earlier steps (summarised; the latest steps follow in full):\n" + body,
+        }
+
+    def messages(self, *extra):
+        messages = list(self.head)
+        if self._notes_message is not None:
+            messages.append(self._notes_message)
+        for _, step_messages in self.recent:
+            messages.extend(step_messages)
+        messages.extend(extra)
+        return messages
@@ -0,0 +1,58 @@
+"""
+crew_runtime.strings — one copy of each repeated string per run.
+
+A hierarchical run sees the same text many times: the same search
+results returned to several agents, the same coworker answer quoted
+back, the same role and tool names on every step. Short names are
+interned process-wide (sys.intern); long texts go through a per-run
+StringTable, which hands back the copy it already holds, so a 20 KB
+observation seen ten times is stored once. The table maps each text's
+hash to a weak reference, never to the text itself: it holds no copy
+of its own, and a text nothing else in the run still uses is freed as
+usual, so a long run does not keep every observation it ever saw.
+The table lives on the RunContext and is dropped with it.
+"""
+
+import sys
+import weakref
+
+SHORT = 64  # at or below this length strings are interned instead
+
+
+class _Text(str):
+    """A str that can be weakly referenced (plain str cannot)."""
+
+    __slots__ = ("__weakref__",)
+
+
+class StringTable:
+    __slots__ = ("_refs", "saved")
+
+    def __init__(self):
+        self._refs = {}  # hash(text) → weakref to the one shared object
+        self.saved = 0   # characters not stored twice
+
+    def share(self, text):
+        """The shared object equal to `text`; `text` itself the first time."""
+        if not isinstance(text, str):
+            return text
+        if len(text) <= SHORT:
+            return sys.intern(text)
+        key = hash(text)
+        ref = self._refs.get(key)
+        shared = ref() if ref is not None else None
+        if shared is not None:
+            if shared is text:
+                return text
+            if shared == text:
+                self.saved += len(text)
+                return shared
+            return text  # a hash collision: leave this one unshared
+        if type(text) is not _Text:
+            text = _Text(text)  # the caller drops its copy for this one
+        refs = self._refs
+        refs[key] = weakref.ref(text, lambda ref: refs.get(key) is ref and refs.pop(key))
+        return text
+
+    def __len__(self):
+        return len(self._refs)
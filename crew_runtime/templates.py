@@ -0,0 +1,223 @@
+"""
+============================================================
+  crew_runtime.templates  |  Compiled {placeholder} templates
+============================================================
+
+CONCEPT:
+  Agents and tasks in every lesson embed placeholders such as
+  {topic}, {word_count}, {company} or {market} inside role, goal,
+  backstory, description and expected_output. crew.kickoff()
+  re-interpolates every one of those strings on every run, by
+  writing the result back onto the Agent / Task objects.
+
+  Here each string is parsed ONCE into a list of segments:
+
+      "Plan content on {topic}."
+          →  ("Plan content on ", <topic>, ".")
+
+  and rendering a run only joins the segments. The rendered
+  strings live in an immutable per-run view (RenderedPrompts),
+  so the original agents and tasks are never mutated and can be
+  shared by any number of concurrent runs.
+
+RULES:
+  • Only {identifier} is a placeholder. Any other brace (JSON
+    examples, "{ }" in prose) is kept literally.
+  • All missing inputs are reported up front, in one error,
+    together with where each one is used.
+
+============================================================
+"""
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+
+# ── Parsing ──────────────────────────────────────────────────────────
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# Fields that crewai interpolates on kickoff
+AGENT_FIELDS = ("role", "goal", "backstory")
+TASK_FIELDS = ("description", "expected_output")
+
+
+class MissingInputsError(KeyError):
+    """Raised when kickoff inputs do not cover every placeholder."""
+
+    def __init__(self, missing, locations=None):
+        self.missing = tuple(sorted(missing))
+        self.locations = dict(locations or {})
+        super().__init__(self._message())
+
+    def _message(self):
+        parts = []
+        for key in self.missing:
+            where = ", ".join(self.locations.get(key, ())) or "template"
+            parts.append(f"'{key}' (used in {where})")
+        return "missing kickoff inputs: " + "; ".join(parts)
+
+    def __str__(self):
+        return self._message()
+
+
+class CompiledTemplate:
+    """A template string parsed into literal and placeholder segments.
+
+    Segments alternate: even positions are literal text, odd
+    positions are placeholder names. Rendering is a single join.
+    """
+
+    __slots__ = ("source", "segments", "fields")
+
+    def __init__(self, source):
+        self.source = source
+        segments = []
+        last = 0
+        for match in _PLACEHOLDER.finditer(source):
+            segments.append(source[last:match.start()])
+            segments.append(match.group(1))
+            last = match.end()
+        segments.append(source[last:])
+        self.segments = tuple(segments)
+        self.fields = frozenset(segments[1::2])
+
+    @property
+    def is_static(self):
+        return not self.fields
+
+    def render(self, inputs):
+        if not self.fields:
+            return self.source
+        parts = list(self.segments)
+        for i in range(1, len(parts), 2):
+            parts[i] = inputs[parts[i]]
+        return "".join(parts)
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.source[:40]!r}, fields={sorted(self.fields)})"
+
+
+@lru_cache(maxsize=4096)
+def compile_template(text):
+    """Parse `text` once; identical strings share one compiled template."""
+    return CompiledTemplate(text or "")
+
+
+# ── Rendered per-run view ───────────────────────────────────────────
+class RenderedPrompts:
+    """Immutable view of every rendered agent / task string for one run.
+
+        view.agents[0]["goal"]
+        view.tasks[2]["description"]
+    """
+
+    __slots__ = ("agents", "tasks", "inputs")
+
+    def __init__(self, agents, tasks, inputs):
+        object.__setattr__(self, "agents", tuple(MappingProxyType(a) for a in agents))
+        object.__setattr__(self, "tasks", tuple(MappingProxyType(t) for t in tasks))
+        object.__setattr__(self, "inputs", MappingProxyType(dict(inputs)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RenderedPrompts is immutable")
+
+
+def _intern_role(fields):
+    # Role names end up on every output, log line and event of a run
+    fields["role"] = sys.intern(fields["role"])
+    return fields
+
+
+class PromptTemplates:
+    """Compiled templates for every agent and task of a crew.
+
+    Build it once per crew definition, then call render(inputs) per
+    run. Rendered views are cached (bounded LRU) by the values of the
+    inputs the templates actually use, so repeated topics in a batch
+    cost a dictionary lookup.
+    """
+
+    def __init__(self, agents, tasks, cache_size=256):
+        self.agent_templates = tuple(
+            {field: compile_template(str(values.get(field) or "")) for field in AGENT_FIELDS}
+            for values in agents
+        )
+        self.task_templates = tuple(
+            {field: compile_template(str(values.get(field) or "")) for field in TASK_FIELDS}
+            for values in tasks
+        )
+        self.agent_names = tuple(values.get("role") or f"agent {i}" for i, values in enumerate(agents))
+        self.task_names = tuple(values.get("name") or f"task {i}" for i, values in enumerate(tasks))
+
+        locations = {}
+        for owner, templates in self._owners():
+            for field, template in templates.items():
+                for key in template.fields:
+                    locations.setdefault(key, []).append(f"{owner}.{field}")
+        self.locations = {key: tuple(where) for key, where in locations.items()}
+        self.required_inputs = frozenset(self.locations)
+
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ── construction helpers ──────────────────────────────────────
+    @classmethod
+    def from_objects(cls, agents, tasks, **kwargs):
+        """Compile from crewai Agent / Task objects (or anything with those attributes)."""
+        agent_values = [{f: getattr(a, f, None) for f in AGENT_FIELDS} for a in agents]
+        task_values = []
+        for task in tasks:
+            values = {f: getattr(task, f, None) for f in TASK_FIELDS}
+            values["name"] = getattr(task, "name", None)
+            task_values.append(values)
+        return cls(agent_values, task_values, **kwargs)
+
+    @classmethod
+    def from_crew(cls, crew, **kwargs):
+        return cls.from_objects(crew.agents, crew.tasks, **kwargs)
+
+    def _owners(self):
+        for name, templates in zip(self.agent_names, self.agent_templates):
+            yield f"agent '{name}'", templates
+        for name, templates in zip(self.task_names, self.task_templates):
+            yield name, templates
+
+    # ── validation & rendering ────────────────────────────────────
+    def validate(self, inputs):
+        """Raise MissingInputsError listing every missing key at once."""
+        inputs = inputs or {}
+        missing = [key for key in self.required_inputs if key not in inputs]
+        if missing:
+            raise MissingInputsError(missing, self.locations)
+
+    def render(self, inputs=None):
+        inputs = inputs or {}
+        self.validate(inputs)
+        values = {key: str(inputs[key]) for key in self.required_inputs}
+        cache_key = tuple(sorted(values.items()))
+
+        with self._lock:
+            view = self._cache.get(cache_key)
+            if view is not None:
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return view
+            self.cache_misses += 1
+
+        view = RenderedPrompts(
+            [_intern_role({f: t.render(values) for f, t in templates.items()})
+             for templates in self.agent_templates],
+            [{f: t.render(values) for f, t in templates.items()} for templates in self.task_templates],
+            values,
+        )
+        with self._lock:
+            self._cache[cache_key] = view
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return view
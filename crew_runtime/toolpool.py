@@ -0,0 +1,369 @@
+"""
+============================================================
+  crew_runtime.toolpool  |  Bounded, timed tool execution
+============================================================
+
+CONCEPT:
+  Lesson 2 gives SerperDevTool to researcher only, but production
+  crews carry search + scrape + file tools, and every call runs on
+  the agent thread: a scrape that hangs for 90 s holds the whole
+  ReAct loop, and nothing stops 50 concurrent kickoffs from
+  hammering one scraper at once.
+
+  With a ToolPool passed to kickoff(tool_pool=...), the executor
+  hands each tool call to the pool:
+
+    slot      a per-tool semaphore (max_concurrent); waiting for
+              it counts against the timeout
+    worker    sync tools run on a bounded thread pool, `async def`
+              tools on one event-loop thread
+    stream    a tool may return an iterator of chunks; each chunk
+              is appended to the observation as it arrives and
+              emitted as a `tool_output` event, and max_chars stops
+              the tool once the agent has enough
+    timeout   per tool; the agent gets what arrived so far plus a
+              note instead of waiting. The call is told to stop,
+              but Python cannot kill a thread: a sync tool that
+              does not stream is ABANDONED, not stopped. It runs
+              on until it returns, keeping its worker thread and
+              its max_concurrent slot; a streaming tool stops at
+              its next chunk, an `async def` tool is cancelled
+    cancel    ctx.cancel (or pool.shutdown(cancel=True)) stops the
+              in-flight calls the same way
+
+  run_async() is the same for kickoff_async(): the event loop awaits
+  the call instead of a thread blocking on it, and cancelling the
+  awaiting task stops the call.
+
+  Per-tool latency histograms and timeout / error counts are kept
+  in pool.stats().
+
+USAGE:
+  pool = ToolPool(max_workers=32, timeout=20,
+                  limits={"Scrape website": ToolLimits(timeout=10, max_concurrent=4)})
+  template.kickoff(inputs, tool_pool=pool)
+
+  python -m crew_runtime.toolpool     # benchmark with fake tools
+
+============================================================
+"""
+
+import asyncio
+import collections
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+
+from .histogram import LatencyHistogram
+
+_POLL = 0.05   # how often a waiting call looks at its cancel flag
+
+
+@dataclass(frozen=True)
+class ToolLimits:
+    timeout: float = 30.0         # seconds, including the wait for a slot; None → no limit
+    max_concurrent: int = None    # calls of this tool in flight across all runs
+    max_chars: int = None         # stop a streaming tool after this much output
+
+
+class _Call:
+    """Output of one tool call, filled in by the worker as it streams."""
+
+    __slots__ = ("chunks", "size", "stop", "on_chunk", "max_chars")
+
+    def __init__(self, on_chunk, max_chars):
+        self.chunks = []
+        self.size = 0
+        self.stop = threading.Event()
+        self.on_chunk = on_chunk
+        self.max_chars = max_chars
+
+    def _add(self, chunk):
+        chunk = str(chunk)
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self.on_chunk is not None:
+            self.on_chunk(chunk)
+        if self.max_chars is not None and self.size >= self.max_chars:
+            self.stop.set()
+
+    def run(self, tool, action_input):
+        result = tool.run(action_input)
+        if isinstance(result, (str, bytes)) or not hasattr(result, "__next__"):
+            self._add(result)
+            return self.text()
+        try:
+            for chunk in result:
+                self._add(chunk)
+                if self.stop.is_set():
+                    break
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+        return self.text()
+
+    async def run_async(self, tool, action_input):
+        result = await tool.run(action_input)
+        self._add(result)
+        return self.text()
+
+    def text(self):
+        return "".join(self.chunks)
+
+
+def run_inline(tool, action_input, on_chunk=None):
+    """Run a tool on the calling thread, collecting a streamed result."""
+    call = _Call(on_chunk, None)
+    if inspect.iscoroutinefunction(tool.func):
+        return asyncio.run(call.run_async(tool, action_input))
+    return call.run(tool, action_input)
+
+
+async def run_inline_async(tool, action_input, on_chunk=None):
+    """run_inline() for an event loop: `async def` tools are awaited, others get a thread."""
+    call = _Call(on_chunk, None)
+    if inspect.iscoroutinefunction(tool.func):
+        return await call.run_async(tool, action_input)
+    try:
+        return await asyncio.to_thread(call.run, tool, action_input)
+    except asyncio.CancelledError:
+        call.stop.set()  # a streaming tool stops at its next chunk
+        raise
+
+
+class ToolPool:
+    """Thread pool + event loop running tool calls under per-tool limits."""
+
+    def __init__(self, max_workers=16, timeout=30.0, max_concurrent=None, max_chars=None,
+                 limits=None):
+        self.default = ToolLimits(timeout, max_concurrent, max_chars)
+        self.limits = {name.strip().lower(): limit for name, limit in (limits or {}).items()}
+        self.latency = collections.defaultdict(LatencyHistogram)
+        self.counts = collections.Counter()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crew-tool")
+        self._slots = {}
+        self._live = set()
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def limits_for(self, name):
+        return self.limits.get(name.strip().lower(), self.default)
+
+    def _slot(self, name, limits):
+        if not limits.max_concurrent:
+            return None
+        with self._lock:
+            slot = self._slots.get(name)
+            if slot is None:
+                slot = self._slots[name] = threading.BoundedSemaphore(limits.max_concurrent)
+        return slot
+
+    def _event_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="crew-tool-async", daemon=True).start()
+            return self._loop
+
+    # ── running ───────────────────────────────────────────────────
+    def run(self, tool, action_input, on_chunk=None, cancel=None):
+        """The tool's observation; partial output + a note on timeout or cancel.
+
+        Exceptions raised by the tool propagate, like a direct call.
+        """
+        limits = self.limits_for(tool.name)
+        start = time.monotonic()
+        deadline = start + limits.timeout if limits.timeout else None
+        slot = self._slot(tool.name, limits)
+        if slot is not None and not slot.acquire(timeout=limits.timeout):
+            return self._busy(tool.name, limits)
+        call, future = self._submit(tool, action_input, on_chunk, limits, slot, start)
+
+        while True:
+            wait = _POLL if cancel is not None else None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+                wait = remaining if wait is None else min(wait, remaining)
+            try:
+                observation = future.result(timeout=wait)
+            except FutureTimeout:
+                if cancel is not None and cancel.is_set():
+                    return self._abandon(call, future, "cancelled", tool.name)
+                if deadline is not None and time.monotonic() >= deadline:
+                    return self._abandon(call, future, "timeout", tool.name, limits.timeout)
+                continue
+            except Exception:
+                self._count("errors")
+                raise
+            self._count("completed")
+            return observation
+
+    async def run_async(self, tool, action_input, on_chunk=None):
+        """run() awaited on an event loop; cancelling the caller stops the call."""
+        limits = self.limits_for(tool.name)
+        start = time.monotonic()
+        slot = self._slot(tool.name, limits)
+        if slot is not None and not slot.acquire(blocking=False):
+            waiting = asyncio.ensure_future(asyncio.to_thread(slot.acquire, timeout=limits.timeout))
+            try:
+                acquired = await asyncio.shield(waiting)
+            except asyncio.CancelledError:  # hand back the slot the thread may still get
+                waiting.add_done_callback(lambda f: f.result() and slot.release())
+                raise
+            if not acquired:
+                return self._busy(tool.name, limits)
+        call, future = self._submit(tool, action_input, on_chunk, limits, slot, start)
+        waiter = asyncio.wrap_future(future)
+        waiter.add_done_callback(lambda f: f.cancelled() or f.exception())  # retrieved if abandoned
+        remaining = None
+        if limits.timeout:
+            remaining = max(0.0, start + limits.timeout - time.monotonic())
+        try:
+            observation = await asyncio.wait_for(asyncio.shield(waiter), remaining)
+        except asyncio.TimeoutError:
+            return self._abandon(call, future, "timeout", tool.name, limits.timeout)
+        except asyncio.CancelledError:
+            self._abandon(call, future, "cancelled", tool.name)
+            raise
+        except Exception:
+            self._count("errors")
+            raise
+        self._count("completed")
+        return observation
+
+    def _count(self, key):
+        with self._lock:  # calls finish on many agent threads at once
+            self.counts[key] += 1
+
+    def _busy(self, name, limits):
+        self._count("busy")
+        return (f"Tool '{name}' is busy ({limits.max_concurrent} calls in flight); "
+                "try again later or use another tool.")
+
+    def _submit(self, tool, action_input, on_chunk, limits, slot, start):
+        call = _Call(on_chunk, limits.max_chars)
+        try:
+            if inspect.iscoroutinefunction(tool.func):
+                future = asyncio.run_coroutine_threadsafe(call.run_async(tool, action_input),
+                                                          self._event_loop())
+            else:
+                future = self._pool.submit(call.run, tool, action_input)
+        except BaseException:
+            if slot is not None:
+                slot.release()
+            raise
+        with self._lock:
+            self._live.add((call, future))
+
+        def finished(_):
+            with self._lock:
+                self._live.discard((call, future))
+            if slot is not None:
+                slot.release()  # only once the call really ended, so the limit holds
+            self.latency[tool.name].observe(time.monotonic() - start)
+
+        future.add_done_callback(finished)
+        return call, future
+
+    def _abandon(self, call, future, reason, name, timeout=None):
+        # Stops streaming and async tools; a running sync tool finishes in
+        # the background and only then gives back its slot (see finished)
+        call.stop.set()
+        future.cancel()
+        self._count(reason)
+        partial = call.text()
+        if reason == "timeout":
+            note = f"[Tool '{name}' timed out after {timeout:g}s"
+        else:
+            note = f"[Tool '{name}' was cancelled"
+        note += "; partial output above]" if partial else "; no output]"
+        return f"{partial}\n{note}" if partial else note
+
+    # ── inspection / shutdown ─────────────────────────────────────
+    def stats(self):
+        with self._lock:
+            counts, in_flight = dict(self.counts), len(self._live)
+        return {
+            "counts": counts,
+            "in_flight": in_flight,
+            "tools": {name: {"latency": h.snapshot(), "p95": h.quantile(0.95)}
+                      for name, h in list(self.latency.items())},
+        }
+
+    def shutdown(self, wait=True, cancel=False):
+        if cancel:
+            with self._lock:
+                live = list(self._live)
+            for call, future in live:
+                call.stop.set()
+                future.cancel()
+        self._pool.shutdown(wait=wait, cancel_futures=cancel)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+# ── Benchmark with fake tools ────────────────────────────────────────
+if __name__ == "__main__":
+    import random
+    from types import SimpleNamespace
+
+    from .definition import CrewDefinition
+    from .llm import FakeLLM
+
+    def search(search_query=""):
+        time.sleep(random.uniform(0.05, 0.3))
+        return f"results for {search_query}"
+
+    def scrape(website_url=""):
+        for i in range(40):  # streams; the slow tail is rarely needed
+            time.sleep(random.choice((0.01, 0.01, 0.2)))
+            yield f"paragraph {i} of {website_url}\n"
+
+    def read_file(path=""):
+        return f"contents of {path}"
+
+    tools = [
+        SimpleNamespace(name="Search the internet", description="search", run=search),
+        SimpleNamespace(name="Scrape website", description="scrape", run=scrape),
+        SimpleNamespace(name="Read a file", description="read", run=read_file),
+    ]
+    plan = ['{"search_query": "ai"}', '{"website_url": "https://example.com"}', '{"path": "notes.md"}']
+
+    def respond(messages):
+        step = sum(m["content"].startswith("Observation") for m in messages)
+        if step < len(tools):
+            return f"Thought: next\nAction: {tools[step].name}\nAction Input: {plan[step]}"
+        return "Final Answer: done"
+
+    def crew():
+        agent = SimpleNamespace(role="Researcher", goal="g", backstory="b", tools=tools,
+                                llm=FakeLLM(respond=respond, latency=0.02))
+        task = SimpleNamespace(description="research {topic}", expected_output="notes", agent=agent)
+        return CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"))
+
+    template = crew()
+    inputs = [{"topic": str(i)} for i in range(32)]
+
+    def bench(label, **kwargs):
+        start = time.perf_counter()
+        template.kickoff_many(inputs, max_workers=16, **kwargs)
+        print(f"{label:<34} {time.perf_counter() - start:6.2f} s for {len(inputs)} runs")
+
+    bench("direct (tools on agent threads)")
+    with ToolPool(max_workers=32, timeout=2.0,
+                  limits={"Scrape website": ToolLimits(timeout=1.5, max_chars=600, max_concurrent=8)}) as pool:
+        bench("ToolPool (timeouts, max_chars)", tool_pool=pool)
+        stats = pool.stats()
+    print("counts:", stats["counts"])
+    for name, tool_stats in stats["tools"].items():
+        print(f"  {name:<22} p95 {tool_stats['p95']:.2f} s")
@@ -0,0 +1,84 @@
+"""
+crew_runtime.tools — tools as the runtime sees them.
+
+A crewai tool (SerperDevTool, a @tool function, ...) is reduced to a
+ToolSpec: a name, a description for the prompt and a function. The
+agent writes `Action Input:` as JSON; a JSON object becomes keyword
+arguments, anything else is passed as a single string.
+
+The tool's argument schema (a pydantic args_schema) is reduced to a
+compact JSON string once, and the prompt line is built once, when the
+ToolSpec is made.
+"""
+
+import json
+
+
+class ToolSpec:
+    __slots__ = ("name", "description", "func", "schema", "line")
+
+    def __init__(self, name, description, func, schema=None):
+        self.name = name
+        self.description = description
+        self.func = func
+        self.schema = schema    # JSON of the arguments, or None
+        self.line = f"{name}: {description}"
+        if schema and "Tool Arguments:" not in (description or ""):  # crewai may have added it
+            self.line += f" Arguments: {schema}"
+
+    @classmethod
+    def from_tool(cls, tool):
+        if isinstance(tool, ToolSpec):
+            return tool
+        name = getattr(tool, "name", None) or getattr(tool, "__name__", type(tool).__name__)
+        description = getattr(tool, "description", None) or (getattr(tool, "__doc__", None) or "").strip()
+        func = getattr(tool, "run", None) or getattr(tool, "_run", None) or tool
+        return cls(name, description, func, args_schema(tool))
+
+    def prompt_line(self):
+        return self.line
+
+    def run(self, action_input):
+        args = parse_action_input(action_input)
+        if isinstance(args, dict):
+            return self.func(**args)
+        return self.func(args)
+
+
+def args_schema(tool):
+    """{"argument": {"type", "description"}} of a tool's pydantic args_schema, as JSON."""
+    model = getattr(tool, "args_schema", None)
+    for method in ("model_json_schema", "schema"):  # pydantic v2, v1
+        build = getattr(model, method, None)
+        if build is None:
+            continue
+        try:
+            properties = build().get("properties") or {}
+        except Exception:
+            continue
+        if properties:
+            return json.dumps({
+                name: {key: spec[key] for key in ("type", "description") if key in spec}
+                for name, spec in properties.items()
+            }, ensure_ascii=False)
+    return None
+
+
+def parse_action_input(text):
+    """JSON object → dict; anything else → the stripped string."""
+    text = (text or "").strip()
+    if text.startswith("```"):
+        text = text.strip("`").partition("\n")[2] or text.strip("`")
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return text
+    return value if isinstance(value, dict) else text
+
+
+def find_tool(tools, name):
+    wanted = (name or "").strip().strip("`'\"").lower()
+    for tool in tools:
+        if tool.name.lower() == wanted:
+            return tool
+    return None
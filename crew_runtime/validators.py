@@ -0,0 +1,196 @@
+"""
+============================================================
+  crew_runtime.validators  |  Cheap local output checks
+============================================================
+
+CONCEPT:
+  Lesson 2's tasks spell out rules a machine can check:
+
+    write_task  5 H2 sections, 800–1000 words, Vietnamese only,
+                no source URLs
+    edit_task   all of the above + a meta description line of
+                at most 150 characters at the very top
+
+  Today the only enforcement is another LLM iteration or another
+  editor pass over the full post. Validators check those rules
+  locally in microseconds. When one fails, the executor sends the
+  same agent a short REPAIR prompt naming exactly what is wrong,
+  instead of regenerating the task from scratch.
+
+USAGE:
+  template = CrewDefinition.from_crew(crew, validators=[
+      (write_task, [Headings(level=2, count=5), WordCount(800, 1000),
+                    Language("vi"), NoURLs()]),
+  ])
+
+  Each validator returns None when the text passes, or a short
+  instruction describing what to fix.
+============================================================
+"""
+
+import abc
+import re
+import unicodedata
+
+_URL = re.compile(r"(https?://|www\.)\S+", re.IGNORECASE)
+_WORD = re.compile(r"\w+", re.UNICODE)
+_CODE = re.compile(r"```.*?```", re.DOTALL)
+
+# Letters that only Vietnamese uses among the Latin-script languages
+_VIETNAMESE = frozenset("ăâđêôơưĂÂĐÊÔƠƯ")
+_VI_TONES = frozenset("\u0300\u0301\u0303\u0309\u0323")  # grave, acute, tilde, hook, dot below
+
+
+def count_words(text):
+    return len(_WORD.findall(_CODE.sub(" ", text or "")))
+
+
+class Validator(abc.ABC):
+    """Base class: name for reports, check(text) -> None or a fix instruction."""
+
+    name = "validator"
+
+    @abc.abstractmethod
+    def check(self, text):
+        """None when `text` passes, else a short instruction saying what to fix."""
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class WordCount(Validator):
+    name = "word_count"
+
+    def __init__(self, min_words=None, max_words=None):
+        self.min_words = min_words
+        self.max_words = max_words
+
+    def check(self, text):
+        words = count_words(text)
+        if self.min_words is not None and words < self.min_words:
+            return f"The text has {words} words; expand it to at least {self.min_words} words."
+        if self.max_words is not None and words > self.max_words:
+            return f"The text has {words} words; shorten it to at most {self.max_words} words."
+        return None
+
+
+class Headings(Validator):
+    """Exactly `count` (or between min/max) markdown headings of one level."""
+
+    name = "headings"
+
+    def __init__(self, level=2, count=None, min_count=None, max_count=None):
+        self.level = level
+        self.min_count = count if count is not None else min_count
+        self.max_count = count if count is not None else max_count
+        self.pattern = re.compile(r"^\s{0,3}#{%d}\s+\S" % level, re.MULTILINE)
+
+    def check(self, text):
+        found = len(self.pattern.findall(text or ""))
+        marker = "#" * self.level
+        if self.min_count is not None and found < self.min_count:
+            return f"Found {found} '{marker}' headings; the text needs at least {self.min_count}."
+        if self.max_count is not None and found > self.max_count:
+            return f"Found {found} '{marker}' headings; the text must have at most {self.max_count}."
+        return None
+
+
+class Regex(Validator):
+    name = "regex"
+
+    def __init__(self, pattern, message, must_match=True, flags=re.MULTILINE):
+        self.pattern = re.compile(pattern, flags)
+        self.message = message
+        self.must_match = must_match
+
+    def check(self, text):
+        matched = self.pattern.search(text or "") is not None
+        return None if matched == self.must_match else self.message
+
+
+class NoURLs(Validator):
+    name = "no_urls"
+
+    def check(self, text):
+        urls = _URL.findall(text or "")
+        if urls:
+            return f"Remove all URLs from the text ({len(urls)} found)."
+        return None
+
+
+class MetaDescription(Validator):
+    """First non-empty line is a plain sentence of at most max_chars characters."""
+
+    name = "meta_description"
+
+    def __init__(self, max_chars=150):
+        self.max_chars = max_chars
+
+    def check(self, text):
+        first = next((line.strip() for line in (text or "").splitlines() if line.strip()), "")
+        if not first or first.startswith("#"):
+            return f"Start the text with a meta description line (at most {self.max_chars} characters) before the title."
+        if len(first) > self.max_chars:
+            return f"The meta description on the first line is {len(first)} characters; cut it to {self.max_chars}."
+        return None
+
+
+class Language(Validator):
+    """Character-based language check for 'vi' (Vietnamese) and 'en' (English).
+
+    Vietnamese is recognised by its dedicated letters and tone marks;
+    English by words written in plain ASCII. No model, no network.
+    """
+
+    name = "language"
+
+    def __init__(self, code, min_share=0.6):
+        if code not in ("vi", "en"):
+            raise ValueError("Language supports 'vi' and 'en'")
+        self.code = code
+        self.min_share = min_share
+
+    @staticmethod
+    def _is_vietnamese(word):
+        if any(ch in _VIETNAMESE for ch in word):
+            return True
+        return any(ch in _VI_TONES for ch in unicodedata.normalize("NFD", word))
+
+    def share(self, text):
+        text = _URL.sub(" ", _CODE.sub(" ", text or ""))
+        words = [w for w in _WORD.findall(text) if not w.isdigit()]
+        if not words:
+            return 0.0
+        if self.code == "en":
+            return sum(w.isascii() for w in words) / len(words)
+        # Many Vietnamese syllables carry no mark ("tin", "cho"), so a
+        # third of marked words already means the text is Vietnamese
+        return min(1.0, 3 * sum(self._is_vietnamese(w) for w in words) / len(words))
+
+    def check(self, text):
+        share = self.share(text)
+        if share < self.min_share:
+            language = "Vietnamese" if self.code == "vi" else "English"
+            return f"Write the whole text in {language}; parts of it are in another language."
+        return None
+
+
+# ── Running validators ──────────────────────────────────────────────
+def validate(text, validators):
+    """[(validator name, fix instruction), ...] for every failed check."""
+    failures = []
+    for validator in validators:
+        message = validator.check(text)
+        if message:
+            failures.append((validator.name, message))
+    return failures
+
+
+def repair_prompt(failures):
+    issues = "\n".join(f"- {message}" for _, message in failures)
+    return (
+        "Your answer failed these checks:\n"
+        f"{issues}\n\n"
+        "Fix ONLY these issues and keep everything else as it is. "
+        "Return the complete corrected text as your Final Answer."
+    )
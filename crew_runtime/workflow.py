@@ -0,0 +1,298 @@
+"""
+============================================================
+  crew_runtime.workflow  |  Crews as nodes of a DAG
+============================================================
+
+CONCEPT:
+  The lessons chain crews by hand: the data analysis pipeline
+  (sequential.py, example 3) feeds the market report of the
+  custom-manager crew (hierarchical.py, example 3), which feeds
+  Lesson 1's blog crew. Each script sits behind its own input()
+  menu and everything runs one after the other.
+
+  A Workflow declares that chain instead:
+
+    node   a crew, built by a function (or a crew attribute) that
+           is loaded INSIDE the worker process, plus its inputs
+    edge   From("node", type=...) — the upstream crew's final
+           output, checked against a type (str, dict, list, int,
+           float) before it flows on
+
+  An edge value becomes a kickoff input, as the typed value (a
+  dict edge hands the downstream crew a dict, stored with its
+  artifact); its prompts get it as JSON. If the downstream crew
+  has no {placeholder} of that name, the value is added to its
+  first task as context instead.
+
+  Workflow.run() starts every node whose inputs are ready on a
+  process pool, so independent crews run in parallel and the
+  whole workflow takes as long as its critical path. Each node
+  result is stored under .crew_workflow/ keyed by the crew's
+  fingerprint + its inputs: a node whose inputs did not change
+  is not run again.
+
+USAGE:
+  flow = Workflow("ev-market-blog", [
+      Node("analysis", "Lesson 3 Keyword Process/sequential.py:build_data_analysis_crew",
+           {"analysis_subject": "Global EV Adoption 2020-2024"}),
+      Node("market", "Lesson 3 Keyword Process/hierarchical.py:build_market_research_crew",
+           {"market": "EV charging", "analysis": From("analysis")}),
+      Node("blog", "Lesson 1  Key concepts with keywords  Agent - Task - Crew/main.py:crew",
+           {"topic": "The EV charging market", "report": From("market")}),
+  ])
+  result = flow.run(max_workers=3)
+  result.outputs["blog"]
+
+============================================================
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+
+from .definition import CrewDefinition
+from .writer import write_atomic
+
+DEFAULT_ROOT = ".crew_workflow"
+# Relative crew paths are read from here: the folder holding the lessons
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*\n(.*?)\n```\s*$", re.DOTALL)
+
+
+class WorkflowError(Exception):
+    """The workflow is malformed, or one of its nodes failed."""
+
+
+# ── Declarations ─────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class From:
+    """Edge: the final output of `node`, converted to `type`."""
+    node: str
+    type: type = str
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    build: object            # "path/to/file.py:attr", a module-level callable, or a crew
+    inputs: dict = field(default_factory=dict)
+
+    @property
+    def edges(self):
+        return {key: value for key, value in self.inputs.items() if isinstance(value, From)}
+
+
+def convert(raw, kind):
+    """Typed edge check: `raw` text as `kind`, or WorkflowError."""
+    if kind is str:
+        return raw
+    text = raw.strip()
+    fenced = _FENCE.match(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    try:
+        value = json.loads(text) if kind in (dict, list) else kind(text)
+    except (TypeError, ValueError) as exc:
+        raise WorkflowError(f"output is not a valid {kind.__name__}: {exc}") from None
+    if not isinstance(value, kind):
+        raise WorkflowError(f"output is a {type(value).__name__}, expected {kind.__name__}")
+    return value
+
+
+# ── Inside a worker ──────────────────────────────────────────────────
+def resolve_path(path):
+    """A relative crew file path against the repository root (then the cwd)."""
+    if os.path.isabs(path):
+        return path
+    candidate = os.path.join(REPO_ROOT, path)
+    return candidate if os.path.exists(candidate) else os.path.abspath(path)
+
+
+def load_crew(build):
+    """Crew (or CrewDefinition) from "path/to/file.py:attr", "package.module:attr",
+    a callable returning one, or the object itself."""
+    if not isinstance(build, str):
+        return build() if callable(build) else build
+    path, _, attr = build.rpartition(":")
+    if not path.endswith(".py"):
+        module = importlib.import_module(path)
+    else:
+        path = resolve_path(path)
+        folder = os.path.dirname(path)
+        if folder not in sys.path:
+            sys.path.insert(0, folder)  # lesson scripts import their siblings (utils.py)
+        name = "crew_workflow_" + hashlib.sha1(path.encode("utf-8")).hexdigest()[:8]
+        module = sys.modules.get(name)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+    obj = getattr(module, attr)
+    return obj() if callable(obj) else obj
+
+
+def as_definition(crew):
+    return crew if isinstance(crew, CrewDefinition) else CrewDefinition.from_crew(crew)
+
+
+def _with_context(definition, names):
+    """Add inputs that no placeholder uses to the first task, as context."""
+    if not names or not definition.tasks:
+        return definition
+    first = definition.tasks[0]
+    extra = "".join(f"\n\nInput '{name}' from the previous crew:\n{{{name}}}" for name in names)
+    return definition.derive(tasks=(replace(first, description=first.description + extra),)
+                             + tuple(definition.tasks[1:]))
+
+
+def prompt_inputs(inputs):
+    """Inputs as prompt text: typed edge values (dict, list, int…) as JSON, not Python reprs."""
+    return {key: value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+            for key, value in inputs.items()}
+
+
+def run_node(node, inputs, root):
+    """Build and run one node (or reuse its stored artifact)."""
+    definition = as_definition(load_crew(node.build))
+    unused = sorted(k for k in node.edges if k not in definition.prompts.required_inputs)
+    definition = _with_context(definition, unused)
+
+    payload = json.dumps({"crew": definition.fingerprint(), "inputs": inputs}, sort_keys=True)
+    key = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(root, node.name, f"{key}.json")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return dict(json.load(f), cached=True)
+
+    start = time.perf_counter()
+    result = definition.kickoff(prompt_inputs(inputs))
+    artifact = {
+        "node": node.name,
+        "key": key,
+        "run_id": result.run_id,
+        "inputs": inputs,
+        "raw": result.raw,
+        "tasks": [output.raw for output in result.tasks_output],
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    write_atomic(path, json.dumps(artifact, ensure_ascii=False, indent=2))
+    return dict(artifact, cached=False)
+
+
+# ── Scheduling ───────────────────────────────────────────────────────
+class WorkflowResult:
+    def __init__(self, name, artifacts, outputs, elapsed):
+        self.name = name
+        self.artifacts = artifacts  # node → stored artifact (+ "cached")
+        self.outputs = outputs      # node → typed output, as its edges saw it
+        self.elapsed = elapsed
+
+    @property
+    def cached(self):
+        return [name for name, a in self.artifacts.items() if a["cached"]]
+
+    def __str__(self):
+        return str(list(self.outputs.values())[-1]) if self.outputs else ""
+
+
+class Workflow:
+    """A DAG of crews; see the module docstring."""
+
+    def __init__(self, name, nodes, root=DEFAULT_ROOT):
+        self.name = name
+        self.nodes = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise WorkflowError(f"duplicate node {node.name!r}")
+            self.nodes[node.name] = node
+        self.root = os.path.join(root, name)
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        needs = {}
+        for node in self.nodes.values():
+            for key, edge in node.edges.items():
+                if edge.node not in self.nodes:
+                    raise WorkflowError(f"{node.name}.{key} reads unknown node {edge.node!r}")
+            needs[node.name] = {edge.node for edge in node.edges.values()}
+        order, ready = [], [n for n, deps in needs.items() if not deps]
+        while ready:
+            current = ready.pop(0)
+            order.append(current)
+            for name, deps in needs.items():
+                if current in deps:
+                    deps.discard(current)
+                    if not deps and name not in order and name not in ready:
+                        ready.append(name)
+        if len(order) != len(self.nodes):
+            stuck = sorted(set(self.nodes) - set(order))
+            raise WorkflowError(f"cycle between nodes: {', '.join(stuck)}")
+        return order
+
+    def _inputs(self, node, edge_values):
+        values = {}
+        for key, value in node.inputs.items():
+            values[key] = edge_values[node.name, key] if isinstance(value, From) else value
+        return values
+
+    def run(self, max_workers=None, processes=True):
+        """Run every node, independent ones in parallel; returns a WorkflowResult.
+
+        processes=False uses threads (for crews that cannot be sent to
+        another process, e.g. in-memory test doubles).
+        """
+        start = time.perf_counter()
+        pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        artifacts, typed, edge_values, failed = {}, {}, {}, {}
+        pending = list(self.order)
+        running = {}
+        with pool_class(max_workers=max_workers or len(self.nodes)) as pool:
+            while pending or running:
+                for name in list(pending):
+                    node = self.nodes[name]
+                    sources = {edge.node for edge in node.edges.values()}
+                    if sources & set(failed):
+                        failed[name] = WorkflowError(f"skipped: upstream {sorted(sources & set(failed))} failed")
+                        pending.remove(name)
+                    elif sources <= set(artifacts):
+                        running[pool.submit(run_node, node, self._inputs(node, edge_values), self.root)] = name
+                        pending.remove(name)
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        artifacts[name] = future.result()
+                        values = self._check_edges(name, artifacts[name]["raw"])
+                        edge_values.update(values)
+                        typed[name] = next(iter(values.values()), artifacts[name]["raw"])
+                    except Exception as exc:  # reported for every node at the end
+                        artifacts.pop(name, None)
+                        failed[name] = exc
+        if failed:
+            details = "; ".join(f"{name}: {exc}" for name, exc in failed.items())
+            raise WorkflowError(f"workflow {self.name!r} failed: {details}")
+        outputs = {name: typed[name] for name in self.order}
+        return WorkflowResult(self.name, artifacts, outputs, time.perf_counter() - start)
+
+    def _check_edges(self, name, raw):
+        """{(node, input): typed value} for every edge reading node `name`; all must convert."""
+        values = {}
+        for node in self.nodes.values():
+            for key, edge in node.edges.items():
+                if edge.node == name:
+                    try:
+                        values[node.name, key] = convert(raw, edge.type)
+                    except WorkflowError as exc:
+                        raise WorkflowError(f"edge {name} → {node.name}.{key}: {exc}") from None
+        return values
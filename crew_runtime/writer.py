@@ -0,0 +1,221 @@
+"""
+============================================================
+  crew_runtime.writer  |  Background, atomic output files
+============================================================
+
+CONCEPT:
+  Lesson 2 tasks write research_output.md, draft_blog.md and
+  final_blog.md through output_file=, and Lesson 1 writes
+  output_<topic>.md right after kickoff. Both write on the agent
+  thread, and a crash halfway through a write leaves a truncated
+  file behind that looks like a real result.
+
+  OutputWriter moves all of that to one background thread:
+
+    submit()  → returns at once with a Future
+    thread    → writes to a hidden temp file in the target folder
+              → fsyncs in batches (fsync_every files or
+                fsync_interval seconds, whichever comes first)
+              → os.replace() onto the final name
+
+  Readers only ever see a missing file or a complete one. Each
+  run gets its own folder (root/<run_id>/) so concurrent crews
+  never overwrite each other's research_output.md, and compress=
+  True stores .gz files.
+
+USAGE:
+  with OutputWriter("outputs") as writer:
+      template.kickoff(inputs, writer=writer)
+  # leaving the block waits for every file to reach disk
+
+============================================================
+"""
+
+import gzip
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+def write_atomic(path, text, compress=False):
+    """Synchronous atomic write (temp file + fsync + rename)."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    tmp = os.path.join(folder, f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        data = text.encode("utf-8")
+        with open(tmp, "wb") as f:
+            f.write(gzip.compress(data) if compress else data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        _discard(tmp)
+        raise
+    return path
+
+
+class _Pending:
+    __slots__ = ("tmp", "path", "handle", "future")
+
+    def __init__(self, tmp, path, handle, future):
+        self.tmp = tmp
+        self.path = path
+        self.handle = handle
+        self.future = future
+
+
+class OutputWriter:
+    """Queue-backed writer; see the module docstring."""
+
+    def __init__(self, root="outputs", per_run_dirs=True, compress=False,
+                 fsync_every=16, fsync_interval=0.2, max_queue=10000):
+        self.root = root
+        self.per_run_dirs = per_run_dirs
+        self.compress = compress
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.stats = {"files": 0, "bytes": 0, "fsync_batches": 0, "errors": 0}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+
+    # ── public API ────────────────────────────────────────────────
+    def path_for(self, run_id, filename):
+        folder = self.root
+        if self.per_run_dirs and run_id:
+            folder = os.path.join(folder, run_id)
+        path = filename if os.path.isabs(filename) else os.path.join(folder, filename)
+        return path + ".gz" if self.compress else path
+
+    def submit(self, run_id, filename, text):
+        """Queue `text` for `filename`; the Future resolves to the final path."""
+        future = Future()
+        self._queue.put((self.path_for(run_id, filename), text, future))
+        return future
+
+    def depth(self):
+        """Files queued and not written yet (approximate, like Queue.qsize)."""
+        return self._queue.qsize()
+
+    def flush(self, timeout=None):
+        """Block until everything submitted so far is on disk."""
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── background thread ─────────────────────────────────────────
+    def _run(self):
+        pending = []
+        last_sync = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval if pending else None)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._sync(pending)
+                return
+            if isinstance(item, threading.Event):
+                self._sync(pending)
+                pending = []
+                item.set()
+                continue
+            if item is not None:
+                staged = self._stage(*item)
+                if staged is not None:
+                    pending.append(staged)
+
+            idle = item is None
+            due = time.monotonic() - last_sync >= self.fsync_interval
+            if pending and (idle or due or len(pending) >= self.fsync_every):
+                self._sync(pending)
+                pending = []
+                last_sync = time.monotonic()
+
+    def _stage(self, path, text, future):
+        # Any failure (a bad path, text that is not a str, a full disk)
+        # fails this job's future only; the writer thread keeps going.
+        tmp = handle = staged = None
+        try:
+            folder = os.path.dirname(path) or "."
+            os.makedirs(folder, exist_ok=True)
+            tmp = os.path.join(folder, f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+            data = text.encode("utf-8")
+            if self.compress:
+                data = gzip.compress(data)
+            handle = open(tmp, "wb")
+            handle.write(data)
+            handle.flush()
+            self.stats["bytes"] += len(data)
+            staged = _Pending(tmp, path, handle, future)
+            return staged
+        except Exception as exc:
+            self.stats["errors"] += 1
+            future.set_exception(exc)
+            return None
+        finally:
+            if staged is None:
+                if handle is not None:
+                    handle.close()
+                if tmp is not None:
+                    _discard(tmp)
+
+    def _sync(self, pending):
+        if not pending:
+            return
+        folders = set()
+        for item in pending:
+            try:
+                os.fsync(item.handle.fileno())
+                item.handle.close()
+                os.replace(item.tmp, item.path)
+                folders.add(os.path.dirname(item.path) or ".")
+                self.stats["files"] += 1
+                item.future.set_result(item.path)
+            except Exception as exc:
+                item.handle.close()
+                _discard(item.tmp)
+                self.stats["errors"] += 1
+                item.future.set_exception(exc)
+        for folder in folders:
+            _fsync_dir(folder)
+        self.stats["fsync_batches"] += 1
+
+
+def _discard(tmp):
+    try:
+        os.remove(tmp)
+    except OSError:
+        pass
+
+
+def _fsync_dir(folder):
+    # Persist the rename itself; not supported on Windows
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
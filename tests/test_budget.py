@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition
+from crew_runtime.budget import Budget, BudgetExceeded, TokenBudget
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def parallel_crew(roles):
+    agents = [SimpleNamespace(role=role, goal="g", backstory="b", tools=[],
+                              llm=FakeLLM(["Final Answer: ok"], latency=0.01)) for role in roles]
+    tasks = [SimpleNamespace(description=f"task {i}", expected_output="text", agent=agent,
+                             async_execution=True) for i, agent in enumerate(agents)]
+    return CrewDefinition.from_crew(SimpleNamespace(agents=agents, tasks=tasks, process="sequential"))
+
+
+def test_each_budget_event_reports_its_own_call():
+    roles = [f"Agent {i}" for i in range(8)]
+    template = parallel_crew(roles)
+    budget = TokenBudget(agents={role: Budget(hard=10) for role in roles})
+    for _ in range(5):
+        events = []
+
+        def listener(ctx, event, data):
+            if event == "budget":
+                events.append((ctx.prompts.agents[data["agent"]]["role"], data["name"]))
+
+        with pytest.raises(BudgetExceeded):
+            template.kickoff(budget=budget, listeners=(listener,), logger=LOG)
+        assert events and all(role == name for role, name in events)
+
+
+def test_the_hard_hit_travels_with_the_exception():
+    template = parallel_crew(["Writer"])
+    budget = TokenBudget(run=Budget(hard=10))
+    with pytest.raises(BudgetExceeded) as raised:
+        template.kickoff(budget=budget, logger=LOG)
+    assert raised.value.hit == {"kind": "hard", "scope": "run", "name": "run", "used": 0, "limit": 10}
+
+
+def test_a_custom_manager_is_budgeted_by_its_role():
+    manager = SimpleNamespace(role="Chief Research Coordinator", goal="g", backstory="b", tools=[],
+                              llm=FakeLLM(["Final Answer: ok"]))
+    worker = SimpleNamespace(role="Analyst", goal="g", backstory="b", tools=[], llm=FakeLLM())
+    task = SimpleNamespace(description="analyse", expected_output="text", agent=None)
+    template = CrewDefinition.from_crew(SimpleNamespace(agents=[worker], tasks=[task], process="hierarchical",
+                                                        manager_agent=manager))
+    budget = TokenBudget(agents={template.manager.role: Budget(hard=10)})
+    with pytest.raises(BudgetExceeded) as raised:
+        template.kickoff(budget=budget, logger=LOG)
+    assert raised.value.name == "Chief Research Coordinator"
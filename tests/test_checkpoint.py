@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CheckpointStore, CrewDefinition
+from crew_runtime.tools import ToolSpec
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def test_resume_continues_after_the_last_checkpointed_step(tmp_path):
+    searches = []
+    search = ToolSpec("Search", "Searches.", lambda q="": searches.append(q) or f"result for {q}")
+    prompts = []
+
+    def respond(messages):
+        prompts.append(messages)
+        seen = sum(m["content"].startswith("Observation") for m in messages)
+        if seen < 2:
+            return f'Thought: t\nAction: Search\nAction Input: {{"q": "q{seen}"}}'
+        if crash["on"]:
+            raise ConnectionError("network down")
+        return "Final Answer: done"
+
+    crash = {"on": True}
+    agent = SimpleNamespace(role="Researcher", goal="g", backstory="b", tools=[search],
+                            llm=FakeLLM(respond=respond))
+    task = SimpleNamespace(description="research", expected_output="notes", agent=agent)
+    template = CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"))
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+
+    with pytest.raises(ConnectionError):
+        template.kickoff({}, run_id="r1", checkpoint=store, logger=LOG)
+    assert searches == ["q0", "q1"]
+    assert [s["action_input"] for s in store.scratchpad("r1", 0)] == ['{"q": "q0"}', '{"q": "q1"}']
+
+    crash["on"] = False
+    prompts.clear()
+    result = template.kickoff(resume="r1", checkpoint=store, logger=LOG)
+    assert result.tasks_output[0].raw == "done"
+    assert searches == ["q0", "q1"]          # no tool call repeated
+    assert len(prompts) == 1                 # one LLM call: the final answer
+    assert "Observation: result for q1" in [m["content"] for m in prompts[0]]
@@ -0,0 +1,35 @@
+import csv
+
+import pytest
+
+from crew_runtime import datasets
+from crew_runtime.datasets import Dataset
+
+ROWS = 5000
+
+
+@pytest.fixture(scope="module")
+def notes(tmp_path_factory):
+    # 15-line quoted notes, each line with a comma: cutting on raw
+    # newlines lands inside a field and splits it into bogus rows
+    path = tmp_path_factory.mktemp("ds") / "notes.csv"
+    with open(path, "w", newline="") as f:
+        out = csv.writer(f)
+        out.writerow(["id", "note", "value"])
+        for i in range(ROWS):
+            note = "\n".join(f"line {j} of note {i}, with a comma" for j in range(15))
+            out.writerow([i, note, i * 0.5])
+    return path
+
+
+@pytest.mark.parametrize("stdlib", [False, True])
+def test_quoted_multiline_fields_survive_sharding(notes, monkeypatch, stdlib):
+    if stdlib:
+        monkeypatch.setattr(datasets, "_module", lambda name: None)
+    ds = Dataset(str(notes), workers=4, processes=False)
+    shards = ds.shards(ds._spec())
+    assert len(shards) > 1
+    profile = ds.profile()
+    assert profile.rows == ROWS
+    assert profile.columns["value"].count == ROWS
+    assert profile.columns["value"].mean == pytest.approx((ROWS - 1) * 0.25)
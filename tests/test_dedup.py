@@ -0,0 +1,63 @@
+import pytest
+
+from crew_runtime.dedup import DedupPolicy, SeenSources, canonical_url, filter_observation
+
+SNIPPET = ("Researchers found that large language models now write most boilerplate code in "
+           "enterprise teams, cutting review time by a third across the surveyed companies.")
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.example.com/news/ai-trends/",
+    "http://m.example.com/news/ai-trends?utm_source=x&utm_medium=y",
+    "https://EXAMPLE.com/news/ai-trends#section-2",
+    "https://amp.example.com/news/ai-trends/amp/",
+    "https://example.com/news/ai-trends?gclid=abc&fbclid=def",
+])
+def test_copies_of_one_url_share_a_canonical_form(url):
+    assert canonical_url(url) == "https://example.com/news/ai-trends"
+
+
+def test_canonical_url_keeps_meaningful_queries_sorted():
+    assert canonical_url("https://example.com/search?q=ai&page=2&utm_campaign=x") == \
+        "https://example.com/search?page=2&q=ai"
+    assert canonical_url("https://example.com/") == "https://example.com/"
+
+
+def results(*entries):
+    return "\n---\n".join(f"Title: {title}\nLink: {link}\nSnippet: {snippet}"
+                          for title, link, snippet in entries) + "\n---"
+
+
+def test_results_seen_earlier_in_the_run_are_dropped():
+    seen, policy = SeenSources(), DedupPolicy()
+    first = results(("AI at work", "https://www.example.com/a?utm_source=x", SNIPPET),
+                    ("Other news", "https://news.example.org/b", "A completely different story about "
+                     "solar farms being built along motorways in the north of the country."))
+    text, kept, dropped = filter_observation(seen, first, policy)
+    assert (text, kept, dropped) == (first, 2, 0)
+
+    syndicated = SNIPPET.replace("now write", "already write")
+    second = results(("AI at work (copy)", "https://example.com/a/", "Different words entirely, but the "
+                      "same address as an earlier result, so it is still the same source here."),
+                     ("Syndicated", "https://mirror.example.net/c", syndicated),
+                     ("New", "https://example.org/d", "Wind turbines are getting taller every year as "
+                      "manufacturers chase steadier winds higher above the ground."))
+    text, kept, dropped = filter_observation(seen, second, policy)
+    assert (kept, dropped) == (1, 2)
+    assert "Wind turbines" in text and "Syndicated" not in text and "AI at work" not in text
+    assert text.endswith("[2 result(s) omitted: same source or near-duplicate of one already seen in this run]")
+
+
+def test_short_paragraphs_are_never_duplicates():
+    seen, policy = SeenSources(), DedupPolicy()
+    assert filter_observation(seen, "Yes.\n\nNo.", policy) == ("Yes.\n\nNo.", 2, 0)
+    assert filter_observation(seen, "Yes.\n\nNo.", policy) == ("Yes.\n\nNo.", 2, 0)
+
+
+def test_plain_paragraphs_are_filtered_by_content():
+    seen, policy = SeenSources(), DedupPolicy()
+    filter_observation(seen, SNIPPET, policy)
+    text, kept, dropped = filter_observation(seen, "A new paragraph about something else that is "
+                                                   "long enough to be checked.\n\n" + SNIPPET, policy)
+    assert (kept, dropped) == (1, 1)
+    assert text.startswith("A new paragraph")
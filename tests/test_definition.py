@@ -0,0 +1,72 @@
+import asyncio
+import dataclasses
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition, MissingInputsError
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+TOPICS = ["AI", "Solar", "Wind", "Batteries", "Robots", "Chips"]
+
+
+def topic_crew():
+    def answer(messages):
+        role = messages[0]["content"].split(".")[0]
+        return f"Final Answer: {role} / {messages[-1]['content'].splitlines()[0]}"
+
+    agent = SimpleNamespace(role="{topic} Writer", goal="Write on {topic}", backstory="b", tools=[],
+                            llm=FakeLLM(respond=answer, latency=0.02))
+    tasks = [SimpleNamespace(description=f"step {i} on {{topic}}", expected_output="text", agent=agent)
+             for i in range(2)]
+    crew = SimpleNamespace(agents=[agent], tasks=tasks, process="sequential", memory=True)
+    return crew, CrewDefinition.from_crew(crew)
+
+
+def test_concurrent_kickoffs_do_not_see_each_other():
+    crew, template = topic_crew()
+    contexts = []
+    lock = threading.Lock()
+
+    def keep(ctx, event, data):
+        if event == "run_completed":
+            with lock:
+                contexts.append(ctx)
+
+    results = template.kickoff_many([{"topic": t} for t in TOPICS], max_workers=len(TOPICS),
+                                    listeners=(keep,), logger=LOG)
+    for topic, result in zip(TOPICS, results):
+        assert [o.raw for o in result.tasks_output] == [
+            f"You are {topic} Writer / Current Task: step {i} on {topic}" for i in range(2)]
+    assert len({result.run_id for result in results}) == len(TOPICS)
+    assert len({id(ctx.memory) for ctx in contexts}) == len(TOPICS)
+    assert all(len(ctx.memory) == 2 and sum(ctx.iterations.values()) == 2 for ctx in contexts)
+    # the crew objects are never written to, unlike crew.kickoff()
+    assert crew.agents[0].role == "{topic} Writer"
+    assert crew.tasks[0].description == "step 0 on {topic}"
+
+
+def test_the_definition_is_immutable():
+    _, template = topic_crew()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        template.agents[0].role = "Editor"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        template.tasks[0].description = "other"
+
+
+def test_kickoff_many_checks_every_input_before_running():
+    _, template = topic_crew()
+    llm = template.agents[0].llm
+    with pytest.raises(MissingInputsError):
+        template.kickoff_many([{"topic": "AI"}, {}], logger=LOG)
+    assert llm.calls == 0
+
+
+def test_concurrent_async_kickoffs_keep_input_order():
+    _, template = topic_crew()
+    results = asyncio.run(template.kickoff_many_async([{"topic": t} for t in TOPICS], max_concurrency=3,
+                                                      logger=LOG))
+    assert [r.tasks_output[0].raw.split(" Writer")[0] for r in results] == [f"You are {t}" for t in TOPICS]
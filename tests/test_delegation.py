@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition
+from crew_runtime.budget import Budget, BudgetExceeded, TokenBudget
+from crew_runtime.delegation import DelegationTracker, question_key
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+
+DELEGATE = ("Thought: ask the researcher\nAction: Delegate work to coworker\nAction Input: "
+            + json.dumps({"task": "find sources", "context": "", "coworker": "Researcher"}))
+
+
+def delegating_crew(coworker_llm):
+    def lead(messages):
+        seen = any(m["content"].startswith("Observation") for m in messages)
+        return "Final Answer: done" if seen else DELEGATE
+
+    writer = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[],
+                             llm=FakeLLM(respond=lead), allow_delegation=True)
+    researcher = SimpleNamespace(role="Researcher", goal="g", backstory="b", tools=[], llm=coworker_llm)
+    task = SimpleNamespace(description="write", expected_output="a post", agent=writer)
+    return CrewDefinition.from_crew(SimpleNamespace(agents=[writer, researcher], tasks=[task],
+                                                    process="sequential"))
+
+
+def test_a_coworker_over_the_hard_budget_stops_the_run():
+    coworker = FakeLLM(["Final Answer: sources"])
+    budget = TokenBudget(agents={"Researcher": Budget(hard=10)})
+    with pytest.raises(BudgetExceeded):
+        delegating_crew(coworker).kickoff(budget=budget, logger=LOG)
+    assert coworker.calls == 0
+
+
+def test_other_coworker_errors_go_back_to_the_agent():
+    def broken(messages):
+        raise ValueError("bad answer")
+
+    observations = []
+    result = delegating_crew(FakeLLM(respond=broken)).kickoff(
+        listeners=(lambda c, e, d: e == "tool_call" and observations.append(d["output"]),), logger=LOG)
+    assert result.raw == "done"
+    assert observations == ["Error while using tool 'Delegate work to coworker': bad answer"]
+
+
+# ── Repeats and cycles ───────────────────────────────────────────────
+def test_tracker_cycle_needs_the_same_agent_and_question():
+    tracker = DelegationTracker()
+    key = question_key("Can you estimate the backend effort?")
+    assert key == question_key("estimate backend effort")
+    chain = ((0, key), (1, key))                 # agent 0 asked agent 1
+    assert tracker.check(1, 2, key, chain) == (None, None)      # handed on to agent 2
+    assert tracker.check(1, 0, key, chain) == ("cycle", None)   # back to the asker
+    other = question_key("write the summary")
+    assert tracker.check(1, 0, other, chain) == (None, None)    # a different question
+
+
+def test_tracker_answers_a_repeated_delegation_from_memory():
+    tracker = DelegationTracker()
+    key = question_key("find sources")
+    tracker.record(0, 1, key, "three sources", calls=4)
+    assert tracker.check(0, 1, key, ()) == ("repeat", "three sources")
+    assert tracker.check(2, 1, key, ()) == (None, None)  # another asker runs it itself
+    assert tracker.stats() == {"delegations": {"ran": 1, "repeat": 1}, "saved_calls": 4}
+
+
+def relay_crew(back_to_writer):
+    def delegate(coworker):
+        return ("Action: Delegate work to coworker\nAction Input: "
+                + json.dumps({"task": "find sources", "context": "", "coworker": coworker}))
+
+    def lead(messages):
+        seen = any(m["content"].startswith("Observation") for m in messages)
+        return "Final Answer: done" if seen else delegate("Researcher")
+
+    def relay(messages):
+        seen = any(m["content"].startswith("Observation") for m in messages)
+        return "Final Answer: relayed" if seen else delegate("Writer" if back_to_writer else "Librarian")
+
+    def agent(role, llm, allow_delegation):
+        return SimpleNamespace(role=role, goal="g", backstory="b", tools=[], llm=llm,
+                               allow_delegation=allow_delegation)
+
+    agents = [agent("Writer", FakeLLM(respond=lead), True), agent("Researcher", FakeLLM(respond=relay), True),
+              agent("Librarian", FakeLLM(["Final Answer: sources"]), False)]
+    task = SimpleNamespace(description="write", expected_output="a post", agent=agents[0])
+    return CrewDefinition.from_crew(SimpleNamespace(agents=agents, tasks=[task], process="sequential"))
+
+
+@pytest.mark.parametrize("back_to_writer, statuses", [(False, ["ran", "ran"]), (True, ["ran", "cycle"])])
+def test_a_question_may_be_handed_on_but_not_back(back_to_writer, statuses):
+    events = []
+    relay_crew(back_to_writer).kickoff(
+        listeners=(lambda c, e, d: e == "delegation" and events.append(d["status"]),), logger=LOG)
+    assert events == statuses
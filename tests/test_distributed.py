@@ -0,0 +1,97 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition
+from crew_runtime.distributed import DONE, FAILED, QUEUED, RUNNING, Coordinator, RedisBroker, SQLiteBroker
+from crew_runtime.llm import FakeLLM
+from crew_runtime.workflow import REPO_ROOT, resolve_path
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def broker(request, tmp_path, monkeypatch):
+    if request.param == "sqlite":
+        return SQLiteBroker(str(tmp_path / "jobs.sqlite3"))
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # server-side scripts
+    import redis
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.Redis, "from_url",
+                        lambda url, **kw: fakeredis.FakeRedis(server=server, **kw))
+    return RedisBroker("redis://fake")
+
+
+def test_claim_hands_out_each_job_once_under_a_lease(broker):
+    assert broker.enqueue("a", {"n": 1})
+    assert not broker.enqueue("a", {"n": 1})
+    assert broker.claim("w1") == ("a", {"n": 1})
+    assert broker.claim("w2") is None
+    assert broker.status("a")["status"] == RUNNING
+    broker.complete("a", "w1", {"ok": True})
+    state = broker.status("a")
+    assert (state["status"], state["attempts"], state["result"]) == (DONE, 1, {"ok": True})
+
+
+def test_a_failed_job_can_be_submitted_again(broker):
+    broker.enqueue("a", {"n": 1}, max_attempts=1)
+    broker.claim("w1")
+    broker.fail("a", "w1", "boom")
+    assert broker.status("a")["status"] == FAILED
+
+    assert broker.enqueue("a", {"n": 1}, max_attempts=1)
+    state = broker.status("a")
+    assert (state["status"], state["attempts"]) == (QUEUED, 0)
+    assert broker.claim("w2") == ("a", {"n": 1})
+    broker.complete("a", "w2", "done")
+    assert broker.status("a")["result"] == "done"
+
+
+def test_a_done_job_is_not_queued_again(broker):
+    broker.enqueue("a", {"n": 1})
+    broker.claim("w1")
+    broker.complete("a", "w1", "done")
+    assert not broker.enqueue("a", {"n": 1})
+    assert broker.claim("w1") is None
+
+
+def test_only_the_holder_finishes_a_job(broker):
+    broker.enqueue("a", {"n": 1}, max_attempts=2)
+    broker.claim("w1")
+    broker.fail("a", "w1", "boom")  # attempt 1 of 2: queued again
+    state = broker.status("a")
+    assert (state["status"], state["error"]) == (QUEUED, "boom")
+    assert broker.claim("w2") == ("a", {"n": 1})
+
+    broker.complete("a", "w1", "stale")  # w1 no longer holds it
+    broker.fail("a", "w1", "stale")
+    assert broker.status("a")["status"] == RUNNING
+    broker.fail("a", "w2", "boom again")
+    state = broker.status("a")
+    assert (state["status"], state["attempts"], state["error"]) == (FAILED, 2, "boom again")
+    assert broker.claim("w3") is None
+
+
+def crew_definition(process="sequential", async_execution=False):
+    agent = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[], llm=FakeLLM())
+    tasks = [SimpleNamespace(description=f"task {i}", expected_output="text", agent=agent,
+                             async_execution=async_execution and i < 2) for i in range(3)]
+    return CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=tasks, process=process))
+
+
+@pytest.mark.parametrize("process, async_execution, message", [
+    ("hierarchical", False, "needs a sequential crew"),
+    ("sequential", True, "async_execution"),
+])
+def test_run_tasks_refuses_crews_it_cannot_split(tmp_path, process, async_execution, message):
+    coordinator = Coordinator(SQLiteBroker(str(tmp_path / "jobs.sqlite3")))
+    with pytest.raises(ValueError, match=message):
+        coordinator.run_tasks(lambda: crew_definition(process, async_execution))
+
+
+def test_relative_crew_paths_resolve_against_the_repository_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert resolve_path("crew_runtime/workflow.py") == os.path.join(REPO_ROOT, "crew_runtime/workflow.py")
+    (tmp_path / "local.py").write_text("")
+    assert resolve_path("local.py") == str(tmp_path / "local.py")
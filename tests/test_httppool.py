@@ -0,0 +1,166 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from crew_runtime.httppool import (
+    ConnectionPool, OpenAIChatLLM, OpenAIEmbedder, SerperSearchTool, http2_available, serve_mock,
+)
+
+
+@pytest.fixture
+def mock():
+    server, base = serve_mock()
+    yield base
+    server.shutdown()
+
+
+@pytest.fixture
+def slow_server():
+    """Answers after 50 ms and records the most requests it saw at once."""
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            body = json.dumps({"choices": [{"message": {"content": "Final Answer: ok"}}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+
+
+def test_clients_share_keep_alive_connections(mock):
+    pool = ConnectionPool(max_per_host=4, http2=False)
+    chat = OpenAIChatLLM("gpt-4o-mini", pool, api_key="test", base_url=mock + "/v1")
+    embedder = OpenAIEmbedder(pool, api_key="test", base_url=mock + "/v1")
+    search = SerperSearchTool(pool, api_key="test", url=mock + "/search")
+    for i in range(10):
+        assert chat.complete([{"role": "user", "content": f"hi {i}"}]).text == "Final Answer: ok"
+        assert embedder.embed(["a", "b"]) == [[0.0, 1.0], [0.0, 1.0]]
+        assert "Link: https://example.com" in search.run(search_query="q")
+    stats = pool.metrics.snapshot()
+    assert stats["requests"] == 30
+    assert stats["connections_opened"] == 1
+    pool.close()
+
+
+@pytest.mark.parametrize("http2", [False, True])
+def test_httpx_client_reads_gzip_responses(mock, http2):
+    pytest.importorskip("httpx")
+    if http2 and not http2_available():
+        pytest.skip("h2 is not installed")
+    pool = ConnectionPool(http2=http2)
+    response = pool.httpx_client().post(mock + "/v1/chat/completions", json={"model": "m", "messages": []})
+    assert response.status_code == 200
+    assert response.json()["choices"][0]["message"]["content"] == "Final Answer: ok"
+    assert pool.metrics.snapshot()["requests"] == 1
+    pool.close()
+
+
+@pytest.mark.parametrize("http2", [False, True])
+def test_async_requests_use_host_slots_and_metrics(slow_server, http2):
+    if http2:
+        pytest.importorskip("httpx")
+    base, state = slow_server
+    pool = ConnectionPool(max_per_host=2, http2=http2)
+    chat = OpenAIChatLLM("m", pool, api_key="test", base_url=base + "/v1")
+
+    async def main():
+        return await asyncio.gather(*(chat.acomplete([{"role": "user", "content": "x"}]) for _ in range(8)))
+
+    replies = asyncio.run(main())
+    assert [r.text for r in replies] == ["Final Answer: ok"] * 8
+    assert state["peak"] <= 2
+    assert pool.metrics.snapshot()["requests"] == 8
+    pool.close()
+
+
+def test_close_closes_every_client(mock):
+    pytest.importorskip("httpx")
+    pool = ConnectionPool(http2=False)
+    sync_client = pool.httpx_client()
+
+    async def main():
+        await pool.arequest("POST", mock + "/search", json={"q": "x"})
+        async_client = pool.async_client()
+        pool.close()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return async_client
+
+    async_client = asyncio.run(main())
+    assert sync_client.is_closed
+    assert async_client.is_closed
+
+
+@pytest.fixture
+def counting_server():
+    """Counts POSTs per path; /slow answers after 0.5 s, /once closes the socket after answering."""
+    seen = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                seen[self.path] = seen.get(self.path, 0) + 1
+            if self.path == "/slow":
+                time.sleep(0.5)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+            # closed without "Connection: close": the client keeps a stale socket
+            self.close_connection = self.path == "/once"
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", seen
+    server.shutdown()
+
+
+def test_stale_keep_alive_socket_is_retried(counting_server):
+    base, seen = counting_server
+    pool = ConnectionPool(http2=False)
+    assert pool.request("POST", base + "/once", json={}).status == 200
+    time.sleep(0.05)
+    assert pool.request("POST", base + "/fast", json={}).status == 200
+    assert seen == {"/once": 1, "/fast": 1}
+    pool.close()
+
+
+def test_timed_out_request_is_not_resent(counting_server):
+    base, seen = counting_server
+    pool = ConnectionPool(timeout=0.2, http2=False)
+    pool.request("POST", base + "/fast", json={})  # the next request reuses this socket
+    with pytest.raises(TimeoutError):
+        pool.request("POST", base + "/slow", json={})
+    time.sleep(0.6)
+    assert seen["/slow"] == 1
+    pool.close()
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from crew_runtime import CrewDefinition
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+
+DRAFT = [
+    "Solar panels turn sunlight into electricity for homes and offices.",
+    "Wind turbines work best on open plains and along the coast.",
+    "Batteries store the surplus energy for use after sunset.",
+]
+EDITED = [
+    "Solar panels turn sunlight into clean electricity for homes and offices.",
+    "Wind turbines work best on open plains and along windy coasts.",
+    "Modern batteries store the surplus energy for use after sunset.",
+]
+
+
+def editing_crew(draft_paragraphs, editor_llm):
+    writer = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[],
+                             llm=FakeLLM(["Final Answer: " + "\n\n".join(draft_paragraphs)]))
+    editor = SimpleNamespace(role="Editor", goal="g", backstory="b", tools=[], llm=editor_llm)
+    write = SimpleNamespace(description="write", expected_output="a draft", agent=writer)
+    edit = SimpleNamespace(description="edit", expected_output="the post", agent=editor)
+    crew = SimpleNamespace(agents=[writer, editor], tasks=[write, edit], process="sequential")
+    return CrewDefinition.from_crew(crew, incremental=[edit])
+
+
+def test_deleted_paragraphs_are_dropped_without_an_llm_call():
+    first = editing_crew(DRAFT, FakeLLM(["Final Answer: " + "\n\n".join(EDITED)])).kickoff(logger=LOG)
+
+    editor_llm = FakeLLM(["Final Answer: full re-edit"])
+    second = editing_crew([DRAFT[0], DRAFT[2]], editor_llm).kickoff(baseline=first, logger=LOG)
+    assert second.raw == "\n\n".join([EDITED[0], EDITED[2]])
+    assert editor_llm.calls == 0
+
+
+def test_an_unchanged_draft_reuses_the_old_final():
+    first = editing_crew(DRAFT, FakeLLM(["Final Answer: " + "\n\n".join(EDITED)])).kickoff(logger=LOG)
+
+    editor_llm = FakeLLM(["Final Answer: full re-edit"])
+    second = editing_crew(DRAFT, editor_llm).kickoff(baseline=first, logger=LOG)
+    assert second.raw == "\n\n".join(EDITED)
+    assert editor_llm.calls == 0
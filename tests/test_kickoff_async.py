@@ -0,0 +1,77 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def crew(*llms, async_execution=False):
+    agents, tasks = [], []
+    for i, llm in enumerate(llms):
+        agent = SimpleNamespace(role=f"Agent {i}", goal="g", backstory="b", tools=[], llm=llm)
+        agents.append(agent)
+        tasks.append(SimpleNamespace(description=f"task {i}", expected_output="text", agent=agent,
+                                     async_execution=async_execution))
+    return CrewDefinition.from_crew(SimpleNamespace(agents=agents, tasks=tasks, process="sequential"))
+
+
+def fails(messages):
+    raise ConnectionError("network down")
+
+
+def with_events(coroutine):
+    events = []
+    listener = lambda ctx, event, data: events.append(event)  # noqa: E731
+
+    async def main():
+        try:
+            return await coroutine(listener)
+        finally:
+            await asyncio.sleep(0.4)  # long enough for a leaked task to finish
+
+    return events, main
+
+
+def test_kickoff_async_runs_the_crew():
+    template = crew(FakeLLM(["Final Answer: one"]), FakeLLM(["Final Answer: two"]))
+    result = asyncio.run(template.kickoff_async(logger=LOG))
+    assert [t.raw for t in result.tasks_output] == ["one", "two"]
+
+
+def test_a_failing_task_cancels_its_parallel_siblings():
+    slow = FakeLLM(["Final Answer: late"], latency=0.2)
+    template = crew(FakeLLM(respond=fails, latency=0.05), slow, async_execution=True)
+    events, main = with_events(lambda listener: template.kickoff_async(listeners=(listener,), logger=LOG))
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
+    assert events[-1] == "run_failed"
+    assert "task_completed" not in events
+
+
+def test_task_timeout_cancels_the_task():
+    template = crew(FakeLLM(["Final Answer: late"], latency=30))
+    events, main = with_events(lambda listener: template.kickoff_async(listeners=(listener,), logger=LOG,
+                                                               task_timeout=0.1))
+    start = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(main())
+    assert time.perf_counter() - start < 5
+    assert events[-1] == "run_failed"
+
+
+def test_run_timeout_cancels_every_parallel_task():
+    llms = [FakeLLM(["Final Answer: late"], latency=0.3) for _ in range(3)]
+    template = crew(*llms, async_execution=True)
+    events, main = with_events(lambda listener: template.kickoff_async(listeners=(listener,), logger=LOG,
+                                                               timeout=0.1))
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(main())
+    assert events[-1] == "run_failed"
+    assert "task_completed" not in events
+    assert [llm.calls for llm in llms] == [1, 1, 1]
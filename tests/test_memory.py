@@ -0,0 +1,67 @@
+import threading
+
+from crew_runtime.memory import RunMemory
+
+AGENTS = ("Researcher", "Analyst", "Writer", "Editor")
+WRITES = 400
+
+
+def test_snapshots_stay_consistent_under_concurrent_saves():
+    memory = RunMemory(merge_every=16)
+    start = threading.Barrier(len(AGENTS) + 1)
+
+    def writer(agent):
+        start.wait()
+        for i in range(WRITES):
+            memory.save(agent, 0, f"{agent} note {i} about solar panels")
+
+    threads = [threading.Thread(target=writer, args=(agent,)) for agent in AGENTS]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    snapshots = []
+    while any(thread.is_alive() for thread in threads):
+        snapshots.append(memory.snapshot())
+    for thread in threads:
+        thread.join()
+    memory.merge()
+
+    for snapshot in snapshots:
+        seen = list(snapshot.merged.items) + list(snapshot.tail)
+        assert len(seen) == len({id(item) for item in seen}) == len(snapshot)
+        for agent in AGENTS:
+            # each agent's writes are visible as a prefix, never with gaps
+            texts = sorted((item for item in seen if item.agent == agent), key=lambda item: item.seq)
+            assert [item.text for item in texts] == [f"{agent} note {i} about solar panels"
+                                                     for i in range(len(texts))]
+    before = [len(snapshot) for snapshot in snapshots]
+    memory.save("Writer", 1, "one more note")
+    assert [len(snapshot) for snapshot in snapshots] == before
+    assert len(memory) == len(AGENTS) * WRITES + 1
+
+
+def test_merge_keeps_write_order_across_segments():
+    memory = RunMemory(merge_every=1000)
+    for i in range(6):
+        memory.save(AGENTS[i % 2], 0, f"step {i} of the market report")
+    memory.merge()
+    merged = memory.snapshot().merged.items
+    assert [item.seq for item in merged] == list(range(6))
+    assert list(merged) == memory.items
+    assert [item.text for item in memory.search("step market report", limit=2)] == [
+        "step 0 of the market report", "step 1 of the market report"]
+
+
+def test_the_join_merge_folds_every_write():
+    memory = RunMemory(merge_every=7)
+    threads = [threading.Thread(target=lambda agent=agent: [memory.save(agent, 0, f"{agent} {i}")
+                                                           for i in range(200)])
+               for agent in AGENTS]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    memory.merge()
+    snapshot = memory.snapshot()
+    assert snapshot.tail == ()
+    assert sorted(item.seq for item in snapshot.merged.items) == list(range(len(AGENTS) * 200))
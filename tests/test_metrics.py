@@ -0,0 +1,76 @@
+import gc
+import json
+import urllib.error
+import urllib.request
+import weakref
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition, CrewMetrics, JobScheduler, OutputWriter
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def crew():
+    agent = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[], llm=FakeLLM())
+    task = SimpleNamespace(description="write about {topic}", expected_output="a post", agent=agent)
+    return CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"))
+
+
+def test_prometheus_text_reports_runs_calls_and_latency():
+    metrics = CrewMetrics()
+    template = crew()
+    for _ in range(2):
+        template.kickoff({"topic": "AI"}, listeners=(metrics,), logger=LOG)
+    text = metrics.render_prometheus()
+    assert "# TYPE crew_llm_calls_total counter" in text
+    assert "crew_llm_calls_total 2" in text
+    assert "crew_tasks_completed_total 2" in text
+    assert "crew_runs_in_flight 0" in text
+    assert 'crew_llm_call_seconds_bucket{agent="Writer",le="+Inf"} 2' in text
+    assert 'crew_llm_call_seconds_count{agent="Writer"} 2' in text
+    assert 'crew_cache_hits_total{cache="prompt_render"}' in text
+
+
+def test_finished_runs_do_not_keep_their_definition():
+    metrics = CrewMetrics()
+    template = crew()
+    template.kickoff({"topic": "AI"}, listeners=(metrics,), logger=LOG)
+    template.kickoff({"topic": "AI"}, listeners=(metrics,), logger=LOG)
+    cache = metrics.snapshot()["cache"]
+    assert cache["prompt_render_hits"] and cache["prompt_render_misses"]
+    alive = weakref.ref(template)
+    del template
+    gc.collect()
+    assert alive() is None
+    assert metrics.snapshot()["cache"] == cache  # counters never go back
+
+
+def test_queue_gauges_use_public_accessors(tmp_path):
+    scheduler = JobScheduler(max_jobs=2)
+    with OutputWriter(root=str(tmp_path)) as writer:
+        metrics = CrewMetrics().watch_scheduler(scheduler).watch_writer(writer)
+        gauges = metrics.snapshot()["gauges"]
+    scheduler.shutdown()
+    assert gauges == {"crew_queue_depth{queue=jobs}": 0, "crew_jobs_running{queue=jobs}": 0,
+                      "crew_queue_depth{queue=output_writer}": 0}
+
+
+def test_endpoint_serves_text_and_json():
+    metrics = CrewMetrics().serve(port=0)
+    base = f"http://127.0.0.1:{metrics.server.server_address[1]}"
+    try:
+        crew().kickoff({"topic": "AI"}, listeners=(metrics,), logger=LOG)
+        with urllib.request.urlopen(base + "/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "crew_llm_calls_total 1" in response.read().decode()
+        with urllib.request.urlopen(base + "/metrics.json") as response:
+            assert json.loads(response.read())["counters"]["llm_calls"] == 1
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            urllib.request.urlopen(base + "/other")
+        assert missing.value.code == 404
+    finally:
+        metrics.close()
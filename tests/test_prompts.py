@@ -0,0 +1,81 @@
+import gc
+import json
+import weakref
+
+from crew_runtime.prompts import MessageCache, SystemPrompts, chat_body
+from crew_runtime.tools import ToolSpec
+
+SEARCH = ToolSpec("Search", "Searches the web.", lambda q="": q, schema='{"q": "str"}')
+
+
+class _Text(str):  # a str that can be weakly referenced
+    pass
+
+
+def agent(role, goal="Find facts", backstory="Careful."):
+    return {"role": role, "goal": goal, "backstory": backstory}
+
+
+def expected(params, messages):
+    return json.dumps(dict(params, messages=messages), ensure_ascii=False).encode("utf-8")
+
+
+def test_system_prompt_is_shared_per_agent_and_tools():
+    prompts = SystemPrompts()
+    first = prompts.get(agent("Researcher"), (SEARCH,))
+    again = prompts.get(dict(agent("Researcher")), [SEARCH])
+    assert again is first
+    assert "You are Researcher. Careful." in first and "Search: Searches the web." in first
+    assert prompts.get(agent("Researcher")) is not first   # no tools → another prompt
+    assert (prompts.hits, prompts.misses) == (1, 2)
+
+
+def test_system_prompts_evict_least_recently_used():
+    prompts = SystemPrompts(cache_size=2)
+    a = prompts.get(agent("A"))
+    prompts.get(agent("B"))
+    assert prompts.get(agent("A")) is a        # A is now the most recent
+    prompts.get(agent("C"))                    # evicts B
+    assert prompts.get(agent("A")) is a
+    prompts.get(agent("B"))
+    assert prompts.misses == 4 and prompts.hits == 2
+
+
+def test_chat_body_matches_json_dumps():
+    long = "Observation: " + "résumé \"quoted\"\n\ttab ✓ " * 100
+    messages = [
+        {"role": "system", "content": "You are Researcher."},
+        {"role": "user", "content": long},
+        {"role": "assistant", "content": long},   # same content, other role
+        {"role": "user", "content": "", "name": "extra"},
+    ]
+    params = {"model": "gpt-4o-mini", "temperature": 0.7, "stop": ["\nObservation:"]}
+    cache = MessageCache()
+    assert chat_body(params, messages, cache) == expected(params, messages)
+    assert len(cache) == 2
+    assert chat_body(params, messages, cache) == expected(params, messages)  # from the cache
+    assert chat_body({}, messages, cache) == expected({}, messages)
+    assert chat_body({}, []) == expected({}, [])
+
+
+def test_message_cache_is_bounded_and_keeps_no_content():
+    cache = MessageCache(max_chars=10_000)
+    for i in range(50):
+        message = {"role": "user", "content": f"{i} " + "x" * 1000}
+        assert cache.message_json(message) == json.dumps(message)
+        assert cache.chars <= 10_000
+    assert 0 < len(cache) < 50
+
+    content = _Text("y" * 5000)
+    ref = weakref.ref(content)
+    chat_body({}, [{"role": "user", "content": content}], cache)
+    del content
+    gc.collect()
+    assert ref() is None
+
+
+def test_message_cache_can_be_turned_off():
+    cache = MessageCache(max_chars=0)
+    messages = [{"role": "user", "content": "z" * 1000}]
+    assert chat_body({"model": "m"}, messages, cache) == expected({"model": "m"}, messages)
+    assert len(cache) == 0
@@ -0,0 +1,96 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition, Recorder, replay
+from crew_runtime.llm import FakeLLM
+from crew_runtime.replay import ReplayError, Trace
+from crew_runtime.runlog import ERROR, Logger
+from crew_runtime.tools import ToolSpec
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def research_crew(on_write=None, async_execution=False):
+    search = ToolSpec("Search", "Searches.", lambda q="": f"result for {q}")
+
+    def research(messages):
+        if any(m["content"].startswith("Observation") for m in messages):
+            return "Final Answer: notes on solar"
+        return 'Thought: t\nAction: Search\nAction Input: {"q": "solar"}'
+
+    def write(messages):
+        if on_write is not None:
+            on_write()
+        return "Final Answer: a post about solar"
+
+    researcher = SimpleNamespace(role="Researcher", goal="g", backstory="b", tools=[search],
+                                 llm=FakeLLM(respond=research))
+    writer = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[], llm=FakeLLM(respond=write))
+    tasks = [SimpleNamespace(description="research {topic}", expected_output="notes", agent=researcher,
+                             async_execution=async_execution),
+             SimpleNamespace(description="write about {topic}", expected_output="a post", agent=writer,
+                             async_execution=async_execution)]
+    return CrewDefinition.from_crew(SimpleNamespace(agents=[researcher, writer], tasks=tasks,
+                                                    process="sequential"))
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_a_recorded_run_replays_without_divergence(tmp_path, suffix):
+    template = research_crew()
+    recorder = Recorder(str(tmp_path / ("{run_id}" + suffix)))
+    result = template.kickoff({"topic": "solar"}, run_id="r1", listeners=(recorder,), logger=LOG)
+
+    report = replay(template, recorder.paths["r1"], strict=True)
+    assert report.divergences == []
+    assert report.llm_calls == 3
+    assert report.result.raw == result.raw
+
+
+def test_parallel_tasks_replay_with_numbered_calls(tmp_path):
+    template = research_crew(async_execution=True)
+    recorder = Recorder(str(tmp_path / "{run_id}.jsonl"))
+    template.kickoff({"topic": "solar"}, run_id="r1", listeners=(recorder,), logger=LOG)
+    for _ in range(5):
+        assert replay(template, recorder.paths["r1"]).llm_calls == 3
+
+
+def test_trace_lines_reach_the_file_as_events_happen(tmp_path):
+    recorder = Recorder(str(tmp_path / "{run_id}.jsonl"))
+    seen = []
+
+    def on_write():
+        with open(recorder.paths["r1"]) as f:
+            seen.extend(json.loads(line)["type"] for line in f)
+
+    research_crew(on_write).kickoff({"topic": "solar"}, run_id="r1", listeners=(recorder,), logger=LOG)
+    assert seen == ["run", "llm", "tool", "llm", "task"]
+
+
+def test_divergences_are_reported(tmp_path):
+    template = research_crew()
+    recorder = Recorder(str(tmp_path / "{run_id}.jsonl"))
+    template.kickoff({"topic": "solar"}, run_id="r1", listeners=(recorder,), logger=LOG)
+    trace = Trace.load(recorder.paths["r1"])
+    for event in trace.events:
+        if event["type"] == "task" and event["task"] == 0:
+            event["output"] = "different notes"
+        if event["type"] == "llm" and event["agent"] == 1:
+            event["prompt"] = "0" * 20
+
+    report = replay(template, trace)
+    assert ("output", 0, "notes on solar") in report.divergences
+    assert ("prompt", 1, 3) in report.divergences
+    with pytest.raises(ReplayError, match="diverged"):
+        replay(template, trace, strict=True)
+
+
+def test_a_trace_of_another_crew_is_refused(tmp_path):
+    recorder = Recorder(str(tmp_path / "{run_id}.jsonl"))
+    research_crew().kickoff({"topic": "solar"}, run_id="r1", listeners=(recorder,), logger=LOG)
+    other = CrewDefinition.from_crew(SimpleNamespace(
+        agents=[SimpleNamespace(role="Other", goal="g", backstory="b", tools=[], llm=FakeLLM())],
+        tasks=[SimpleNamespace(description="x", expected_output="y", agent=None)], process="sequential"))
+    with pytest.raises(ReplayError, match="different crew"):
+        replay(other, recorder.paths["r1"])
@@ -0,0 +1,41 @@
+import threading
+from types import SimpleNamespace
+
+from crew_runtime import CrewDefinition, OutputIndex
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def test_listener_for_indexes_only_the_research_task(tmp_path):
+    index = OutputIndex(str(tmp_path / "index.sqlite3"))
+    researcher = SimpleNamespace(role="Researcher", goal="g", backstory="b", tools=[],
+                                 llm=FakeLLM(["Final Answer: solar capacity doubled in 2024"]))
+    writer = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[],
+                             llm=FakeLLM(["Final Answer: a blog post about wind turbines"]))
+    tasks = [SimpleNamespace(description="research", expected_output="notes", agent=researcher),
+             SimpleNamespace(description="write", expected_output="a post", agent=writer)]
+    template = CrewDefinition.from_crew(SimpleNamespace(agents=[researcher, writer], tasks=tasks,
+                                                        process="sequential"))
+    template.kickoff(run_id="r1", listeners=(index.listener_for([0]),), logger=LOG)
+
+    assert [hit.source for hit in index.search("solar capacity")] == ["run:r1/0"]
+    assert all("wind" not in hit.text for hit in index.search("wind turbines"))
+
+
+def test_cached_search_stats_are_exact_across_threads(tmp_path):
+    index = OutputIndex(str(tmp_path / "index.sqlite3"))
+    web = SimpleNamespace(name="Search", description="Searches.", run=lambda search_query="": "nothing")
+    search = index.in_front_of(web, min_hits=99)
+
+    def worker():
+        for i in range(25):
+            search.run(search_query=f"query {i}")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert index.stats == {"served": 0, "passed_through": 100}
@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+
+from crew_runtime import AgentPolicy, CrewDefinition, ModelRouter, ModelTier
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+from crew_runtime.validators import WordCount
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def routed_crew(small, large, policies=None):
+    agent = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[], llm=small)
+    task = SimpleNamespace(description="write", expected_output="a post", agent=agent)
+    router = ModelRouter([ModelTier("small", small, quality=1), ModelTier("large", large, quality=3)],
+                         policies=policies)
+    definition = CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"),
+                                          validators=[(task, [WordCount(min_words=5)])])
+    return router, router.apply(definition)
+
+
+def test_escalates_only_when_the_task_validators_fail():
+    small = FakeLLM(["Final Answer: too short"])
+    large = FakeLLM(["Final Answer: one two three four five six"])
+    router, template = routed_crew(small, large)
+    result = template.kickoff(logger=LOG)
+    assert result.raw == "one two three four five six"
+    assert (small.calls, large.calls) == (1, 1)
+    assert router.stats()["small"]["escalated"] == 1
+
+
+def test_a_passing_answer_stays_on_the_small_tier():
+    small = FakeLLM(["Final Answer: one two three four five six"])
+    large = FakeLLM(["Final Answer: never used"])
+    router, template = routed_crew(small, large)
+    template.kickoff(logger=LOG)
+    assert large.calls == 0
+    assert router.stats()["small"]["escalated"] == 0
+
+
+def test_action_steps_are_not_judged_by_the_task_validators():
+    router, _ = routed_crew(FakeLLM(['Action: Search\nAction Input: {"q": "x"}']), FakeLLM())
+    response = router.complete("Writer", [{"role": "user", "content": "hi"}])
+    assert response.text.startswith("Action")
+    assert router.stats()["large"]["calls"] == 0
+
+
+def test_an_explicit_validate_wins_over_the_task_validators():
+    small = FakeLLM(["Final Answer: short"])
+    large = FakeLLM(["Final Answer: never used"])
+    _, template = routed_crew(small, large, policies={"Writer": AgentPolicy(validate=lambda text: True)})
+    template.kickoff(logger=LOG)
+    assert large.calls == 0
+
+
+def test_async_path_routes_through_acomplete():
+    small = FakeLLM(["Final Answer: short"], latency=0.01)
+    large = FakeLLM(["Final Answer: one two three four five six"], latency=0.01)
+    router, template = routed_crew(small, large)
+    result = asyncio.run(template.kickoff_async(logger=LOG))
+    assert result.raw == "one two three four five six"
+    assert router.stats()["large"]["calls"] == 1
+
+
+def test_cancelling_a_run_cancels_the_in_flight_tier_call():
+    router, template = routed_crew(FakeLLM(latency=30), FakeLLM())
+
+    async def main():
+        run = asyncio.ensure_future(template.kickoff_async(logger=LOG))
+        await asyncio.sleep(0.05)
+        run.cancel()
+        try:
+            await asyncio.wait_for(run, 2)
+        except asyncio.CancelledError:
+            return True
+
+    assert asyncio.run(main())
@@ -0,0 +1,56 @@
+import asyncio
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CheckpointStore, CrewDefinition, CrewMetrics, Recorder
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def failing_crew(latency=0.0):
+    def respond(messages):
+        raise ConnectionError("network down")
+
+    agent = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[],
+                            llm=FakeLLM(respond=respond, latency=latency))
+    task = SimpleNamespace(description="write", expected_output="a post", agent=agent)
+    return CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"))
+
+
+def test_a_failed_run_is_finalised_by_every_listener(tmp_path):
+    metrics, recorder = CrewMetrics(), Recorder(str(tmp_path / "{run_id}.jsonl.gz"))
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    events = []
+    with pytest.raises(ConnectionError):
+        failing_crew().kickoff(run_id="r1", listeners=(metrics, recorder, lambda c, e, d: events.append(e)),
+                               checkpoint=store, logger=LOG)
+
+    assert events[-1] == "run_failed"
+    snap = metrics.snapshot()
+    assert snap["runs_in_flight"] == 0 and snap["tasks_in_flight"] == {}
+    assert snap["counters"]["runs_failed"] == 1
+    with gzip.open(recorder.paths["r1"], "rt") as f:
+        last = json.loads(f.read().splitlines()[-1])
+    assert last["type"] == "failed" and "network down" in last["error"]
+    assert store.runs(status="failed")[0]["run_id"] == "r1"
+
+
+def test_a_cancelled_async_run_emits_run_failed():
+    metrics, events = CrewMetrics(), []
+
+    async def main():
+        run = asyncio.ensure_future(failing_crew(latency=30).kickoff_async(
+            listeners=(metrics, lambda c, e, d: events.append(e)), logger=LOG))
+        await asyncio.sleep(0.05)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    asyncio.run(main())
+    assert events[-1] == "run_failed"
+    assert metrics.snapshot()["runs_in_flight"] == 0
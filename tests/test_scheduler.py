@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+from crew_runtime.scheduler import BATCH, DeadlineExceeded, JobScheduler
+
+LOG = Logger(level=ERROR, sinks=[])
+
+
+def crew(latency=0.0):
+    agent = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[],
+                            llm=FakeLLM(["Final Answer: done"], latency=latency))
+    task = SimpleNamespace(description="write", expected_output="a post", agent=agent)
+    return CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"))
+
+
+def test_counts_stay_exact_under_concurrent_jobs():
+    with JobScheduler(max_jobs=8, reserved=0) as scheduler:
+        futures = [scheduler.submit(crew(), priority=BATCH, logger=LOG) for _ in range(200)]
+        assert all(f.result(timeout=30).raw == "done" for f in futures)
+    counts = scheduler.stats()["counts"]
+    assert counts["submitted"] == counts["completed"] == 200
+    assert scheduler.stats()["running"] == 0
+
+
+def test_a_queued_job_past_its_deadline_never_starts():
+    with JobScheduler(max_jobs=1, reserved=0) as scheduler:
+        slow = scheduler.submit(crew(latency=0.3), logger=LOG)
+        late = scheduler.submit(crew(), deadline=0.05, logger=LOG)
+        assert slow.result(timeout=5).raw == "done"
+        with pytest.raises(DeadlineExceeded):
+            late.result(timeout=5)
+    assert scheduler.stats()["counts"]["expired"] == 1
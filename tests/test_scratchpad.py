@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+from crew_runtime import CrewDefinition, ScratchpadPolicy
+from crew_runtime.executor import AgentStep, scratchpad_messages
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+from crew_runtime.scratchpad import Scratchpad
+from crew_runtime.tools import ToolSpec
+
+LOG = Logger(level=ERROR, sinks=[])
+HEAD = [{"role": "system", "content": "You are a researcher."}, {"role": "user", "content": "Research."}]
+
+
+def step(i):
+    text = f"Thought: look up part {i}\nAction: Search\nAction Input: part {i}"
+    return AgentStep(text, "Search", f"part {i}", f"result {i}: " + "long observation text " * 200)
+
+
+def fill(scratchpad, steps):
+    sizes = []
+    for i in range(steps):
+        s = step(i)
+        scratchpad.add(s, scratchpad_messages((s,)))
+        sizes.append(sum(len(m["content"]) for m in scratchpad.messages()))
+    return sizes
+
+
+def test_older_steps_are_folded_into_notes():
+    pad = Scratchpad(HEAD, ScratchpadPolicy(keep_last=2, note_chars=40))
+    fill(pad, 5)
+    messages = pad.messages()
+    assert len(messages) == len(HEAD) + 1 + 2 * 2
+    notes = messages[len(HEAD)]["content"]
+    assert "1. Search(part 0)" in notes and "3. Search(part 2)" in notes
+    assert "(thought: look up part 2)" in notes
+    assert "part 3" not in notes  # kept in full
+    assert messages[-1]["content"].startswith("Observation: result 4")
+    assert pad.folded == 3
+
+
+def test_the_prompt_stops_growing():
+    sizes = fill(Scratchpad(HEAD, ScratchpadPolicy(keep_last=2, notes_tokens=60)), 30)
+    assert sizes[-1] == sizes[-10]
+    unbounded = fill(Scratchpad(HEAD), 30)
+    assert unbounded[-1] > 5 * sizes[-1]
+
+
+def test_the_notes_budget_drops_the_oldest_notes():
+    pad = Scratchpad(HEAD, ScratchpadPolicy(keep_last=1, notes_tokens=60, note_chars=40))
+    fill(pad, 12)
+    notes = pad.messages()[len(HEAD)]["content"]
+    assert pad.dropped > 0 and pad.notes_chars <= 60 * 4
+    assert notes.splitlines()[1].startswith(f"({pad.dropped} earlier steps omitted)")
+    assert "Search(part 10)" in notes and "Search(part 0)" not in notes
+
+
+def test_compact_switches_to_a_tighter_policy():
+    pad = Scratchpad(HEAD, ScratchpadPolicy(keep_last=4))
+    fill(pad, 4)
+    assert pad.folded == 0
+    pad.compact(ScratchpadPolicy(keep_last=1))
+    assert pad.folded == 3 and len(pad.recent) == 1
+
+
+def test_a_long_tool_loop_sends_bounded_prompts():
+    search = ToolSpec("Search", "Searches.", lambda q="": "found " + "x" * 2000)
+
+    def respond(messages):
+        steps = sum(m["content"].startswith("Observation") for m in messages)
+        notes = next((m["content"] for m in messages if m["content"].startswith("Notes")), "")
+        done = steps + notes.count("→")
+        return "Final Answer: done" if done >= 10 else f"Action: Search\nAction Input: {{\"q\": \"{done}\"}}"
+
+    agent = SimpleNamespace(role="Researcher", goal="g", backstory="b", tools=[search],
+                            llm=FakeLLM(respond=respond), max_iter=20)
+    task = SimpleNamespace(description="research", expected_output="notes", agent=agent)
+    template = CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"),
+                                        scratchpad=ScratchpadPolicy(keep_last=2))
+    sizes = []
+    template.kickoff(listeners=(lambda c, e, d: e == "llm_call" and sizes.append(d["prompt_chars"]),),
+                     logger=LOG)
+    assert len(sizes) == 11
+    assert max(sizes) < 3 * 2000 + 2000
@@ -0,0 +1,58 @@
+import gc
+import tracemalloc
+
+from crew_runtime.executor import OBSERVATION, AgentStep, scratchpad_messages
+from crew_runtime.strings import StringTable
+
+
+def test_equal_texts_share_one_object():
+    table = StringTable()
+    first = table.share("x" * 100)
+    second = table.share("".join(["x"] * 100))
+    assert first is second and first == "x" * 100
+    assert table.saved == 100
+
+
+def test_the_table_does_not_keep_texts_alive():
+    table = StringTable()
+    kept = table.share("kept " * 50)
+    table.share("dropped " * 50)
+    gc.collect()
+    assert len(table) == 1
+    assert table.share("kept " * 50) is kept
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def test_each_text_is_stored_once():
+    unique = [f"{i:04d}" + "observation " * 1000 for i in range(100)]
+    text_size = sum(len(text) for text in unique)
+
+    def copies():
+        return [("".join([text]) + " ")[:-1] for text in unique for _ in range(5)]
+
+    def shared():
+        table = StringTable()
+        return table, [table.share(("".join([text]) + " ")[:-1]) for text in unique for _ in range(5)]
+
+    assert _measure(copies) > 4 * text_size
+    assert _measure(shared) < 1.2 * text_size
+
+
+def test_observations_are_not_copied_into_messages():
+    table = StringTable()
+    step = AgentStep("Action: Search\nAction Input: x", "Search", "x")
+    step.message = table.share(OBSERVATION + "result " * 100)
+    (_, observed) = scratchpad_messages([step])
+    assert observed["content"] is step.message
+    assert step.observation == "result " * 100
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition, MissingInputsError
+from crew_runtime.llm import FakeLLM
+from crew_runtime.templates import PromptTemplates, compile_template
+
+AGENTS = [{"role": "{topic} Researcher", "goal": "Find facts on {topic}", "backstory": "Writes in {language}."}]
+TASKS = [{"description": "Research {topic} for {audience}.", "expected_output": 'A JSON list like {"a": 1}',
+          "name": "research"}]
+
+
+def test_placeholders_are_compiled_once_and_other_braces_kept():
+    template = compile_template('Return {"items": [...]} about {topic}.')
+    assert template.fields == frozenset({"topic"})
+    assert template.render({"topic": "AI"}) == 'Return {"items": [...]} about AI.'
+    assert compile_template('Return {"items": [...]} about {topic}.') is template
+
+
+def test_every_missing_input_is_reported_with_its_location():
+    templates = PromptTemplates(AGENTS, TASKS)
+    with pytest.raises(MissingInputsError) as raised:
+        templates.render({"topic": "AI"})
+    error = raised.value
+    assert error.missing == ("audience", "language")
+    assert error.locations["language"] == ("agent '{topic} Researcher'.backstory",)
+    assert "'audience' (used in research.description)" in str(error)
+    assert isinstance(error, KeyError)
+
+
+def test_rendered_views_are_cached_by_the_inputs_in_use():
+    templates = PromptTemplates(AGENTS, TASKS, cache_size=2)
+    first = templates.render({"topic": "AI", "audience": "CTOs", "language": "English", "unused": 1})
+    assert first.agents[0]["role"] == "AI Researcher"
+    assert first.tasks[0]["description"] == "Research AI for CTOs."
+    assert templates.render({"topic": "AI", "audience": "CTOs", "language": "English"}) is first
+    assert (templates.cache_hits, templates.cache_misses) == (1, 1)
+
+    for topic in ("Solar", "Wind"):
+        templates.render({"topic": topic, "audience": "CTOs", "language": "English"})
+    assert templates.render({"topic": "AI", "audience": "CTOs", "language": "English"}) is not first
+    assert templates.cache_misses == 4  # the oldest view was evicted
+
+
+def test_rendered_views_are_read_only():
+    view = PromptTemplates(AGENTS, TASKS).render({"topic": "AI", "audience": "CTOs", "language": "en"})
+    with pytest.raises(TypeError):
+        view.tasks[0]["description"] = "changed"
+    with pytest.raises(AttributeError):
+        view.inputs = {}
+
+
+def test_kickoff_checks_inputs_before_any_llm_call():
+    llm = FakeLLM()
+    agent = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[], llm=llm)
+    task = SimpleNamespace(description="write about {topic} for {audience}", expected_output="a post",
+                           agent=agent)
+    template = CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"))
+    with pytest.raises(MissingInputsError, match="audience"):
+        template.kickoff({"topic": "AI"})
+    assert llm.calls == 0
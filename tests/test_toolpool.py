@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+
+from crew_runtime.toolpool import ToolLimits, ToolPool
+from crew_runtime.tools import ToolSpec
+
+
+def sleeper(release):
+    def wait(q=""):
+        release.wait(5)
+        return "late"
+    return ToolSpec("Slow", "Waits.", wait)
+
+
+def test_a_timed_out_sync_tool_is_abandoned_and_keeps_its_slot():
+    release = threading.Event()
+    with ToolPool(limits={"Slow": ToolLimits(timeout=0.1, max_concurrent=1)}) as pool:
+        tool = sleeper(release)
+        assert pool.run(tool, "") == "[Tool 'Slow' timed out after 0.1s; no output]"
+        # abandoned, not stopped: it still holds the only slot
+        assert pool.stats()["in_flight"] == 1
+        assert "is busy" in pool.run(tool, "")
+        release.set()
+        deadline = time.monotonic() + 5
+        while pool.stats()["in_flight"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.run(tool, "") == "late"   # the slot came back when it ended
+    assert pool.stats()["counts"] == {"timeout": 1, "busy": 1, "completed": 1}
+
+
+def test_a_streaming_tool_returns_its_partial_output_and_stops():
+    produced = []
+
+    def stream(q=""):
+        for i in range(100):
+            produced.append(i)
+            yield f"line {i}\n"
+            time.sleep(0.02)
+
+    with ToolPool(timeout=0.1) as pool:
+        observation = pool.run(ToolSpec("Stream", "Streams.", stream), "")
+        assert observation.startswith("line 0\n")
+        assert observation.endswith("[Tool 'Stream' timed out after 0.1s; partial output above]")
+        time.sleep(0.1)
+    assert len(produced) < 100
+
+
+def test_max_chars_stops_a_streaming_tool():
+    def stream(q=""):
+        while True:
+            yield "x" * 10
+
+    with ToolPool(max_chars=35) as pool:
+        assert pool.run(ToolSpec("Stream", "Streams.", stream), "") == "x" * 40
+
+
+def test_a_cancel_flag_abandons_the_call():
+    release, cancel = threading.Event(), threading.Event()
+    with ToolPool(timeout=None) as pool:
+        threading.Timer(0.05, cancel.set).start()
+        assert pool.run(sleeper(release), "", cancel=cancel) == "[Tool 'Slow' was cancelled; no output]"
+        release.set()
+    assert pool.stats()["counts"]["cancelled"] == 1
+
+
+def test_async_tools_time_out_on_the_event_loop():
+    async def slow(q=""):
+        await asyncio.sleep(5)
+
+    with ToolPool(timeout=0.1) as pool:
+        observation = asyncio.run(pool.run_async(ToolSpec("Async", "Awaits.", slow), ""))
+    assert observation == "[Tool 'Async' timed out after 0.1s; no output]"
+
+
+def test_counts_stay_exact_across_threads():
+    tool = ToolSpec("Echo", "Echoes.", lambda q="": q)
+    with ToolPool(max_workers=8) as pool:
+        threads = [threading.Thread(target=lambda: [pool.run(tool, "x") for _ in range(100)])
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert pool.stats()["counts"] == {"completed": 800}
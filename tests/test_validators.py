@@ -0,0 +1,107 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime import CrewDefinition
+from crew_runtime.llm import FakeLLM
+from crew_runtime.runlog import ERROR, Logger
+from crew_runtime.validators import (
+    Headings, Language, MetaDescription, NoURLs, Regex, Validator, WordCount, repair_prompt, validate,
+)
+
+LOG = Logger(level=ERROR, sinks=[])
+
+POST = "\n".join(["Một bài viết ngắn về năng lượng mặt trời.", "# Năng lượng mặt trời"]
+                 + [f"## Phần {i}\nĐây là nội dung của phần số {i} về điện mặt trời." for i in range(5)])
+
+
+def test_a_validator_without_check_cannot_be_built():
+    class Incomplete(Validator):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_word_count():
+    assert WordCount(2, 4).check("one two three") is None
+    assert "at least 5" in WordCount(min_words=5).check("one two three")
+    assert "at most 2" in WordCount(max_words=2).check("one two three")
+    assert WordCount(max_words=2).check("one two\n```\ncode is not counted\n```") is None
+
+
+def test_headings():
+    assert Headings(level=2, count=5).check(POST) is None
+    assert "Found 5 '##' headings; the text needs at least 6" in Headings(level=2, count=6).check(POST)
+    assert "at most 0" in Headings(level=1, max_count=0).check(POST)
+
+
+def test_language():
+    assert Language("vi").check(POST) is None
+    assert "Vietnamese" in Language("vi").check("This whole text is written in English.")
+    assert Language("en").check("This whole text is written in English.") is None
+    with pytest.raises(ValueError):
+        Language("fr")
+
+
+def test_no_urls():
+    assert NoURLs().check(POST) is None
+    assert "2 found" in NoURLs().check("see https://example.com and www.example.org")
+
+
+def test_regex():
+    assert Regex(r"^# ", "Add a title.").check(POST) is None
+    assert Regex(r"TODO", "Remove TODOs.", must_match=False).check("draft TODO") == "Remove TODOs."
+
+
+def test_meta_description():
+    assert MetaDescription().check(POST) is None
+    assert "before the title" in MetaDescription().check("# Title\ntext")
+    assert "cut it to 10" in MetaDescription(max_chars=10).check("A description that is too long.\n# Title")
+
+
+def test_validate_and_repair_prompt():
+    failures = validate(POST, [Headings(level=2, count=5), NoURLs(), WordCount(max_words=10)])
+    assert [name for name, _ in failures] == ["word_count"]
+    prompt = repair_prompt(failures)
+    assert failures[0][1] in prompt and "Fix ONLY these issues" in prompt
+
+
+def crew_with(llm, validators, max_repairs=None):
+    agent = SimpleNamespace(role="Writer", goal="g", backstory="b", tools=[], llm=llm)
+    task = SimpleNamespace(description="write", expected_output="a post", agent=agent)
+    template = CrewDefinition.from_crew(SimpleNamespace(agents=[agent], tasks=[task], process="sequential"),
+                                        validators=[(task, validators)])
+    if max_repairs is not None:
+        template = template.derive(tasks=[replace(t, max_repairs=max_repairs) for t in template.tasks])
+    return template
+
+
+def test_a_failed_check_gets_a_targeted_repair_prompt():
+    prompts = []
+
+    def respond(messages):
+        prompts.append(messages)
+        return "Final Answer: fixed text" if len(prompts) > 1 else "Final Answer: see https://example.com"
+
+    events = []
+    result = crew_with(FakeLLM(respond=respond), [NoURLs()]).kickoff(
+        listeners=(lambda ctx, event, data: events.append((event, data)),), logger=LOG)
+    assert result.raw == "fixed text"
+    repair = prompts[1]
+    assert repair[-2] == {"role": "assistant", "content": "Final Answer: see https://example.com"}
+    assert "Remove all URLs from the text (1 found)." in repair[-1]["content"]
+    failed = [data for event, data in events if event == "validation_failed"]
+    assert [(d["attempt"], d["final"]) for d in failed] == [(0, False)]
+
+
+def test_repairs_stop_after_max_repairs():
+    llm = FakeLLM(["Final Answer: https://example.com"])
+    events = []
+    result = crew_with(llm, [NoURLs()], max_repairs=1).kickoff(
+        listeners=(lambda ctx, event, data: events.append((event, data)),), logger=LOG)
+    assert result.raw == "https://example.com"
+    assert llm.calls == 2
+    failed = [data for event, data in events if event == "validation_failed"]
+    assert [(d["attempt"], d["final"]) for d in failed] == [(0, False), (1, True)]
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import pytest
+
+from crew_runtime.llm import FakeLLM
+from crew_runtime.workflow import From, Node, Workflow, WorkflowError
+
+
+def one_task_crew(answer, description="work"):
+    llm = FakeLLM(respond=answer) if callable(answer) else FakeLLM(["Final Answer: " + answer])
+    agent = SimpleNamespace(role="Analyst", goal="g", backstory="b", tools=[], llm=llm)
+    task = SimpleNamespace(description=description, expected_output="an answer", agent=agent)
+    return SimpleNamespace(agents=[agent], tasks=[task], process="sequential")
+
+
+def test_downstream_crews_receive_the_typed_edge_value(tmp_path):
+    prompts = []
+
+    def report(messages):
+        prompts.append(messages[-1]["content"])
+        return "Final Answer: ok"
+
+    flow = Workflow("typed", [
+        Node("count", one_task_crew('```json\n[1, "two", {"three": 3}]\n```')),
+        Node("report", one_task_crew(report, description="Summarise {items}"),
+             {"items": From("count", type=list)}),
+    ], root=str(tmp_path))
+    result = flow.run(processes=False)
+    assert result.artifacts["report"]["inputs"] == {"items": [1, "two", {"three": 3}]}
+    assert result.outputs["count"] == [1, "two", {"three": 3}]
+    assert 'Summarise [1, "two", {"three": 3}]' in prompts[0]  # JSON, not a Python repr
+
+
+def test_an_edge_that_does_not_convert_fails_the_workflow(tmp_path):
+    flow = Workflow("bad", [
+        Node("count", one_task_crew("three")),
+        Node("report", one_task_crew("ok", description="{n}"), {"n": From("count", type=int)}),
+    ], root=str(tmp_path))
+    with pytest.raises(WorkflowError, match="count → report.n"):
+        flow.run(processes=False)
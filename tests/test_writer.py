@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from crew_runtime import OutputWriter, write_atomic
+
+
+def leftovers(folder):
+    return [name for name in os.listdir(folder) if name.endswith(".tmp")]
+
+
+def test_a_bad_job_fails_its_future_only(tmp_path):
+    with OutputWriter(root=str(tmp_path), per_run_dirs=False) as writer:
+        bad = writer.submit(None, "bad.md", None)       # not a str
+        good = writer.submit(None, "good.md", "ok")
+        with pytest.raises(AttributeError):
+            bad.result(timeout=5)
+        assert good.result(timeout=5) == str(tmp_path / "good.md")
+    assert (tmp_path / "good.md").read_text() == "ok"
+    assert writer.stats["errors"] == 1
+    assert leftovers(tmp_path) == []
+
+
+def test_a_failed_rename_leaves_no_temp_file(tmp_path):
+    (tmp_path / "taken").mkdir()                         # os.replace onto a folder fails
+    with OutputWriter(root=str(tmp_path), per_run_dirs=False) as writer:
+        with pytest.raises(OSError):
+            writer.submit(None, "taken", "text").result(timeout=5)
+    assert leftovers(tmp_path) == []
+
+
+def test_write_atomic_cleans_up_on_failure(tmp_path):
+    (tmp_path / "taken").mkdir()
+    with pytest.raises(OSError):
+        write_atomic(str(tmp_path / "taken"), "text")
+    with pytest.raises(AttributeError):
+        write_atomic(str(tmp_path / "none.md"), None)
+    assert leftovers(tmp_path) == []
+    assert not (tmp_path / "none.md").exists()